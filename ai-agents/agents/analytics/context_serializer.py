@@ -0,0 +1,166 @@
+"""
+Farm Context Serializer - compact, token-budgeted prompt context
+Turns raw bridge and weather payloads into minified JSON that fits a token budget
+"""
+
+from typing import Dict, Any, List, Optional
+import json
+import re
+
+# Shorter, still self-explanatory names for the keys the bridge and weather tools emit.
+# Each alias is unique, so two keys of one object never collapse into one
+KEY_ALIASES = {
+    "plantingDate": "planted",
+    "expectedHarvestDate": "expHarvest",
+    "actualHarvestDate": "harvested",
+    "recentTasks": "tasks",
+    "recentIrrigation": "irrigation",
+    "recentFertilizer": "fertilizer",
+    "pestDiseaseHistory": "pests",
+    "harvestHistory": "harvests",
+    "harvestDate": "harvestedOn",
+    "waterAmount": "water",
+    "fertilizerType": "fertType",
+    "recentActivities": "activities",
+    "totalActivities": "nActivities",
+    "createdAt": "created",
+    "statusDistribution": "byStatus",
+    "averageCost": "avgCost",
+    "activityCount": "nCosted",
+    "weather_condition": "condition",
+    "wind_direction": "windDir",
+    "wind_speed": "wind",
+    "temperature": "temp",
+    "precipitation": "precip",
+    "precipitation_total": "precipTotal",
+    "humidity_avg": "humidityAvg",
+}
+
+# Keys that carry no analytical value for the model
+DROPPED_KEYS = {"id", "timestamp", "source", "success", "description", "uv_index", "visibility"}
+
+DATE_KEYS = ("date", "createdAt", "harvestDate", "plantingDate")
+
+ISO_TIMESTAMP = re.compile(r"^(\d{4}-\d{2}-\d{2})T[\d:.]+(Z|[+-]\d{2}:?\d{2})?$")
+
+# Degradation levels tried in order: (raw recent items kept per series,
+# monthly buckets kept per series, None = all). Older detail goes first.
+DEGRADATION_LEVELS = [
+    (10, None),
+    (5, 12),
+    (3, 6),
+    (1, 3),
+    (0, 0)
+]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)"""
+    return (len(text) + 3) // 4
+
+
+class FarmContextSerializer:
+    """Compact serializer for the farm analysis prompt context"""
+
+    def __init__(self, token_budget: int = 1500, precision: int = 2, series_threshold: int = 10):
+        self.token_budget = token_budget
+        self.precision = precision
+        # Lists of dated records longer than this are rolled up by month
+        self.series_threshold = series_threshold
+
+    def serialize(self, sections: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Serialize named sections (e.g. crops/financial/weather tool responses).
+        Returns the compact text plus size stats before and after.
+        """
+        original = json.dumps(sections, indent=2, default=str)
+        unwrapped = {name: self._unwrap(value) for name, value in sections.items()}
+
+        text = ""
+        level = 0
+        for level, (recent, months) in enumerate(DEGRADATION_LEVELS):
+            compacted = self._compact(unwrapped, recent, months)
+            text = json.dumps(compacted, separators=(",", ":"), default=str)
+            if estimate_tokens(text) <= self.token_budget:
+                break
+
+        tokens_before = estimate_tokens(original)
+        tokens_after = estimate_tokens(text)
+        return {
+            "text": text,
+            "degradation_level": level,
+            "within_budget": tokens_after <= self.token_budget,
+            "chars_before": len(original),
+            "chars_after": len(text),
+            "tokens_before": tokens_before,
+            "tokens_after": tokens_after,
+            "reduction": round(1 - tokens_after / tokens_before, 3) if tokens_before else 0.0
+        }
+
+    def _unwrap(self, value: Any) -> Any:
+        """Strip the {'success', 'data', 'timestamp'} tool envelope"""
+        if isinstance(value, dict) and "success" in value:
+            if not value.get("success"):
+                return "unavailable"
+            return value.get("data")
+        return value
+
+    def _compact(self, value: Any, recent: int, months: Optional[int]) -> Any:
+        if isinstance(value, dict):
+            compacted = {}
+            for key, item in value.items():
+                if key in DROPPED_KEYS:
+                    continue
+                item = self._compact(item, recent, months)
+                if item is None or item == [] or item == {}:
+                    continue
+                compacted[KEY_ALIASES.get(key, key)] = item
+            return compacted
+        if isinstance(value, list):
+            if len(value) > self.series_threshold and self._is_series(value):
+                return self._rollup(value, recent, months)
+            return [self._compact(item, recent, months) for item in value]
+        if isinstance(value, float):
+            rounded = round(value, self.precision)
+            return int(rounded) if rounded.is_integer() else rounded
+        if isinstance(value, str):
+            match = ISO_TIMESTAMP.match(value)
+            return match.group(1) if match else value
+        return value
+
+    def _is_series(self, items: List[Any]) -> bool:
+        return all(isinstance(item, dict) and self._date_of(item) for item in items)
+
+    def _date_of(self, item: Dict[str, Any]) -> Optional[str]:
+        for key in DATE_KEYS:
+            if item.get(key):
+                return str(item[key])[:10]
+        return None
+
+    def _rollup(self, items: List[Dict[str, Any]], recent: int,
+                months: Optional[int]) -> Dict[str, Any]:
+        """Keep the newest records raw and aggregate older ones into monthly buckets"""
+        ordered = sorted(items, key=self._date_of, reverse=True)
+        raw, older = ordered[:recent], ordered[recent:]
+
+        buckets: Dict[str, Dict[str, Any]] = {}
+        for item in older:
+            month = self._date_of(item)[:7]
+            bucket = buckets.setdefault(month, {"month": month, "n": 0})
+            bucket["n"] += 1
+            for key, number in item.items():
+                if isinstance(number, (int, float)) and not isinstance(number, bool):
+                    alias = KEY_ALIASES.get(key, key)
+                    bucket[alias] = bucket.get(alias, 0) + number
+
+        monthly = [self._compact(buckets[m], 0, 0) for m in sorted(buckets, reverse=True)]
+        if months is not None:
+            monthly = monthly[:months]
+
+        rollup: Dict[str, Any] = {"n": len(items)}
+        if raw:
+            rollup["recent"] = [self._compact(item, recent, months) for item in raw]
+        if monthly:
+            rollup["monthly"] = monthly
+        return rollup
+
@@ -4,84 +4,126 @@ Provides intelligent analytics and insights for farm management
 """
 
 from google.ai.adk import Agent, Tool, LlmAgent
-from typing import Dict, Any, List
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple, Awaitable, Callable, Iterable, AsyncIterator, Union, Set
+import asyncio
 import json
 import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from agents.analytics.context_serializer import FarmContextSerializer
+from agents.analytics.incremental import (AnalysisStateStore, SNAPSHOT_SOURCES, financial_cursor,
+                                          financial_window_expired, fingerprint_sources, merge_deltas)
+from agents.analytics.insight_parser import InsightStreamParser, normalize_insight, parse_insight_response
+from agents.analytics.rule_engine import FARM_RULES, RuleEngine, farm_facts, merge_insights, rule_categories
+from tools.adk_config import analytics_agent_config, get_adk_config
+from tools.insight_cache import InsightCache
+from tools.rate_limiter import configure_guards, guard_gauges
+from tools.registry import ToolRegistry
+from tools.telemetry import get_telemetry
+from tools.turn_memo import TurnMemo, memoize_per_turn, turn_scope
+
+if TYPE_CHECKING:  # Imported lazily through the tool registry
+    from agents.orchestration.farm_context import FarmContext
+    from tools.bridge_client import BridgeClient
+    from tools.weather_tool import WeatherTool
 
 logger = logging.getLogger(__name__)
 
+# Per-source deadlines (seconds) for the concurrent data fetch
+DEFAULT_SOURCE_TIMEOUTS = {
+    "crop_data": 5.0,
+    "financial_data": 5.0,
+    "weather_data": 5.0,
+    "weather_outlook": 5.0
+}
+
+# Maximum number of insights returned per analysis
+MAX_INSIGHTS = 5
+
+# Appended to the prompt when a response held no usable insights
+PARSE_RETRY_REMINDER = (
+    "\n\nYour previous answer could not be parsed. Respond with only a JSON array "
+    "of insight objects with keys title, description, confidence, actionable and priority."
+)
+
+# Overlap applied to change cursors so writes racing a fetch are not missed
+CURSOR_OVERLAP = timedelta(seconds=60)
+
+# Snapshots kept up to date from deltas are re-fetched in full after this long,
+# so activities leaving the financial time range drop out of the summary
+DEFAULT_RESYNC_SECONDS = 24 * 3600
+
 class FarmDataTool(Tool):
     """Tool to access farm data via the bridge API"""
     
-    def __init__(self, api_config: Dict[str, Any]):
+    def __init__(self, registry: ToolRegistry):
         super().__init__(
             name="farm_data_tool",
             description="Access farm data including crops, activities, and financial information"
         )
-        self.api_config = api_config
+        self.registry = registry
+    
+    @property
+    def bridge(self) -> "BridgeClient":
+        """The bridge client, imported and built on first use"""
+        return self.registry.get("farm-data-tool")
     
-    async def get_crop_data(self, user_id: str) -> Dict[str, Any]:
-        """Retrieve crop data for the user"""
+    @memoize_per_turn
+    async def get_crop_data(self, user_id: str, since: Optional[str] = None) -> Dict[str, Any]:
+        """Retrieve crop data for the user (all pages); with since, only changed crops"""
         try:
-            # In a real implementation, this would make HTTP requests
-            # to the bridge API endpoints
-            endpoint = f"{self.api_config['base_url']}/api/ai-bridge/crops"
-            headers = {"Authorization": f"Bearer {self.api_config['auth']['token']}"}
-            params = {"userId": user_id}
-            
-            # Simulated response for now - replace with actual HTTP call
-            return {
-                "success": True,
-                "data": [],  # Would contain actual crop data
-                "timestamp": "2025-01-23T20:00:00Z"
-            }
+            return await self.bridge.get_crops(user_id, since=since)
         except Exception as e:
             logger.error(f"Error fetching crop data: {e}")
             return {"success": False, "error": str(e)}
     
-    async def get_financial_data(self, user_id: str) -> Dict[str, Any]:
-        """Retrieve financial data for the user"""
+    @memoize_per_turn
+    async def get_financial_data(self, user_id: str, since: Optional[str] = None) -> Dict[str, Any]:
+        """Retrieve financial data for the user; with since, only new activities"""
         try:
-            endpoint = f"{self.api_config['base_url']}/api/ai-bridge/financial"
-            headers = {"Authorization": f"Bearer {self.api_config['auth']['token']}"}
-            params = {"userId": user_id}
-            
-            # Simulated response for now - replace with actual HTTP call
-            return {
-                "success": True,
-                "data": [],  # Would contain actual financial data
-                "timestamp": "2025-01-23T20:00:00Z"
-            }
+            return await self.bridge.get_financial(user_id, since=since)
         except Exception as e:
             logger.error(f"Error fetching financial data: {e}")
             return {"success": False, "error": str(e)}
+    
+    def iter_activities(self, user_id: str, since: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream the user's activities page by page"""
+        return self.bridge.iter_activities(user_id, since=since)
 
 class WeatherDataTool(Tool):
     """Tool to access weather and climate data"""
     
-    def __init__(self, api_config: Dict[str, Any]):
+    def __init__(self, registry: ToolRegistry):
         super().__init__(
             name="weather_data_tool",
             description="Access current and forecast weather data"
         )
-        self.api_config = api_config
+        self.registry = registry
+    
+    @property
+    def client(self) -> "WeatherTool":
+        """The OpenWeather tool, imported and built on first use"""
+        return self.registry.get("weather-data-tool")
     
+    @memoize_per_turn
     async def get_current_weather(self, location: str) -> Dict[str, Any]:
         """Get current weather for a location"""
         try:
-            # Implementation would make actual API calls
-            return {
-                "success": True,
-                "data": {
-                    "temperature": 22.5,
-                    "humidity": 65,
-                    "precipitation": 0,
-                    "wind_speed": 5.2
-                }
-            }
+            return await self.client.get_current_weather(location)
         except Exception as e:
             logger.error(f"Error fetching weather data: {e}")
             return {"success": False, "error": str(e)}
+    
+    @memoize_per_turn
+    async def get_agricultural_conditions(self, location: str) -> Dict[str, Any]:
+        """Get the weekly agricultural outlook (frost risk, rainfall, dry days) for a location"""
+        try:
+            return await self.client.get_agricultural_conditions(location)
+        except Exception as e:
+            logger.error(f"Error fetching agricultural conditions: {e}")
+            return {"success": False, "error": str(e)}
 
 class FarmAnalyticsAgent(LlmAgent):
     """
@@ -96,14 +138,60 @@ class FarmAnalyticsAgent(LlmAgent):
             tools=[]
         )
         
-        # Initialize tools
-        self.farm_data_tool = FarmDataTool(config.get("farm_api", {}))
-        self.weather_tool = WeatherDataTool(config.get("weather_api", {}))
+        # Per-upstream rate limits and circuit breakers from the `tools:` entries
+        configure_guards(config.get("tools", []))
+        # Stage latencies, payload sizes and cache/error counters; the shared
+        # registry is configured once per process and is a no-op unless enabled
+        self.telemetry = get_telemetry()
+        self.telemetry.add_collector("upstream_guards", guard_gauges)
+        
+        # Declared tools are imported and built on first use; configs without a
+        # `tools:` section fall back to the farm_api/weather_api blocks
+        self.tool_registry = ToolRegistry(config.get("tools") or [
+            {"name": "farm-data-tool", "config": config.get("farm_api", {})},
+            {"name": "weather-data-tool", "config": config.get("weather_api", {})}
+        ])
+        self.farm_data_tool = FarmDataTool(self.tool_registry)
+        self.weather_tool = WeatherDataTool(self.tool_registry)
         
         # Add tools to the agent
         self.add_tool(self.farm_data_tool)
         self.add_tool(self.weather_tool)
         
+        self.source_timeouts = {**DEFAULT_SOURCE_TIMEOUTS, **config.get("source_timeouts", {})}
+        # Compact prompt context capped at a token budget
+        self.context_serializer = FarmContextSerializer(
+            token_budget=config.get("prompt_token_budget", 1500)
+        )
+        
+        # Validated insights keyed on model settings + prompt; identical farm
+        # snapshots skip the LLM entirely
+        self.model_settings = config.get("model", {})
+        cache_config = config.get("insight_cache", {})
+        self.insight_cache = None
+        if cache_config.get("enabled", True):
+            self.insight_cache = InsightCache(
+                path=cache_config.get("path", ":memory:"),
+                ttl_seconds=cache_config.get("ttl_seconds", 6 * 3600),
+                max_entries=cache_config.get("max_entries", 10000)
+            )
+        
+        # Per-user fingerprints of the last analyzed inputs, so unchanged
+        # farms reuse their stored insights
+        state_config = config.get("analysis_state", {})
+        self.analysis_state = None
+        if state_config.get("enabled", True):
+            self.analysis_state = AnalysisStateStore(path=state_config.get("path", ":memory:"))
+        self.resync_seconds = state_config.get("resync_seconds", DEFAULT_RESYNC_SECONDS)
+        self.enable_streaming = config.get("enable_streaming", False)
+        # Extra model calls allowed when a response can't be parsed even after repair
+        self.parse_retries = config.get("parse_retries", 1)
+        # Deterministic insights from thresholds on the fetched data; the model is
+        # only called when they don't cover enough of the farm
+        rules_config = config.get("rules", {})
+        self.rule_engine = (RuleEngine.from_config({"rules": FARM_RULES, **rules_config})
+                            if rules_config.get("enabled", True) else None)
+        
         # System prompt for the LLM
         self.system_prompt = """
         You are an expert agricultural advisor and data analyst. Your role is to:
@@ -129,85 +217,511 @@ class FarmAnalyticsAgent(LlmAgent):
         - Priority: High, Medium, or Low
         """
     
-    async def analyze_farm_performance(self, user_id: str, location: str = None) -> List[Dict[str, Any]]:
+    async def analyze_farm_performance(self, user_id: str, location: str = None,
+                                       weather_memo: Optional[Dict[str, asyncio.Task]] = None,
+                                       context: Optional["FarmContext"] = None,
+                                       stats: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Perform comprehensive farm performance analysis.
+        weather_memo shares in-flight weather lookups between users in a batch;
+        a shared context supplies already fetched data instead of the tools.
+        stats, when given, is filled with this call's timings, missing sources
+        and cache outcomes; the agent keeps no per-call state of its own.
+        """
+        stats = {} if stats is None else stats
+        with turn_scope() as turn:
+            try:
+                analysis = await self._prepare_analysis(user_id, location, weather_memo, context, stats)
+                if analysis["insights"] is not None:
+                    return analysis["insights"]
+                
+                # Use the LLM to generate insights, repairing malformed output and
+                # re-asking only when nothing usable could be recovered
+                prompt = analysis["prompt"]
+                for attempt in range(self.parse_retries + 1):
+                    with self.telemetry.stage("llm_call"):
+                        response = await self.generate_response(prompt)
+                    with self.telemetry.stage("parse"):
+                        parsed = parse_insight_response(response, MAX_INSIGHTS)
+                    self.telemetry.increment("agent_insight_parse_total", outcome=parsed["status"])
+                    if parsed["repairs"]:
+                        logger.debug(f"Repaired insight response: {', '.join(parsed['repairs'])}")
+                    if parsed["insights"]:
+                        # Rule insights lead; the model fills in the rest
+                        insights = merge_insights(analysis["rule_insights"], parsed["insights"], MAX_INSIGHTS)
+                        self._remember_insights(analysis, insights)
+                        return insights
+                    if attempt < self.parse_retries:
+                        self.telemetry.increment("agent_parse_retries_total")
+                        prompt = analysis["prompt"] + PARSE_RETRY_REMINDER
+                
+                # Fallback to simple insights if no response yielded valid insights
+                self.telemetry.increment("agent_fallbacks_total", reason="invalid_json")
+                with self.telemetry.stage("fallback"):
+                    fallback = self._generate_fallback_insights(analysis["crop_data"], analysis["financial_data"])
+                    return merge_insights(analysis["rule_insights"], fallback, MAX_INSIGHTS)
+                    
+            except Exception as e:
+                logger.error(f"Error in farm analysis: {e}")
+                self.telemetry.increment("agent_fallbacks_total", reason="error")
+                return [self._analysis_error_insight()]
+            finally:
+                self._record_turn(turn, stats)
+    
+    def context_sources(self) -> List[str]:
+        """Data sources this agent reads from a shared context"""
+        sources = ["crop_data", "financial_data", "weather_data"]
+        if self.rule_engine:
+            sources.append("weather_outlook")
+        return sources
+    
+    async def analyze_context(self, context: "FarmContext") -> List[Dict[str, Any]]:
+        """Analyze from a shared context fetched by the orchestrator"""
+        return await self.analyze_farm_performance(context.user_id, context.location, context=context)
+    
+    async def stream_farm_insights(self, user_id: str, location: str = None,
+                                   stats: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
         """
-        Perform comprehensive farm performance analysis
+        Streaming variant of analyze_farm_performance: yields each validated
+        insight as soon as its JSON object closes in the model output, with the
+        same validation and 5-insight cap.
         """
+        stats = {} if stats is None else stats
         try:
-            # Gather data from multiple sources
-            crop_data = await self.farm_data_tool.get_crop_data(user_id)
-            financial_data = await self.farm_data_tool.get_financial_data(user_id)
-            
-            weather_data = None
-            if location:
-                weather_data = await self.weather_tool.get_current_weather(location)
+            with turn_scope() as turn:
+                analysis = await self._prepare_analysis(user_id, location, stats=stats)
+            self._record_turn(turn, stats)
+            if analysis["insights"] is not None:
+                for insight in analysis["insights"]:
+                    yield insight
+                return
             
-            # Prepare context for the LLM
-            context = {
-                "crop_data": crop_data,
-                "financial_data": financial_data,
-                "weather_data": weather_data,
-                "analysis_request": "comprehensive_farm_analysis"
-            }
+            # Rule insights are known up front, so they go out before the model starts
+            insights = list(analysis["rule_insights"])
+            for insight in insights:
+                yield insight
             
-            # Generate insights using the LLM
-            prompt = f"""
-            Analyze the following farm data and provide actionable insights:
+            parser = InsightStreamParser(repair=True)
+            generated = 0
+            # Includes time the consumer spends between insights
+            with self.telemetry.stage("llm_call", mode="stream"):
+                async for chunk in self._generate_response_chunks(analysis["prompt"]):
+                    for candidate in parser.feed(chunk):
+                        accepted = self._accept_insight(insights, candidate)
+                        if accepted:
+                            generated += 1
+                            yield accepted
+                    if len(insights) >= MAX_INSIGHTS or parser.done:
+                        break
+                else:
+                    # Output ended mid-object: salvage what was cut off
+                    for candidate in parser.finish():
+                        accepted = self._accept_insight(insights, candidate)
+                        if accepted:
+                            generated += 1
+                            yield accepted
+            self.telemetry.increment("agent_insight_parse_total", mode="stream",
+                                     outcome="failed" if not generated else "repaired" if parser.repairs else "clean")
             
-            Crop Data: {json.dumps(crop_data, indent=2)}
-            Financial Data: {json.dumps(financial_data, indent=2)}
-            Weather Data: {json.dumps(weather_data, indent=2)}
-            
-            Please provide 3-5 key insights in JSON format with the following structure:
-            [
-                {{
-                    "title": "Insight Title",
-                    "description": "Detailed explanation and recommendation",
-                    "confidence": 0.85,
-                    "actionable": true,
-                    "priority": "High"
-                }}
-            ]
-            """
-            
-            # Use the LLM to generate insights
-            response = await self.generate_response(prompt)
-            
-            # Parse and validate the response
-            try:
-                insights = json.loads(response)
-                return self._validate_insights(insights)
-            except json.JSONDecodeError:
-                # Fallback to simple insights if LLM response isn't valid JSON
-                return self._generate_fallback_insights(crop_data, financial_data)
-                
+            if generated:
+                self._remember_insights(analysis, insights)
+            else:
+                self.telemetry.increment("agent_fallbacks_total", reason="invalid_json")
+                fallback = self._generate_fallback_insights(analysis["crop_data"], analysis["financial_data"])
+                for insight in merge_insights(insights, fallback, MAX_INSIGHTS)[len(insights):]:
+                    yield insight
         except Exception as e:
-            logger.error(f"Error in farm analysis: {e}")
-            return [{
-                "title": "Analysis Error",
-                "description": "Unable to complete farm analysis at this time. Please try again later.",
-                "confidence": 0.0,
-                "actionable": false,
-                "priority": "Low"
-            }]
+            logger.error(f"Error in streaming farm analysis: {e}")
+            self.telemetry.increment("agent_fallbacks_total", reason="error")
+            yield self._analysis_error_insight()
+    
+    def _accept_insight(self, insights: List[Dict[str, Any]], candidate: Any) -> Optional[Dict[str, Any]]:
+        """Validate a streamed candidate and append it unless it is a duplicate or over the cap"""
+        validated = self._validate_insights([candidate])
+        if not validated or len(insights) >= MAX_INSIGHTS:
+            return None
+        merged = merge_insights(insights, validated)
+        if len(merged) == len(insights):
+            return None
+        insights.append(validated[0])
+        return validated[0]
+    
+    def _record_turn(self, turn: TurnMemo, stats: Dict[str, Any]):
+        """Report tool calls served from the per-turn memo"""
+        tool_calls = stats["tool_calls"] = turn.stats()
+        if tool_calls["saved"]:
+            self.telemetry.increment("agent_tool_calls_saved_total", tool_calls["saved"])
+    
+    async def _generate_response_chunks(self, prompt: str) -> AsyncIterator[str]:
+        """Stream model output when enabled and supported, otherwise yield the full response"""
+        if self.enable_streaming and hasattr(self, "generate_response_stream"):
+            async for chunk in self.generate_response_stream(prompt):
+                yield chunk
+        else:
+            yield await self.generate_response(prompt)
+    
+    async def _prepare_analysis(self, user_id: str, location: Optional[str],
+                                weather_memo: Optional[Dict[str, asyncio.Task]] = None,
+                                context: Optional["FarmContext"] = None,
+                                stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Fetch the farm data (or take it from a shared context) and build the
+        prompt. "insights" is already set when the farm is unchanged or the
+        prompt is in the insight cache. Stats for this call go in analysis["stats"].
+        """
+        stats = {} if stats is None else stats
+        state = self.analysis_state.get(user_id) if self.analysis_state else None
+        synced_at = None
+        
+        if context is not None:
+            # Fetched once for every agent in the request; no delta check needed
+            fetched_at = context.fetched_at
+            synced_at = fetched_at.timestamp()
+            sources, missing_sources = context.select(self.context_sources())
+            fingerprints = {name: context.fingerprints[name] for name in sources}
+            stats.update(context.stats(), missing_sources=missing_sources)
+        else:
+            fetched_at = datetime.now(timezone.utc)
+            changes = await self._fetch_changes(user_id, location, state, weather_memo, stats) if state else None
+            if changes is not None:
+                sources, missing_sources = changes
+                synced_at = state["synced_at"]
+            else:
+                # Gather data from multiple sources concurrently
+                sources, missing_sources = await self._gather_farm_data(user_id, location, weather_memo, stats=stats)
+                synced_at = fetched_at.timestamp()
+            fingerprints = fingerprint_sources(sources)
+        cursor = (fetched_at - CURSOR_OVERLAP).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+        crop_data = sources["crop_data"]
+        financial_data = sources["financial_data"]
+        weather_data = sources.get("weather_data")
+        
+        analysis = {
+            "user_id": user_id,
+            "crop_data": crop_data,
+            "financial_data": financial_data,
+            "weather_data": weather_data,
+            "missing_sources": missing_sources,
+            "fingerprints": fingerprints,
+            "cursor": cursor,
+            "snapshots": {name: sources[name] for name in SNAPSHOT_SOURCES},
+            "synced_at": synced_at,
+            "cache_key": None,
+            "rule_insights": [],
+            "insights": None,
+            "stats": stats
+        }
+        
+        if state and analysis["fingerprints"] == state["fingerprints"]:
+            stats["incremental"] = "unchanged"
+            self.telemetry.increment("agent_cache_requests_total", cache="analysis_state", result="hit")
+            self._save_state(analysis, state["insights"])
+            analysis["insights"] = state["insights"]
+            return analysis
+        stats["incremental"] = "changed" if state else "new"
+        self.telemetry.increment("agent_cache_requests_total", cache="analysis_state", result="miss")
+        
+        if self.rule_engine and self._apply_rules(analysis, sources):
+            return analysis
+        
+        with self.telemetry.stage("prompt_build"):
+            serialized = self.context_serializer.serialize({
+                "crops": crop_data,
+                "financial": financial_data,
+                "weather": weather_data
+            })
+        prompt_stats = {k: v for k, v in serialized.items() if k != "text"}
+        self.telemetry.observe("agent_prompt_tokens", serialized["tokens_after"])
+        stats["prompt_size"] = prompt_stats
+        logger.info(f"Prompt context for {user_id}: {prompt_stats}")
+        
+        # Generate insights using the LLM
+        analysis["prompt"] = f"""
+        Analyze the following farm data (compact JSON) and provide actionable insights:
+        
+        Farm Data: {serialized["text"]}
+        Unavailable Sources: {", ".join(missing_sources) or "none"}{self._reported_line(analysis)}
+        
+        Please provide 3-5 key insights in JSON format with the following structure:
+        [
+            {{
+                "title": "Insight Title",
+                "description": "Detailed explanation and recommendation",
+                "confidence": 0.85,
+                "actionable": true,
+                "priority": "High"
+            }}
+        ]
+        """
+        
+        if self.insight_cache:
+            analysis["cache_key"] = InsightCache.make_key(self.model_settings, analysis["prompt"], self.system_prompt)
+            cached = self.insight_cache.get(analysis["cache_key"])
+            self.telemetry.increment("agent_cache_requests_total", cache="insight",
+                                     result="hit" if cached is not None else "miss")
+            if cached is not None:
+                stats["insight_cache"] = "hit"
+                self._save_state(analysis, cached)
+                analysis["insights"] = cached
+                return analysis
+            stats["insight_cache"] = "miss"
+        
+        return analysis
+    
+    def _apply_rules(self, analysis: Dict[str, Any], sources: Dict[str, Any]) -> bool:
+        """
+        Evaluate the deterministic rules on the fetched data. Returns True (with
+        analysis["insights"] set) when they cover the farm well enough to skip the model.
+        """
+        with self.telemetry.stage("rules"):
+            facts = farm_facts(analysis["crop_data"], analysis["financial_data"],
+                               analysis["weather_data"], sources.get("weather_outlook"))
+            outcome = self.rule_engine.evaluate(facts, available=rule_categories(sources))
+        analysis["rule_insights"] = outcome["insights"][:MAX_INSIGHTS]
+        covered = outcome["sufficient"] or len(outcome["insights"]) >= MAX_INSIGHTS
+        analysis["stats"]["rules"] = {
+            "fired": outcome["fired"],
+            "categories": outcome["categories"],
+            "llm_skipped": covered
+        }
+        self.telemetry.increment("agent_rule_evaluations_total",
+                                 outcome="covered" if covered else "partial" if outcome["fired"] else "none")
+        if not covered:
+            return False
+        self.telemetry.increment("agent_llm_calls_avoided_total")
+        analysis["insights"] = analysis["rule_insights"]
+        self._remember_insights(analysis, analysis["insights"])
+        return True
+    
+    def _reported_line(self, analysis: Dict[str, Any]) -> str:
+        """Prompt line listing the insights the rules already produced, so the model adds new ones"""
+        if not analysis["rule_insights"]:
+            return ""
+        titles = "; ".join(insight["title"] for insight in analysis["rule_insights"])
+        return f"\n        Already Reported (do not repeat): {titles}"
+    
+    def _remember_insights(self, analysis: Dict[str, Any], insights: List[Dict[str, Any]]):
+        """Store freshly generated insights in the insight cache and incremental state"""
+        if not insights:
+            return
+        if analysis["cache_key"]:
+            self.insight_cache.put(analysis["cache_key"], insights)
+        self._save_state(analysis, insights)
+    
+    def _save_state(self, analysis: Dict[str, Any], insights: List[Dict[str, Any]]):
+        """Record the analyzed inputs, snapshots and insights when every source was available"""
+        if self.analysis_state and not analysis["missing_sources"]:
+            self.analysis_state.put(analysis["user_id"], analysis["fingerprints"], analysis["cursor"],
+                                    insights, analysis["snapshots"], analysis["synced_at"])
+    
+    def close(self):
+        """Close the insight cache and incremental state stores"""
+        if self.insight_cache:
+            self.insight_cache.close()
+        if self.analysis_state:
+            self.analysis_state.close()
+    
+    def _analysis_error_insight(self) -> Dict[str, Any]:
+        return {
+            "title": "Analysis Error",
+            "description": "Unable to complete farm analysis at this time. Please try again later.",
+            "confidence": 0.0,
+            "actionable": False,
+            "priority": "Low"
+        }
+    
+    async def analyze_farms_batch(self, farms: Union[Iterable[Tuple[str, Optional[str]]],
+                                                     AsyncIterator[Tuple[str, Optional[str]]]],
+                                  concurrency: int = 10,
+                                  checkpoint_path: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Analyze a stream of (user_id, location) pairs with bounded concurrency,
+        yielding each user's result as soon as it finishes.
+        
+        Weather lookups are shared between users in the same location, and each
+        result carries that user's analysis stats. When checkpoint_path is given, finished users are appended to it as JSON
+        lines and skipped when the batch is re-run after a crash.
+        """
+        completed = self._load_checkpoint(checkpoint_path)
+        weather_memo: Dict[str, asyncio.Task] = {}
+        work: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        results: asyncio.Queue = asyncio.Queue()
+        
+        async def produce():
+            try:
+                async for user_id, location in _iterate(farms):
+                    if (user_id, location or "") not in completed:
+                        await work.put((user_id, location))
+            finally:
+                for _ in range(concurrency):
+                    await work.put(None)
+        
+        async def consume():
+            while True:
+                item = await work.get()
+                if item is None:
+                    break
+                user_id, location = item
+                stats: Dict[str, Any] = {}
+                insights = await self.analyze_farm_performance(user_id, location, weather_memo, stats=stats)
+                await results.put({"user_id": user_id, "location": location, "insights": insights, "stats": stats})
+            await results.put(None)
+        
+        producer = asyncio.create_task(produce())
+        workers = [asyncio.create_task(consume()) for _ in range(concurrency)]
+        checkpoint = open(checkpoint_path, "a", encoding="utf-8") if checkpoint_path else None
+        try:
+            running = len(workers)
+            while running:
+                result = await results.get()
+                if result is None:
+                    running -= 1
+                    continue
+                if checkpoint:
+                    checkpoint.write(json.dumps(result) + "\n")
+                    checkpoint.flush()
+                yield result
+            # Surface errors from the input stream
+            await producer
+        finally:
+            for task in [producer, *workers, *weather_memo.values()]:
+                task.cancel()
+            if checkpoint:
+                checkpoint.close()
+    
+    def _load_checkpoint(self, checkpoint_path: Optional[str]) -> Set[Tuple[str, str]]:
+        """Read the (user_id, location) pairs already finished by a previous run"""
+        completed = set()
+        if not checkpoint_path or not os.path.exists(checkpoint_path):
+            return completed
+        with open(checkpoint_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a partially written last line
+                    continue
+                completed.add((entry["user_id"], entry.get("location") or ""))
+        return completed
+    
+    async def _fetch_changes(self, user_id: str, location: Optional[str], state: Dict[str, Any],
+                             weather_memo: Optional[Dict[str, asyncio.Task]],
+                             stats: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], List[str]]]:
+        """
+        Ask the bridge only for farm records changed since the last analysis
+        and apply them to the stored snapshots, so a changed farm costs one
+        round trip per source like a full fetch. Returns None when a full
+        fetch is needed: no snapshots yet, snapshots due a resync, a
+        financial summary whose oldest activity has left its window, or a
+        delta that failed.
+        """
+        snapshots = state.get("snapshots")
+        if not state.get("cursor") or not snapshots or not state.get("synced_at"):
+            return None
+        if time.time() - state["synced_at"] > self.resync_seconds:
+            return None
+        if financial_window_expired(snapshots["financial_data"]):
+            return None
+        since = {
+            "crop_data": state["cursor"],
+            # Strictly after the newest stored activity, so none is counted twice
+            "financial_data": financial_cursor(snapshots["financial_data"]) or state["cursor"]
+        }
+        deltas, missing_sources = await self._gather_farm_data(user_id, location, weather_memo, since, stats)
+        if any(name in missing_sources for name in SNAPSHOT_SOURCES):
+            return None
+        stats["delta"] = True
+        return {**deltas, **merge_deltas(snapshots, deltas)}, missing_sources
+    
+    async def _gather_farm_data(self, user_id: str, location: Optional[str],
+                                weather_memo: Optional[Dict[str, asyncio.Task]] = None,
+                                since: Optional[Dict[str, Optional[str]]] = None,
+                                stats: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Fetch all data sources concurrently, each under its own deadline.
+        Sources that fail or time out are reported as missing instead of
+        aborting the analysis. Farm sources with a cursor in since are
+        fetched as deltas. Fetch timings are added to stats.
+        """
+        since = since or {}
+        pending = {
+            "crop_data": lambda: self.farm_data_tool.get_crop_data(user_id, since.get("crop_data")),
+            "financial_data": lambda: self.farm_data_tool.get_financial_data(user_id, since.get("financial_data"))
+        }
+        if location:
+            pending["weather_data"] = lambda: self._get_weather(location, weather_memo)
+            if self.rule_engine:
+                # Frost, rainfall and dry-day facts for the rules
+                pending["weather_outlook"] = lambda: self.weather_tool.get_agricultural_conditions(location)
+        
+        results = await asyncio.gather(*[
+            self._fetch_source(name, fetch) for name, fetch in pending.items()
+        ])
+        
+        sources = {}
+        timings_ms = {}
+        missing_sources = []
+        for name, result, elapsed_ms in results:
+            sources[name] = result
+            timings_ms[name] = elapsed_ms
+            if not result.get("success"):
+                missing_sources.append(name)
+        
+        fetch_stats = {
+            "user_id": user_id,
+            "timings_ms": timings_ms,
+            "slowest_source": max(timings_ms, key=timings_ms.get),
+            "missing_sources": missing_sources
+        }
+        if stats is not None:
+            stats.update(fetch_stats)
+        logger.info(f"Farm data fetch for {user_id}: {fetch_stats}")
+        return sources, missing_sources
+    
+    def _get_weather(self, location: str,
+                     weather_memo: Optional[Dict[str, asyncio.Task]]) -> Awaitable[Dict[str, Any]]:
+        """Return the weather lookup for a location, reusing one already in flight"""
+        if weather_memo is None:
+            return self.weather_tool.get_current_weather(location)
+        key = " ".join(location.lower().split())
+        if key not in weather_memo:
+            weather_memo[key] = asyncio.ensure_future(self.weather_tool.get_current_weather(location))
+        # Shield so one user's deadline doesn't cancel the lookup for the others
+        return asyncio.shield(weather_memo[key])
+    
+    async def _fetch_source(self, name: str,
+                            fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Tuple[str, Dict[str, Any], float]:
+        """Await one data source under its deadline and time it"""
+        timeout = self.source_timeouts.get(name)
+        start = time.perf_counter()
+        with self.telemetry.stage("fetch", source=name):
+            try:
+                result = await asyncio.wait_for(fetch(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Data source {name} timed out after {timeout}s")
+                result = {"success": False, "error": f"Timed out after {timeout}s"}
+            except Exception as e:
+                logger.error(f"Error fetching {name}: {e}")
+                result = {"success": False, "error": str(e)}
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        if self.telemetry.enabled:
+            if result.get("success"):
+                self.telemetry.observe("agent_payload_bytes", len(json.dumps(result, default=str)), source=name)
+            else:
+                self.telemetry.increment("agent_source_errors_total", source=name)
+        return name, result, elapsed_ms
     
     def _validate_insights(self, insights: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Validate and clean up insights from LLM"""
         validated = []
         
         for insight in insights:
-            if isinstance(insight, dict) and "title" in insight and "description" in insight:
-                # Ensure all required fields are present with defaults
-                validated_insight = {
-                    "title": insight.get("title", "Untitled Insight"),
-                    "description": insight.get("description", "No description available"),
-                    "confidence": max(0.0, min(1.0, insight.get("confidence", 0.5))),
-                    "actionable": bool(insight.get("actionable", False)),
-                    "priority": insight.get("priority", "Medium")
-                }
-                validated.append(validated_insight)
-        
-        return validated[:5]  # Limit to 5 insights
+            # Coerces string/percent confidences, yes/no flags and priority casing
+            normalized = normalize_insight(insight)
+            if normalized is not None:
+                validated.append(normalized)
+        
+        return validated[:MAX_INSIGHTS]
     
     def _generate_fallback_insights(self, crop_data: Dict, financial_data: Dict) -> List[Dict[str, Any]]:
         """Generate simple fallback insights if LLM fails"""
@@ -233,14 +747,26 @@ class FarmAnalyticsAgent(LlmAgent):
         
         return insights
 
+async def _iterate(items):
+    """Iterate a sync or async iterable uniformly"""
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
 # Agent factory function for ADK
-def create_analytics_agent(config: Dict[str, Any]) -> FarmAnalyticsAgent:
-    """Create and configure the farm analytics agent"""
+def create_analytics_agent(config: Optional[Dict[str, Any]] = None) -> FarmAnalyticsAgent:
+    """Create and configure the farm analytics agent; without a config, from config/adk-config.yaml"""
+    if config is None:
+        config = analytics_agent_config(get_adk_config())
     return FarmAnalyticsAgent(config)
 
 # Example usage and testing
 if __name__ == "__main__":
     import asyncio
+    from tools.telemetry import configure_telemetry
     
     # Example configuration
     config = {
@@ -256,8 +782,13 @@ if __name__ == "__main__":
         "weather_api": {
             "base_url": "https://api.openweathermap.org/data/2.5",
             "auth": {"key": "your-weather-key"}
+        },
+        "insight_cache": {
+            "path": ".cache/insights.db",
+            "ttl_seconds": 6 * 3600
         }
     }
+    configure_telemetry({"enabled": True, "tracing": False})
     
     async def test_agent():
         agent = create_analytics_agent(config)
@@ -0,0 +1,270 @@
+"""
+Incremental Analysis State - per-user input fingerprints, data snapshots and stored insights
+Lets the analytics agent skip farms whose data hasn't materially changed and
+apply change deltas to the last snapshot instead of re-fetching it
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Record timestamps the bridge emits, newest-wins
+TIMESTAMP_KEYS = ("updatedAt", "createdAt", "date", "harvestDate")
+
+# Volatile keys ignored when fingerprinting weather
+VOLATILE_KEYS = {"timestamp", "description"}
+
+# Farm data sources that are fetched as deltas and kept as snapshots
+SNAPSHOT_SOURCES = ("crop_data", "financial_data")
+
+# Recent activities the financial route returns for context
+RECENT_ACTIVITIES = 20
+
+# The financial route's default reporting window
+DEFAULT_WINDOW_DAYS = 30
+
+
+def scan_records(payload: Any) -> Tuple[int, Optional[str]]:
+    """Count timestamped records in a payload and find the newest timestamp"""
+    count = 0
+    latest = None
+    stack = [payload]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stamps = [str(value[key]) for key in TIMESTAMP_KEYS if value.get(key)]
+            if stamps:
+                count += 1
+                newest = max(stamps)
+                if latest is None or newest > latest:
+                    latest = newest
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return count, latest
+
+
+def _coarse(value: Any) -> Any:
+    """Round numbers so insignificant weather jitter doesn't count as a change"""
+    if isinstance(value, dict):
+        return {k: _coarse(v) for k, v in value.items() if k not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_coarse(v) for v in value]
+    if isinstance(value, float):
+        return round(value)
+    return value
+
+
+def fingerprint_sources(sources: Dict[str, Any]) -> Dict[str, str]:
+    """Fingerprint each data source: record count + newest timestamp, coarse values for weather"""
+    fingerprints = {}
+    for name, response in sources.items():
+        if not isinstance(response, dict) or not response.get("success"):
+            fingerprints[name] = "unavailable"
+            continue
+        data = response.get("data")
+        if name.startswith("weather"):
+            material = _coarse(data)
+        else:
+            material = scan_records(data)
+        encoded = json.dumps(material, sort_keys=True, default=str).encode("utf-8")
+        fingerprints[name] = hashlib.sha1(encoded).hexdigest()
+    return fingerprints
+
+
+def _records(response: Dict[str, Any], key: str) -> List[Dict[str, Any]]:
+    return (response.get("data") or {}).get(key) or []
+
+
+def _cost_efficiency(average_cost: float) -> str:
+    """Same bands as calculateCostEfficiencyRating in the financial route"""
+    if average_cost < 50:
+        return "Excellent"
+    if average_cost < 100:
+        return "Good"
+    if average_cost < 200:
+        return "Fair"
+    return "Needs Improvement"
+
+
+def _removed_crops(snapshot: Dict[str, Any], delta: Dict[str, Any]) -> List[Any]:
+    """Ids of stored crops missing from the delta's list of current crop ids"""
+    current = (delta.get("data") or {}).get("cropIds")
+    if current is None:
+        return []
+    current = set(current)
+    return [crop.get("id") for crop in _records(snapshot, "crops") if crop.get("id") not in current]
+
+
+def merge_crop_delta(snapshot: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply changed crops (by id) to a crops response, drop deleted ones and recompute its summary"""
+    crops = {crop.get("id"): crop for crop in _records(snapshot, "crops")}
+    for crop_id in _removed_crops(snapshot, delta):
+        del crops[crop_id]
+    for crop in _records(delta, "crops"):
+        crops[crop.get("id")] = crop
+    merged = list(crops.values())
+    statuses: Dict[str, int] = {}
+    for crop in merged:
+        statuses[crop.get("status")] = statuses.get(crop.get("status"), 0) + 1
+    summary = {
+        **((snapshot.get("data") or {}).get("summary") or {}),
+        "totalCrops": len(merged),
+        "cropTypes": list(dict.fromkeys(crop.get("name") for crop in merged)),
+        "statusDistribution": statuses,
+        "totalArea": sum(crop.get("area") or 0 for crop in merged)
+    }
+    return {**delta, "data": {**(delta.get("data") or {}), "crops": merged, "summary": summary}}
+
+
+def merge_financial_delta(snapshot: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Add a financial summary of new activities to a stored one. The delta must
+    start after the newest stored activity (see financial_cursor), or
+    activities are counted twice, and the stored summary must still cover
+    its whole window (see financial_window_expired).
+    """
+    old = snapshot.get("data") or {}
+    new = delta.get("data") or {}
+    old_summary = old.get("summary") or {}
+    new_summary = new.get("summary") or {}
+    total_cost = (old_summary.get("totalCost") or 0) + (new_summary.get("totalCost") or 0)
+    count = (old_summary.get("activityCount") or 0) + (new_summary.get("activityCount") or 0)
+    average_cost = total_cost / count if count else 0
+    costs_by_type = dict(old_summary.get("costsByType") or {})
+    for activity_type, cost in (new_summary.get("costsByType") or {}).items():
+        costs_by_type[activity_type] = costs_by_type.get(activity_type, 0) + cost
+    highest = max(costs_by_type.items(), key=lambda item: item[1], default=None)
+    summary = {
+        **old_summary,
+        "totalCost": round(total_cost, 2),
+        "averageCost": round(average_cost, 2),
+        "activityCount": count,
+        "costsByType": costs_by_type,
+        "highestCostType": {
+            "type": highest[0],
+            "amount": round(highest[1], 2),
+            "percentage": round(highest[1] / total_cost * 100) if total_cost else 0
+        } if highest else None,
+        "costEfficiency": _cost_efficiency(average_cost)
+    }
+    recent = sorted(_records(delta, "recentActivities") + _records(snapshot, "recentActivities"),
+                    key=lambda activity: str(activity.get("createdAt") or ""), reverse=True)
+    return {**delta, "data": {
+        **old, **new,
+        "summary": summary,
+        "totalActivities": (old.get("totalActivities") or 0) + (new.get("totalActivities") or 0),
+        "recentActivities": recent[:RECENT_ACTIVITIES],
+        # The delta's activities are all newer than the stored ones
+        "oldestActivityAt": old.get("oldestActivityAt") or new.get("oldestActivityAt")
+    }}
+
+
+def financial_cursor(snapshot: Dict[str, Any]) -> Optional[str]:
+    """createdAt of the newest stored activity; the route's `since` is exclusive, so nothing repeats"""
+    return scan_records(_records(snapshot, "recentActivities"))[1]
+
+
+def financial_window_expired(snapshot: Dict[str, Any], now: Optional[datetime] = None) -> bool:
+    """
+    Whether the oldest activity in a stored financial summary has left the
+    route's reporting window, so adding deltas to it would no longer match
+    what the route reports
+    """
+    data = snapshot.get("data") or {}
+    oldest = data.get("oldestActivityAt")
+    if not oldest:
+        return False
+    try:
+        days = int(str(data.get("timeRange") or DEFAULT_WINDOW_DAYS).split()[0])
+        oldest_at = datetime.fromisoformat(str(oldest).replace("Z", "+00:00"))
+    except ValueError:
+        return True
+    if oldest_at.tzinfo is None:
+        oldest_at = oldest_at.replace(tzinfo=timezone.utc)
+    return oldest_at <= (now or datetime.now(timezone.utc)) - timedelta(days=days)
+
+
+def merge_deltas(snapshots: Dict[str, Any], deltas: Dict[str, Any]) -> Dict[str, Any]:
+    """Current crop and financial responses from stored snapshots and their change deltas"""
+    merged = {}
+    for name, merge in (("crop_data", merge_crop_delta), ("financial_data", merge_financial_delta)):
+        delta = deltas[name]
+        # An empty delta leaves the snapshot, and so its fingerprint, as it was
+        changed = scan_records(delta.get("data"))[0] or _removed_crops(snapshots[name], delta)
+        merged[name] = merge(snapshots[name], delta) if changed else snapshots[name]
+    return merged
+
+
+class AnalysisStateStore:
+    """
+    SQLite store per user of the last analyzed fingerprints, change cursor
+    and insights, plus the crop and financial snapshots deltas are applied to
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS analysis_state (
+                user_id TEXT PRIMARY KEY,
+                fingerprints TEXT NOT NULL,
+                cursor TEXT,
+                insights TEXT NOT NULL,
+                analyzed_at REAL NOT NULL
+            )
+        """)
+        # Columns added after the first release
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(analysis_state)")}
+        for column, ddl in (("snapshots", "TEXT"), ("synced_at", "REAL")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE analysis_state ADD COLUMN {column} {ddl}")
+        self._conn.commit()
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Return the stored state for a user, if any"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprints, cursor, insights, analyzed_at, snapshots, synced_at "
+                "FROM analysis_state WHERE user_id = ?",
+                (user_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "fingerprints": json.loads(row[0]),
+            "cursor": row[1],
+            "insights": json.loads(row[2]),
+            "analyzed_at": row[3],
+            "snapshots": json.loads(row[4]) if row[4] else None,
+            # When the snapshots were last fetched in full rather than merged
+            "synced_at": row[5]
+        }
+
+    def put(self, user_id: str, fingerprints: Dict[str, str], cursor: Optional[str],
+            insights: List[Dict[str, Any]], snapshots: Optional[Dict[str, Any]] = None,
+            synced_at: Optional[float] = None):
+        """Record the inputs and insights of a completed analysis"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analysis_state "
+                "(user_id, fingerprints, cursor, insights, analyzed_at, snapshots, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (user_id, json.dumps(fingerprints), cursor, json.dumps(insights), time.time(),
+                 json.dumps(snapshots) if snapshots else None, synced_at)
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
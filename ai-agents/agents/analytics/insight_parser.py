@@ -0,0 +1,307 @@
+"""
+Insight Stream Parser - incremental parsing of the LLM insight array
+Emits each insight object as soon as its closing brace arrives, repairing
+fenced, prose-wrapped, truncated and loosely formatted output
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import ast
+import json
+import re
+
+REQUIRED_FIELDS = ("title", "description")
+PRIORITIES = {"high": "High", "medium": "Medium", "low": "Low", "critical": "High", "urgent": "High"}
+NUMERIC_PRIORITIES = {1: "High", 2: "Medium"}
+TRUE_STRINGS = {"true", "yes", "y", "1"}
+
+# Typographic quotes models sometimes emit in place of ASCII ones
+SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+_JSON_TO_PYTHON = {"true": "True", "false": "False", "null": "None"}
+_BAREWORD = re.compile(r"[A-Za-z_]+")
+
+
+def _pythonize(text: str) -> str:
+    """Rewrite JSON literals outside strings so ast.literal_eval accepts the text"""
+    out = []
+    quote = None
+    escaped = False
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if quote:
+            out.append(char)
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == quote:
+                quote = None
+            i += 1
+            continue
+        if char in "\"'":
+            quote = char
+            out.append(char)
+            i += 1
+            continue
+        match = _BAREWORD.match(text, i)
+        if match:
+            word = match.group()
+            out.append(_JSON_TO_PYTHON.get(word, word))
+            i = match.end()
+            continue
+        out.append(char)
+        i += 1
+    return "".join(out)
+
+
+def _close_truncated(text: str) -> Optional[str]:
+    """
+    Close an object cut off mid-generation: drop the unfinished member after
+    the last top-level comma and close any open brackets.
+    """
+    stack = []
+    quote = None
+    escaped = False
+    last_member_end = None
+    for index, char in enumerate(text):
+        if quote:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == quote:
+                quote = None
+            continue
+        if char in "\"'":
+            quote = char
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            if stack:
+                stack.pop()
+        elif char == "," and len(stack) == 1:
+            last_member_end = index
+    if not stack:
+        return None
+    if last_member_end is None:
+        return None
+    return text[:last_member_end] + "}"
+
+
+def repair_object(text: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Decode one object, repairing common defects. Returns (object, repair applied)."""
+    try:
+        parsed = json.loads(text)
+        return (parsed, None) if isinstance(parsed, dict) else (None, None)
+    except json.JSONDecodeError:
+        pass
+
+    candidates = [("smart_quotes", text.translate(SMART_QUOTES))]
+    closed = _close_truncated(candidates[0][1])
+    if closed is not None:
+        candidates.append(("truncated", closed))
+    for repair, candidate in candidates:
+        try:
+            parsed = json.loads(candidate)
+        except json.JSONDecodeError:
+            # Single quotes, trailing commas and Python literals
+            try:
+                parsed = ast.literal_eval(_pythonize(candidate))
+            except (ValueError, SyntaxError, MemoryError, RecursionError):
+                continue
+            repair = "truncated" if repair == "truncated" else "syntax"
+        if isinstance(parsed, dict):
+            return parsed, repair
+    return None, None
+
+
+def _coerce_confidence(value: Any) -> float:
+    percent = False
+    if isinstance(value, str):
+        text = value.strip()
+        percent = text.endswith("%")
+        try:
+            value = float(text.rstrip("%"))
+        except ValueError:
+            return 0.5
+    elif not isinstance(value, (int, float)) or isinstance(value, bool):
+        return 0.5
+    if value != value:
+        return 0.5
+    # "85%" or a whole 85 means 85%; anything else (1.5, 250) is clamped
+    if percent or (1 < value <= 100 and float(value).is_integer()):
+        value = value / 100
+    return max(0.0, min(1.0, float(value)))
+
+
+def _coerce_priority(value: Any) -> str:
+    if isinstance(value, str):
+        text = value.strip()
+        if not text.isdigit():
+            return PRIORITIES.get(text.lower(), text) if text else "Medium"
+        value = int(text)
+    elif not isinstance(value, (int, float)) or isinstance(value, bool):
+        return "Medium"
+    # Numeric ranks: 1 is the most urgent
+    return NUMERIC_PRIORITIES.get(int(value), "High" if value < 1 else "Low")
+
+
+def normalize_insight(insight: Any) -> Optional[Dict[str, Any]]:
+    """Validate one insight against the schema and coerce its fields, or return None"""
+    if not isinstance(insight, dict):
+        return None
+    if any(not isinstance(insight.get(field), str) or not insight[field].strip() for field in REQUIRED_FIELDS):
+        return None
+    actionable = insight.get("actionable", False)
+    if isinstance(actionable, str):
+        actionable = actionable.strip().lower() in TRUE_STRINGS
+    return {
+        "title": insight["title"].strip(),
+        "description": insight["description"].strip(),
+        "confidence": _coerce_confidence(insight.get("confidence", 0.5)),
+        "actionable": bool(actionable),
+        "priority": _coerce_priority(insight.get("priority"))
+    }
+
+
+class InsightStreamParser:
+    """
+    Incremental parser for a streamed JSON array of insight objects.
+    With repair=True, objects that fail to decode are repaired, a response
+    without an array yields its top-level objects, and finish() salvages an
+    object cut off by truncation.
+    """
+
+    def __init__(self, repair: bool = False):
+        self.repair = repair
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._in_array = False
+        self._done = False
+        self.repairs: List[str] = []
+        self.dropped = 0
+
+    @property
+    def done(self) -> bool:
+        """True once the top-level array has closed"""
+        return self._done
+
+    @property
+    def opened(self) -> bool:
+        """True once the top-level array has opened"""
+        return self._in_array
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume a chunk of model output and return any insight objects it completed"""
+        completed = []
+        for char in chunk:
+            if self._done:
+                break
+            if not self._in_array and self._depth == 0:
+                # Skip anything (prose, code fences) before the array opens
+                if char == "[":
+                    self._in_array = True
+                elif char == "{" and self.repair:
+                    # Bare object(s) without an enclosing array
+                    self._depth = 1
+                    self._buffer = [char]
+                continue
+
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._buffer = [char]
+                elif char == "]":
+                    self._done = True
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    parsed = self._decode("".join(self._buffer))
+                    if parsed is not None:
+                        completed.append(parsed)
+                    self._buffer = []
+        return completed
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """Call when the output ends; returns a repaired trailing object cut off mid-way"""
+        if self._depth == 0 or not self._buffer:
+            return []
+        text = "".join(self._buffer)
+        self._buffer = []
+        self._depth = 0
+        self._in_string = False
+        if not self.repair:
+            self.dropped += 1
+            return []
+        parsed = self._decode(text)
+        return [parsed] if parsed is not None else []
+
+    def _decode(self, text: str) -> Optional[Dict[str, Any]]:
+        if not self.repair:
+            try:
+                parsed = json.loads(text)
+            except json.JSONDecodeError:
+                parsed = None
+            if isinstance(parsed, dict):
+                return parsed
+            self.dropped += 1
+            return None
+        parsed, repair = repair_object(text)
+        if parsed is None:
+            self.dropped += 1
+        elif repair:
+            self.repairs.append(repair)
+        return parsed
+
+
+def parse_insight_response(text: str, limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Extract, repair and validate insights from a complete model response in
+    one pass. status is "clean" (strict JSON array), "repaired" (insights
+    recovered only through repair) or "failed" (nothing usable).
+    """
+    try:
+        strict = json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        strict = None
+    if isinstance(strict, list):
+        insights = [i for i in (normalize_insight(item) for item in strict) if i is not None]
+        if insights:
+            return {
+                "insights": insights[:limit] if limit else insights,
+                "status": "clean",
+                "repairs": [],
+                "dropped": len(strict) - len(insights)
+            }
+
+    parser = InsightStreamParser(repair=True)
+    candidates = parser.feed(text or "") + parser.finish()
+    insights = [i for i in (normalize_insight(c) for c in candidates) if i is not None]
+    repairs = list(parser.repairs)
+    if not (text or "").lstrip().startswith("["):
+        repairs.append("extracted")
+    if parser.opened and not parser.done:
+        repairs.append("unterminated")
+    return {
+        "insights": insights[:limit] if limit else insights,
+        "status": "repaired" if insights else "failed",
+        "repairs": repairs,
+        "dropped": parser.dropped + len(candidates) - len(insights)
+    }
@@ -0,0 +1,358 @@
+"""
+Insight Rule Engine - deterministic insights computed straight from farm data
+Declarative threshold rules compiled once and evaluated per farm or column-wise
+across many farms, emitting insights in the same schema as the LLM path
+"""
+
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Set
+from datetime import datetime, timedelta, timezone
+import operator
+import re
+
+from tools.activity_aggregator import parse_timestamp
+
+MISSING = float("nan")
+
+# Every fact a rule can test, by category. Facts that can't be derived from
+# the data at hand are NaN, and a condition on a NaN fact never matches.
+FACTS = {
+    "crops": ("crop_count", "growing_crops", "planned_crops", "harvest_due_14d", "overdue_harvests"),
+    "finance": ("cost_30d", "activities_30d", "avg_activity_cost", "recent_cost_share", "cost_change_pct"),
+    "weather": ("temperature", "humidity", "wind_speed", "precipitation",
+                "frost_risk", "total_precipitation_mm", "dry_days", "high_wind_days")
+}
+FACT_NAMES = tuple(name for names in FACTS.values() for name in names)
+FACT_CATEGORIES = {name: category for category, names in FACTS.items() for name in names}
+
+PRIORITY_RANK = {"High": 0, "Medium": 1, "Low": 2}
+
+# Weather thresholds match WeatherTool._generate_weather_recommendations
+DEFAULT_RULES: List[Dict[str, Any]] = [
+    {
+        "id": "frost_warning",
+        "when": ["frost_risk == 1"],
+        "title": "Frost Risk in the Next 3 Days",
+        "description": "Frost risk in next 3 days. Protect sensitive crops and delay planting.",
+        "confidence": 0.9, "actionable": True, "priority": "High"
+    },
+    {
+        "id": "irrigation",
+        "when": ["total_precipitation_mm < 10", "dry_days > 5"],
+        "title": "Dry Week Ahead",
+        "description": "Only {total_precipitation_mm:.0f} mm of rain expected over {dry_days:.0f} dry days. "
+                       "Consider irrigation for water-sensitive crops.",
+        "confidence": 0.8, "actionable": True, "priority": "Medium"
+    },
+    {
+        "id": "drainage",
+        "when": ["total_precipitation_mm > 50"],
+        "title": "Heavy Rainfall Expected",
+        "description": "{total_precipitation_mm:.0f} mm of rain expected this week. "
+                       "Ensure proper field drainage and delay fieldwork.",
+        "confidence": 0.8, "actionable": True, "priority": "Medium"
+    },
+    {
+        "id": "wind_warning",
+        "when": ["wind_speed > 15"],
+        "title": "High Winds",
+        "description": "Winds of {wind_speed:.0f} m/s right now. Avoid spraying operations and secure equipment.",
+        "confidence": 0.9, "actionable": True, "priority": "Medium"
+    },
+    {
+        "id": "optimal_conditions",
+        "when": ["temperature > 15", "temperature < 25", "humidity < 80", "precipitation == 0"],
+        "title": "Good Conditions for Fieldwork",
+        "description": "Excellent conditions for fieldwork and crop management activities.",
+        "confidence": 0.8, "actionable": False, "priority": "Low"
+    },
+    {
+        "id": "overdue_harvest",
+        "when": ["overdue_harvests > 0"],
+        "title": "Harvest Overdue",
+        "description": "{overdue_harvests:.0f} crop(s) are past their expected harvest date. "
+                       "Check maturity and schedule harvesting to avoid field losses.",
+        "confidence": 0.85, "actionable": True, "priority": "High"
+    },
+    {
+        "id": "harvest_due",
+        "when": ["harvest_due_14d > 0"],
+        "title": "Harvest Coming Up",
+        "description": "{harvest_due_14d:.0f} crop(s) are expected to be ready within 14 days. "
+                       "Line up labour, storage and transport.",
+        "confidence": 0.85, "actionable": True, "priority": "Medium"
+    },
+    {
+        "id": "nothing_growing",
+        "when": ["crop_count > 0", "growing_crops == 0", "planned_crops == 0"],
+        "title": "No Crops Growing or Planned",
+        "description": "None of your crops are currently growing or planned. Plan the next planting to keep land productive.",
+        "confidence": 0.8, "actionable": True, "priority": "Medium"
+    },
+    {
+        "id": "no_recent_activity",
+        "when": ["growing_crops > 0", "activities_30d == 0"],
+        "title": "No Activities Recorded in 30 Days",
+        "description": "{growing_crops:.0f} crop(s) are growing but no activities were recorded in the last 30 days. "
+                       "Log field work so costs and progress stay accurate.",
+        "confidence": 0.75, "actionable": True, "priority": "Medium"
+    },
+    {
+        "id": "spending_spike",
+        "when": ["recent_cost_share > 0.5", "cost_30d > 0"],
+        "title": "Spending Concentrated in the Past Week",
+        "description": "{recent_cost_share:.0%} of the last 30 days' spending (${cost_30d:,.2f}) happened in the past week. "
+                       "Review recent purchases against planned activities.",
+        "confidence": 0.75, "actionable": True, "priority": "Medium"
+    },
+    {
+        "id": "cost_increase",
+        "when": ["cost_change_pct > 25"],
+        "title": "Monthly Costs Rising",
+        "description": "Spending rose {cost_change_pct:.0f}% compared with the previous month. "
+                       "Check which activities are driving the increase.",
+        "confidence": 0.8, "actionable": True, "priority": "Medium"
+    },
+    {
+        "id": "cost_decrease",
+        "when": ["cost_change_pct < -25"],
+        "title": "Monthly Costs Falling",
+        "description": "Spending changed {cost_change_pct:.0f}% compared with the previous month.",
+        "confidence": 0.7, "actionable": False, "priority": "Low"
+    }
+]
+
+# Rules for farm_facts, whose 30-day financial summary never spans the two
+# complete months cost_change_pct compares
+FARM_RULES = [rule for rule in DEFAULT_RULES if "cost_change_pct" not in " ".join(rule["when"])]
+
+_CONDITION = re.compile(r"^\s*([a-z_0-9]+)\s*(<=|>=|==|<|>)\s*(-?\d+(?:\.\d+)?)\s*$")
+_OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge, "==": operator.eq}
+
+
+def _number(value: Any) -> float:
+    """A fact value as a float: bools become 0/1, anything non-numeric becomes NaN"""
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    return MISSING
+
+
+class CompiledRule:
+    """One rule with its conditions parsed into (fact, operator, threshold) triples"""
+
+    __slots__ = ("id", "conditions", "categories", "insight", "template", "rank")
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.id = spec["id"]
+        self.conditions = []
+        for condition in spec["when"]:
+            match = _CONDITION.match(condition)
+            if not match:
+                raise ValueError(f"Rule '{self.id}': cannot parse condition '{condition}'")
+            fact, op, threshold = match.groups()
+            if fact not in FACT_CATEGORIES:
+                raise ValueError(f"Rule '{self.id}': unknown fact '{fact}'")
+            self.conditions.append((fact, op, float(threshold)))
+        self.categories = {FACT_CATEGORIES[fact] for fact, _, _ in self.conditions}
+        self.template = spec["description"]
+        self.insight = {
+            "title": spec["title"],
+            "description": spec["description"],
+            "confidence": float(spec.get("confidence", 0.8)),
+            "actionable": bool(spec.get("actionable", False)),
+            "priority": spec.get("priority", "Medium")
+        }
+        self.rank = (PRIORITY_RANK.get(self.insight["priority"], 1), -self.insight["confidence"])
+
+    def matches(self, facts: Dict[str, float]) -> bool:
+        # NaN compares False with every operator, so missing facts never match
+        return all(_OPERATORS[op](facts.get(fact, MISSING), threshold)
+                   for fact, op, threshold in self.conditions)
+
+    def render(self, facts: Dict[str, float]) -> Dict[str, Any]:
+        """The rule's insight with its description filled in from the facts"""
+        return {**self.insight, "description": self.template.format(**facts)}
+
+
+class RuleEngine:
+    """
+    Evaluates compiled rules against farm facts. evaluate() handles one farm;
+    evaluate_many() tests each condition once per rule over a facts matrix for
+    all farms at once.
+    """
+
+    def __init__(self, rules: Optional[Sequence[Dict[str, Any]]] = None, min_insights: int = 3,
+                 required_categories: Iterable[str] = ("crops", "finance", "weather")):
+        self.rules = sorted((CompiledRule(spec) for spec in (rules or DEFAULT_RULES)),
+                            key=lambda rule: rule.rank)
+        self.min_insights = min_insights
+        self.required_categories = set(required_categories)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RuleEngine":
+        """Build an engine from an agent's `rules:` config block"""
+        return cls(
+            rules=config.get("rules"),
+            min_insights=config.get("min_insights", 3),
+            required_categories=config.get("required_categories", ("crops", "finance", "weather"))
+        )
+
+    def evaluate(self, facts: Dict[str, Any], available: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Fire every matching rule for one farm, most urgent first"""
+        values = {name: _number(facts.get(name)) for name in FACT_NAMES}
+        fired = [rule for rule in self.rules if rule.matches(values)]
+        return self._outcome(fired, values, available)
+
+    def evaluate_many(self, fact_rows: Sequence[Dict[str, Any]],
+                      available: Optional[Sequence[Iterable[str]]] = None) -> List[Dict[str, Any]]:
+        """evaluate() for many farms, with each condition tested column-wise across all of them"""
+        import numpy as np  # Only bulk evaluation needs it
+
+        if not fact_rows:
+            return []
+        columns = {}
+        for name in FACT_NAMES:
+            values = [row.get(name) for row in fact_rows]
+            try:
+                # None becomes NaN and bools 0/1, as in _number
+                columns[name] = np.array(values, dtype=np.float64)
+            except (TypeError, ValueError):
+                columns[name] = np.array([_number(value) for value in values], dtype=np.float64)
+        matrix = np.column_stack([columns[name] for name in FACT_NAMES])
+        ufuncs = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal, "==": np.equal}
+        fired = np.ones((len(fact_rows), len(self.rules)), dtype=bool)
+        for j, rule in enumerate(self.rules):
+            for fact, op, threshold in rule.conditions:
+                fired[:, j] &= ufuncs[op](columns[fact], threshold)
+
+        outcomes = []
+        for i, (row, hits) in enumerate(zip(matrix.tolist(), fired.tolist())):
+            rules = [rule for rule, hit in zip(self.rules, hits) if hit]
+            values = dict(zip(FACT_NAMES, row)) if rules else {}
+            outcomes.append(self._outcome(rules, values, available[i] if available else None))
+        return outcomes
+
+    def _outcome(self, fired: List[CompiledRule], facts: Dict[str, float],
+                 available: Optional[Iterable[str]]) -> Dict[str, Any]:
+        covered: Set[str] = set()
+        for rule in fired:
+            covered |= rule.categories
+        # Categories whose data is missing can't be covered by the model either
+        required = self.required_categories & set(available) if available is not None else self.required_categories
+        return {
+            "insights": [rule.render(facts) for rule in fired],
+            "fired": [rule.id for rule in fired],
+            "categories": sorted(covered),
+            "sufficient": len(fired) >= self.min_insights and required <= covered
+        }
+
+
+def farm_facts(crop_data: Optional[Dict[str, Any]], financial_data: Optional[Dict[str, Any]],
+               weather_data: Optional[Dict[str, Any]] = None,
+               weather_outlook: Optional[Dict[str, Any]] = None,
+               now: Optional[datetime] = None) -> Dict[str, float]:
+    """
+    Facts from tool responses: bridge crops and financial summaries, current
+    weather and WeatherTool's agricultural conditions. Relative dates are
+    measured from the bridge response time when it is given. cost_change_pct
+    is always NaN; evaluate these facts with FARM_RULES.
+    """
+    facts = dict.fromkeys(FACT_NAMES, MISSING)
+
+    if crop_data and crop_data.get("success"):
+        now = now or parse_timestamp(crop_data.get("timestamp")) or datetime.now(timezone.utc)
+        crops = (crop_data.get("data") or {}).get("crops") or []
+        soon = now + timedelta(days=14)
+        growing = planned = due = overdue = 0
+        for crop in crops:
+            status = crop.get("status")
+            if status == "GROWING":
+                growing += 1
+            elif status == "PLANNED":
+                planned += 1
+            if status in ("HARVESTED", "PLANNED") or crop.get("actualHarvestDate"):
+                continue
+            expected = parse_timestamp(crop.get("expectedHarvestDate"))
+            if expected is None:
+                continue
+            if expected < now:
+                overdue += 1
+            elif expected <= soon:
+                due += 1
+        facts.update(crop_count=len(crops), growing_crops=growing, planned_crops=planned,
+                     harvest_due_14d=due, overdue_harvests=overdue)
+
+    if financial_data and financial_data.get("success"):
+        data = financial_data.get("data") or {}
+        summary = data.get("summary") or {}
+        total_cost = _number(summary.get("totalCost"))
+        activity_count = _number(data.get("totalActivities"))
+        facts.update(cost_30d=total_cost, activities_30d=activity_count,
+                     avg_activity_cost=_number(summary.get("averageCost")))
+        recent = data.get("recentActivities") or []
+        # Only meaningful when the recent list holds every activity in the range
+        if total_cost > 0 and len(recent) >= activity_count:
+            reference = parse_timestamp(financial_data.get("timestamp")) or datetime.now(timezone.utc)
+            week_ago = reference - timedelta(days=7)
+            last_week = 0.0
+            for activity in recent:
+                created_at = parse_timestamp(activity.get("createdAt"))
+                if created_at is not None and created_at >= week_ago:
+                    last_week += activity.get("cost") or 0
+            facts["recent_cost_share"] = last_week / total_cost
+
+    if weather_data and weather_data.get("success"):
+        current = weather_data.get("data") or {}
+        for name in ("temperature", "humidity", "wind_speed", "precipitation"):
+            facts[name] = _number(current.get(name))
+
+    if weather_outlook and weather_outlook.get("success"):
+        outlook = (weather_outlook.get("data") or {}).get("weekly_outlook") or {}
+        for name in ("frost_risk", "total_precipitation_mm", "dry_days", "high_wind_days"):
+            facts[name] = _number(outlook.get(name))
+
+    return facts
+
+
+def summary_facts(summary: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, float]:
+    """Facts from an ActivityAggregator summary, including the cost trend over the last two complete months"""
+    facts = dict.fromkeys(FACT_NAMES, MISSING)
+    status = summary.get("crops_by_status") or {}
+    facts.update(crop_count=summary.get("total_crops", MISSING),
+                 growing_crops=status.get("GROWING", 0), planned_crops=status.get("PLANNED", 0))
+    window = (summary.get("rolling_costs") or {}).get("30d")
+    if window:
+        facts.update(cost_30d=window["cost"], activities_30d=window["count"],
+                     avg_activity_cost=window["cost"] / window["count"] if window["count"] else 0.0)
+    now = now or datetime.now(timezone.utc)
+    current_month = f"{now.year}-{now.month:02d}"
+    months = [cost for month, cost in (summary.get("monthly_trends") or {}).items() if month != current_month]
+    if len(months) >= 2 and months[-2] > 0:
+        facts["cost_change_pct"] = (months[-1] - months[-2]) / months[-2] * 100
+    return {name: _number(value) for name, value in facts.items()}
+
+
+def rule_categories(sources: Dict[str, Any]) -> Set[str]:
+    """Fact categories whose source data was fetched successfully"""
+    available = set()
+    if (sources.get("crop_data") or {}).get("success"):
+        available.add("crops")
+    if (sources.get("financial_data") or {}).get("success"):
+        available.add("finance")
+    if any((sources.get(name) or {}).get("success") for name in ("weather_data", "weather_outlook")):
+        available.add("weather")
+    return available
+
+
+def merge_insights(first: List[Dict[str, Any]], then: List[Dict[str, Any]],
+                   limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """first followed by the insights in then whose titles aren't already present"""
+    seen = {insight["title"].strip().lower() for insight in first}
+    merged = list(first)
+    for insight in then:
+        key = insight["title"].strip().lower()
+        if key not in seen:
+            seen.add(key)
+            merged.append(insight)
+    return merged[:limit] if limit else merged
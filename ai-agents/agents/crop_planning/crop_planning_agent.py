@@ -0,0 +1,284 @@
+"""
+Crop Planning Agent - ADK Implementation
+Planting windows, harvest timing and market-aware crop recommendations
+"""
+
+from google.ai.adk import Tool, LlmAgent
+from typing import Dict, Any, List, Optional
+from datetime import datetime, timedelta, timezone
+import logging
+
+from agents.analytics.context_serializer import FarmContextSerializer
+from agents.analytics.farm_analytics_agent import FarmDataTool, WeatherDataTool
+from agents.analytics.insight_parser import parse_insight_response
+from agents.analytics.rule_engine import PRIORITY_RANK, merge_insights
+from agents.orchestration.farm_context import FarmContext, FarmContextBuilder
+from tools.activity_aggregator import parse_timestamp
+from tools.adk_config import analytics_agent_config, get_adk_config
+from tools.rate_limiter import configure_guards
+from tools.registry import ToolRegistry
+from tools.telemetry import get_telemetry
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of recommendations returned per plan
+MAX_INSIGHTS = 5
+
+# Crops due for harvest within this window count as "coming to market"
+HARVEST_WINDOW = timedelta(days=14)
+
+class MarketDataTool(Tool):
+    """Tool to access commodity prices and trends"""
+
+    def __init__(self, registry: ToolRegistry):
+        super().__init__(
+            name="market_data_tool",
+            description="Access commodity prices, moving averages and price trends"
+        )
+        self.registry = registry
+
+    async def get_market_overview(self, commodities: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get price trends for several commodities"""
+        try:
+            return await self.registry.get("market-data-tool").get_market_overview(commodities)
+        except Exception as e:
+            logger.error(f"Error fetching market data: {e}")
+            return {"success": False, "error": str(e)}
+
+class CropPlanningAgent(LlmAgent):
+    """
+    Recommends what and when to plant and harvest from the user's crops, the
+    weekly weather outlook and commodity price trends
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(
+            name="crop_planning_agent",
+            description="Assists with crop planning, planting windows and harvest timing",
+            model_config=config.get("model", {}),
+            tools=[]
+        )
+
+        configure_guards(config.get("tools", []))
+        self.telemetry = get_telemetry()
+
+        self.tool_registry = ToolRegistry(config.get("tools") or [
+            {"name": "farm-data-tool", "config": config.get("farm_api", {})},
+            {"name": "weather-data-tool", "config": config.get("weather_api", {})},
+            {"name": "market-data-tool", "config": config.get("market_api", {})}
+        ])
+        self.farm_data_tool = FarmDataTool(self.tool_registry)
+        self.weather_tool = WeatherDataTool(self.tool_registry)
+        self.market_tool = MarketDataTool(self.tool_registry)
+        self.add_tool(self.farm_data_tool)
+        self.add_tool(self.weather_tool)
+        self.add_tool(self.market_tool)
+
+        # Standalone runs fetch through the same builder the orchestrator uses
+        self.context_builder = FarmContextBuilder(self.tool_registry, config.get("source_timeouts"))
+        self.context_serializer = FarmContextSerializer(
+            token_budget=config.get("prompt_token_budget", 1500)
+        )
+        self.last_plan_stats: Dict[str, Any] = {}
+
+        self.system_prompt = """
+        You are an expert agronomist helping a farmer plan their season. Your role is to:
+
+        1. Recommend planting windows from the weather outlook
+        2. Time harvests and sales against commodity price trends
+        3. Suggest which planned crops to expand, reduce or reconsider
+
+        Always:
+        - Base recommendations on the data provided
+        - Be specific about which crop and when
+        - Be honest about confidence levels and limitations
+        """
+
+    def context_sources(self) -> List[str]:
+        """Data sources this agent reads from a shared context"""
+        return ["crop_data", "weather_outlook", "market_overview"]
+
+    async def analyze_context(self, context: FarmContext) -> List[Dict[str, Any]]:
+        """Plan from a shared context fetched by the orchestrator"""
+        return await self.plan_crops(context.user_id, context.location, context=context)
+
+    async def plan_crops(self, user_id: str, location: Optional[str] = None,
+                         context: Optional[FarmContext] = None) -> List[Dict[str, Any]]:
+        """Planting, harvest and market recommendations for a user's crops"""
+        try:
+            if context is None:
+                context = await self.context_builder.build(user_id, location, self.context_sources())
+            sources, missing_sources = context.select(self.context_sources())
+            self.last_plan_stats = {**context.stats(), "missing_sources": missing_sources}
+
+            with self.telemetry.stage("rules", agent="crop_planning"):
+                planned = planning_insights(sources.get("crop_data"), sources.get("weather_outlook"),
+                                            sources.get("market_overview"))
+            if len(planned) >= MAX_INSIGHTS:
+                return planned[:MAX_INSIGHTS]
+
+            with self.telemetry.stage("llm_call", agent="crop_planning"):
+                response = await self.generate_response(self._build_prompt(sources, missing_sources, planned))
+            parsed = parse_insight_response(response, MAX_INSIGHTS)
+            self.telemetry.increment("agent_insight_parse_total", agent="crop_planning", outcome=parsed["status"])
+            if parsed["insights"]:
+                return merge_insights(planned, parsed["insights"], MAX_INSIGHTS)
+
+            self.telemetry.increment("agent_fallbacks_total", reason="invalid_json")
+            return planned or [self._fallback_insight(missing_sources)]
+
+        except Exception as e:
+            logger.error(f"Error in crop planning: {e}")
+            self.telemetry.increment("agent_fallbacks_total", reason="error")
+            return [self._planning_error_insight()]
+
+    def _build_prompt(self, sources: Dict[str, Any], missing_sources: List[str],
+                      planned: List[Dict[str, Any]]) -> str:
+        serialized = self.context_serializer.serialize({
+            "crops": sources.get("crop_data"),
+            "outlook": sources.get("weather_outlook"),
+            "market": _relevant_market(sources.get("crop_data"), sources.get("market_overview"))
+        })
+        self.telemetry.observe("agent_prompt_tokens", serialized["tokens_after"])
+        reported = "; ".join(insight["title"] for insight in planned) or "none"
+        return f"""
+        Plan the coming weeks for this farm (compact JSON) and provide crop planning recommendations:
+
+        Farm Data: {serialized["text"]}
+        Unavailable Sources: {", ".join(missing_sources) or "none"}
+        Already Reported (do not repeat): {reported}
+
+        Please provide 2-4 recommendations in JSON format with the following structure:
+        [
+            {{
+                "title": "Recommendation Title",
+                "description": "What to do, for which crop and when",
+                "confidence": 0.8,
+                "actionable": true,
+                "priority": "Medium"
+            }}
+        ]
+        """
+
+    def _fallback_insight(self, missing_sources: List[str]) -> Dict[str, Any]:
+        if missing_sources:
+            return {
+                "title": "Planning Data Incomplete",
+                "description": f"Could not load {', '.join(missing_sources)}. Recommendations will improve once it is available.",
+                "confidence": 0.9,
+                "actionable": False,
+                "priority": "Low"
+            }
+        return {
+            "title": "No Planning Changes Needed",
+            "description": "Your crop plan fits the weather outlook and current market trends.",
+            "confidence": 0.7,
+            "actionable": False,
+            "priority": "Low"
+        }
+
+    def _planning_error_insight(self) -> Dict[str, Any]:
+        return {
+            "title": "Planning Error",
+            "description": "Unable to prepare crop planning recommendations at this time. Please try again later.",
+            "confidence": 0.0,
+            "actionable": False,
+            "priority": "Low"
+        }
+
+def _crops(crop_data: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if not crop_data or not crop_data.get("success"):
+        return []
+    return (crop_data.get("data") or {}).get("crops") or []
+
+def _relevant_market(crop_data: Optional[Dict[str, Any]],
+                     market_overview: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Market trends for the commodities the user grows (all of them if none match)"""
+    if not market_overview or not market_overview.get("success"):
+        return market_overview
+    commodities = (market_overview.get("data") or {}).get("commodities") or {}
+    names = {(crop.get("name") or "").strip().lower() for crop in _crops(crop_data)}
+    relevant = {name: trend for name, trend in commodities.items() if name in names}
+    return {"success": True, "data": relevant or dict(commodities)}
+
+def planning_insights(crop_data: Optional[Dict[str, Any]], weather_outlook: Optional[Dict[str, Any]],
+                      market_overview: Optional[Dict[str, Any]],
+                      now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Deterministic planting-window and market-timing recommendations, most urgent first"""
+    crops = _crops(crop_data)
+    now = now or parse_timestamp((crop_data or {}).get("timestamp")) or datetime.now(timezone.utc)
+    planned = sorted({crop.get("name") or "Unnamed" for crop in crops if crop.get("status") == "PLANNED"})
+    coming = set()
+    for crop in crops:
+        if crop.get("status") in ("HARVESTED", "PLANNED") or crop.get("actualHarvestDate"):
+            continue
+        expected = parse_timestamp(crop.get("expectedHarvestDate"))
+        if expected is not None and expected <= now + HARVEST_WINDOW:
+            coming.add(crop.get("name") or "Unnamed")
+
+    insights = []
+    outlook = {}
+    if weather_outlook and weather_outlook.get("success"):
+        outlook = (weather_outlook.get("data") or {}).get("weekly_outlook") or {}
+    if planned and outlook:
+        names = ", ".join(planned)
+        rain = outlook.get("total_precipitation_mm") or 0
+        dry_days = outlook.get("dry_days") or 0
+        if outlook.get("frost_risk"):
+            insights.append({
+                "title": "Delay Planting Until Frost Passes",
+                "description": f"Frost is likely in the next 3 days. Hold off planting {names} until it clears.",
+                "confidence": 0.9, "actionable": True, "priority": "High"
+            })
+        elif dry_days > 5 and rain < 10:
+            insights.append({
+                "title": "Plan Irrigation for New Plantings",
+                "description": f"Only {rain:.0f} mm of rain over {dry_days} dry days this week. "
+                               f"Plant {names} only where you can irrigate, or wait for rain.",
+                "confidence": 0.8, "actionable": True, "priority": "Medium"
+            })
+        elif rain >= 10 and dry_days <= 5:
+            insights.append({
+                "title": "Good Planting Window",
+                "description": f"{rain:.0f} mm of rain expected this week with no frost risk. "
+                               f"A good window to plant {names}.",
+                "confidence": 0.75, "actionable": True, "priority": "Medium"
+            })
+
+    if market_overview and market_overview.get("success"):
+        commodities = (market_overview.get("data") or {}).get("commodities") or {}
+        for name in sorted(coming | set(planned)):
+            trend = commodities.get(name.strip().lower()) or {}
+            direction = trend.get("trend")
+            price = f"{trend.get('latest_price')} {trend.get('currency', '')}/{trend.get('unit', '')}"
+            if name in coming and direction == "rising":
+                insights.append({
+                    "title": f"{name} Prices Rising Ahead of Harvest",
+                    "description": f"{name} is near harvest and prices are trending up ({price}). "
+                                   "Consider storing part of the crop and selling in stages.",
+                    "confidence": 0.7, "actionable": True, "priority": "Medium"
+                })
+            elif name in coming and direction == "falling":
+                insights.append({
+                    "title": f"{name} Prices Falling Ahead of Harvest",
+                    "description": f"{name} is near harvest while prices are trending down ({price}). "
+                                   "Line up buyers early or lock in a price.",
+                    "confidence": 0.7, "actionable": True, "priority": "Medium"
+                })
+            elif name in planned and direction == "falling":
+                insights.append({
+                    "title": f"Review Planned {name} Area",
+                    "description": f"{name} prices are trending down ({price}). "
+                                   "Review the planned area or consider a forward contract before planting.",
+                    "confidence": 0.65, "actionable": True, "priority": "Low"
+                })
+
+    insights.sort(key=lambda insight: (PRIORITY_RANK.get(insight["priority"], 1), -insight["confidence"]))
+    return insights
+
+# Agent factory function for ADK
+def create_crop_planning_agent(config: Optional[Dict[str, Any]] = None) -> CropPlanningAgent:
+    """Create the crop planning agent; without a config, from config/adk-config.yaml"""
+    if config is None:
+        config = analytics_agent_config(get_adk_config(), "crop-planning-agent")
+    return CropPlanningAgent(config)
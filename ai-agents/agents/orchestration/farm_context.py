@@ -0,0 +1,189 @@
+"""
+Shared Farm Context - one immutable per-user snapshot of every agent data source
+Fetched once per request so agents running side by side never repeat a tool call
+"""
+
+from typing import Dict, Any, Callable, Awaitable, Iterable, List, Mapping, Optional, Tuple
+from datetime import datetime, timezone
+from types import MappingProxyType
+import asyncio
+import json
+import logging
+import time
+
+from agents.analytics.incremental import fingerprint_sources
+from tools.registry import ToolRegistry
+from tools.telemetry import get_telemetry
+
+logger = logging.getLogger(__name__)
+
+# Per-source deadlines (seconds), matching the analytics agent's fetch
+DEFAULT_SOURCE_TIMEOUTS = {
+    "crop_data": 5.0,
+    "financial_data": 5.0,
+    "weather_data": 5.0,
+    "weather_outlook": 5.0,
+    "market_overview": 5.0
+}
+
+
+def _read_only(*args, **kwargs):
+    raise TypeError("FarmContext data is read-only; copy it before changing it")
+
+
+class FrozenDict(dict):
+    """A dict that refuses mutation; still JSON-serializable and an isinstance(dict)"""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return dict, (thaw(self),)
+
+
+class FrozenList(list):
+    """A list that refuses mutation; still JSON-serializable and an isinstance(list)"""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return list, (thaw(self),)
+
+
+def freeze(value: Any) -> Any:
+    """Deep-copy a tool response into read-only dicts and lists"""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Plain, mutable deep copy of frozen data"""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+class FarmContext:
+    """
+    Everything the agents know about one user for one request. Sources keep
+    the {'success', 'data'|'error', 'timestamp'} tool envelope and are frozen,
+    so agents can share them without copying or interfering with each other.
+    """
+
+    __slots__ = ("user_id", "location", "sources", "missing_sources", "fingerprints",
+                 "timings_ms", "fetched_at")
+
+    def __init__(self, user_id: str, location: Optional[str], sources: Dict[str, Any],
+                 timings_ms: Optional[Dict[str, float]] = None, fetched_at: Optional[datetime] = None):
+        frozen = {name: freeze(result) for name, result in sources.items()}
+        set_attribute = super().__setattr__
+        set_attribute("user_id", user_id)
+        set_attribute("location", location)
+        set_attribute("sources", MappingProxyType(frozen))
+        set_attribute("missing_sources", tuple(name for name, result in frozen.items()
+                                               if not result.get("success")))
+        # Computed once here instead of by every agent that compares inputs
+        set_attribute("fingerprints", MappingProxyType(fingerprint_sources(frozen)))
+        set_attribute("timings_ms", MappingProxyType(dict(timings_ms or {})))
+        set_attribute("fetched_at", fetched_at or datetime.now(timezone.utc))
+
+    def __setattr__(self, name: str, value: Any):
+        _read_only()
+
+    def __delattr__(self, name: str):
+        _read_only()
+
+    def get(self, name: str) -> Optional[Mapping[str, Any]]:
+        """A source's tool response, or None when it was not fetched"""
+        return self.sources.get(name)
+
+    def select(self, names: Iterable[str]) -> Tuple[Dict[str, Any], List[str]]:
+        """The fetched sources among `names` and which of them are missing"""
+        selected = {name: self.sources[name] for name in names if name in self.sources}
+        return selected, [name for name in selected if name in self.missing_sources]
+
+    def stats(self) -> Dict[str, Any]:
+        """Fetch timings and missing sources, for logs and responses"""
+        return {
+            "user_id": self.user_id,
+            "sources": list(self.sources),
+            "timings_ms": dict(self.timings_ms),
+            "missing_sources": list(self.missing_sources)
+        }
+
+
+# Source name -> (declared tool, call); weather sources need a location
+SOURCE_FETCHERS: Dict[str, Tuple[str, Callable[[Any, str, Optional[str]], Awaitable[Dict[str, Any]]]]] = {
+    "crop_data": ("farm-data-tool", lambda bridge, user_id, location: bridge.get_crops(user_id)),
+    "financial_data": ("farm-data-tool", lambda bridge, user_id, location: bridge.get_financial(user_id)),
+    "weather_data": ("weather-data-tool", lambda weather, user_id, location: weather.get_current_weather(location)),
+    "weather_outlook": ("weather-data-tool",
+                        lambda weather, user_id, location: weather.get_agricultural_conditions(location)),
+    "market_overview": ("market-data-tool", lambda market, user_id, location: market.get_market_overview())
+}
+LOCATION_SOURCES = {"weather_data", "weather_outlook"}
+
+
+class FarmContextBuilder:
+    """Fetches the union of the sources a set of agents needs, each once and under its own deadline"""
+
+    def __init__(self, registry: ToolRegistry, source_timeouts: Optional[Dict[str, float]] = None):
+        self.registry = registry
+        self.source_timeouts = {**DEFAULT_SOURCE_TIMEOUTS, **(source_timeouts or {})}
+        self.telemetry = get_telemetry()
+
+    async def build(self, user_id: str, location: Optional[str], sources: Iterable[str]) -> FarmContext:
+        """Fetch `sources` concurrently; failed or timed-out ones are kept as unsuccessful responses"""
+        fetched_at = datetime.now(timezone.utc)
+        names = [name for name in dict.fromkeys(sources)
+                 if name in SOURCE_FETCHERS and (location or name not in LOCATION_SOURCES)]
+        results = await asyncio.gather(*[self._fetch(name, user_id, location) for name in names])
+        context = FarmContext(
+            user_id, location,
+            sources={name: result for name, result, _ in results},
+            timings_ms={name: elapsed_ms for name, _, elapsed_ms in results},
+            fetched_at=fetched_at
+        )
+        logger.info(f"Shared context for {user_id}: {context.stats()}")
+        return context
+
+    async def _fetch(self, name: str, user_id: str, location: Optional[str]) -> Tuple[str, Dict[str, Any], float]:
+        tool_name, call = SOURCE_FETCHERS[name]
+        timeout = self.source_timeouts.get(name)
+        start = time.perf_counter()
+        with self.telemetry.stage("fetch", source=name):
+            try:
+                result = await asyncio.wait_for(call(self.registry.get(tool_name), user_id, location), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Data source {name} timed out after {timeout}s")
+                result = {"success": False, "error": f"Timed out after {timeout}s"}
+            except Exception as e:
+                logger.error(f"Error fetching {name}: {e}")
+                result = {"success": False, "error": str(e)}
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        if self.telemetry.enabled:
+            if result.get("success"):
+                self.telemetry.observe("agent_payload_bytes", len(json.dumps(result, default=str)), source=name)
+            else:
+                self.telemetry.increment("agent_source_errors_total", source=name)
+        return name, result, elapsed_ms
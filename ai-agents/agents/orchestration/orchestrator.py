@@ -0,0 +1,154 @@
+"""
+Agent Orchestrator - runs several agents side by side over one shared farm context
+Per-agent time budgets, a request deadline, and one merged, deduplicated, ranked insight list
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import importlib
+import logging
+import time
+
+from agents.analytics.rule_engine import PRIORITY_RANK, merge_insights
+from agents.orchestration.farm_context import FarmContext, FarmContextBuilder
+from tools.adk_config import analytics_agent_config, get_adk_config
+from tools.registry import ToolRegistry
+from tools.telemetry import get_telemetry
+
+logger = logging.getLogger(__name__)
+
+# Agent name -> "module:function" building it from its config; imported on use
+AGENT_FACTORIES = {
+    "analytics-agent": "agents.analytics.farm_analytics_agent:create_analytics_agent",
+    "crop-planning-agent": "agents.crop_planning.crop_planning_agent:create_crop_planning_agent"
+}
+
+# Overridden by the `orchestration:` section of adk-config.yaml
+DEFAULT_ORCHESTRATION_SETTINGS = {
+    "agents": ["analytics-agent", "crop-planning-agent"],
+    "deadline_seconds": 30.0,   # Whole request, shared context fetch included
+    "max_insights": 8
+}
+
+
+def rank_insights(results: List[Tuple[str, List[Dict[str, Any]]]],
+                  limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Merge (agent, insights) pairs into one list tagged with the producing
+    agent: most urgent and confident first, one insight per title, ties
+    going to the agent listed first.
+    """
+    tagged = [
+        (PRIORITY_RANK.get(insight.get("priority"), 1), -insight.get("confidence", 0.0), order, position,
+         {**insight, "agent": agent})
+        for order, (agent, insights) in enumerate(results)
+        for position, insight in enumerate(insights)
+    ]
+    tagged.sort(key=lambda entry: entry[:4])
+    return merge_insights([], [entry[4] for entry in tagged], limit)
+
+
+class AgentOrchestrator:
+    """
+    Fetches the union of the agents' data sources once per request and runs
+    the agents concurrently over that snapshot. An agent past its own budget
+    or still running at the request deadline is cancelled; the others'
+    insights are returned without it.
+    """
+
+    def __init__(self, agents: Dict[str, Any], registry: ToolRegistry,
+                 budgets: Optional[Dict[str, float]] = None, deadline_seconds: float = 30.0,
+                 max_insights: int = 8, source_timeouts: Optional[Dict[str, float]] = None):
+        self.agents = agents
+        self.budgets = budgets or {}
+        self.deadline_seconds = deadline_seconds
+        self.max_insights = max_insights
+        self.context_builder = FarmContextBuilder(registry, source_timeouts)
+        self.telemetry = get_telemetry()
+        # Fetched once per request no matter how many agents read them
+        self.sources = list(dict.fromkeys(name for agent in agents.values() for name in agent.context_sources()))
+
+    @classmethod
+    def from_config(cls, adk_config: Optional[Dict[str, Any]] = None) -> "AgentOrchestrator":
+        """Build the agents named in the `orchestration:` section, sharing one tool registry for the fetch"""
+        adk_config = adk_config if adk_config is not None else get_adk_config()
+        settings = {**DEFAULT_ORCHESTRATION_SETTINGS, **adk_config.get("orchestration", {})}
+        agents = {}
+        budgets = {}
+        for name in settings["agents"]:
+            module_name, _, factory = AGENT_FACTORIES[name].partition(":")
+            config = analytics_agent_config(adk_config, name)
+            agents[name] = getattr(importlib.import_module(module_name), factory)(config)
+            if config.get("time_budget_seconds"):
+                budgets[name] = float(config["time_budget_seconds"])
+        return cls(
+            agents,
+            ToolRegistry.from_config(adk_config),
+            budgets=budgets,
+            deadline_seconds=float(settings["deadline_seconds"]),
+            max_insights=int(settings["max_insights"]),
+            source_timeouts=settings.get("source_timeouts")
+        )
+
+    async def run(self, user_id: str, location: Optional[str] = None) -> Dict[str, Any]:
+        """Run every agent for one user; returns the ranked insights plus per-agent outcomes"""
+        start = time.perf_counter()
+        # Bounded by the per-source timeouts
+        with self.telemetry.stage("shared_context"):
+            context = await self.context_builder.build(user_id, location, self.sources)
+
+        remaining = max(0.0, self.deadline_seconds - (time.perf_counter() - start))
+        tasks = {name: asyncio.ensure_future(self._run_agent(name, agent, context))
+                 for name, agent in self.agents.items()}
+        done, pending = await asyncio.wait(tasks.values(), timeout=remaining)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        results = []
+        outcomes = {}
+        for name, task in tasks.items():
+            if task in done:
+                outcome, insights, seconds = task.result()
+            else:
+                outcome, insights, seconds = "cancelled", [], round(time.perf_counter() - start, 3)
+                logger.warning(f"Agent {name} cancelled at the {self.deadline_seconds}s request deadline")
+            self.telemetry.increment("agent_orchestrator_runs_total", agent=name, outcome=outcome)
+            outcomes[name] = {"outcome": outcome, "seconds": seconds, "insights": len(insights)}
+            results.append((name, insights))
+
+        return {
+            "user_id": user_id,
+            "insights": rank_insights(results, self.max_insights),
+            "agents": outcomes,
+            "context": context.stats(),
+            "seconds": round(time.perf_counter() - start, 3)
+        }
+
+    async def _run_agent(self, name: str, agent: Any, context: FarmContext) -> Tuple[str, List[Dict[str, Any]], float]:
+        """One agent under its time budget: (outcome, insights, seconds)"""
+        start = time.perf_counter()
+        budget = self.budgets.get(name)
+        with self.telemetry.stage("agent_run", agent=name):
+            try:
+                insights = await asyncio.wait_for(agent.analyze_context(context), budget)
+                outcome = "ok"
+            except asyncio.TimeoutError:
+                logger.warning(f"Agent {name} exceeded its {budget}s budget")
+                insights, outcome = [], "timeout"
+            except Exception as e:
+                logger.error(f"Agent {name} failed: {e}")
+                insights, outcome = [], "error"
+        return outcome, insights, round(time.perf_counter() - start, 3)
+
+    def close(self):
+        """Close the agents' stores"""
+        for agent in self.agents.values():
+            if hasattr(agent, "close"):
+                agent.close()
+
+
+def create_orchestrator(adk_config: Optional[Dict[str, Any]] = None) -> AgentOrchestrator:
+    """Create the orchestrator for the agents in config/adk-config.yaml"""
+    return AgentOrchestrator.from_config(adk_config)
@@ -0,0 +1,205 @@
+"""
+Export Benchmarks for Farm Management AI Agents
+Columnar bulk export and fleet aggregate scans versus per-user fetch-and-aggregate
+
+Usage (from ai-agents/):
+    python -m benchmarks.export --users 50,200 --sizes medium --output export-bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Callable, List, Optional
+
+from benchmarks.fakes import DATA_SIZES, FIXTURE_NOW, BridgeFixture, ReplayHttpClient, _iso
+from benchmarks.records import best_seconds
+from benchmarks.run import UNLIMITED_GUARD, _csv, _git_commit
+from tools.activity_aggregator import ActivityAggregator
+from tools.bridge_client import BridgeClient
+from tools.columnar_store import ColumnarStore
+from tools.farm_export import FarmDataExporter, FleetAggregates
+from tools.rate_limiter import configure_guards
+
+
+# The activities and history routes' page size: 50 by default, at most 200
+ACTIVITY_PAGE_DEFAULT = 50
+ACTIVITY_PAGE_MAX = 200
+
+# Harvest and irrigation logs per crop
+HARVESTS_PER_CROP = 2
+IRRIGATIONS_PER_CROP = 12
+
+
+class FleetFixture:
+    """
+    One BridgeFixture per user behind the crops, activities and history
+    endpoints, honoring `since` (strictly after) and, for activities and
+    history, the routes' newest-first order and limit bounds. Each farm also
+    has harvest and irrigation logs, which the single-farm fixtures leave out.
+    """
+
+    def __init__(self, users: int, size: str):
+        self.farms = {f'user_{i}': BridgeFixture(size, seed=i) for i in range(users)}
+        self.history = {user_id: {'harvest': [], 'irrigation': []} for user_id in self.farms}
+        for user_id, farm in self.farms.items():
+            history = self.history[user_id]
+            for crop in farm.crops:
+                reference = {'id': crop['id'], 'name': crop['name']}
+                # Logged no later than the fixture clock, even for harvests expected after it
+                logged = min(crop['expectedHarvestDate'], _iso(FIXTURE_NOW))
+                history['harvest'].extend(
+                    {'id': f"{crop['id']}_h{k}", 'createdAt': logged, 'crop': reference,
+                     'harvestDate': crop['expectedHarvestDate'], 'quantity': 40.0 + k}
+                    for k in range(HARVESTS_PER_CROP)
+                )
+                planted = datetime.fromisoformat(crop['plantingDate'].replace('Z', '+00:00'))
+                history['irrigation'].extend(
+                    {'id': f"{crop['id']}_i{k}", 'createdAt': _iso(planted + timedelta(days=k)), 'crop': reference,
+                     'date': _iso(planted + timedelta(days=k)), 'waterAmount': 12.5}
+                    for k in range(IRRIGATIONS_PER_CROP)
+                )
+
+    def add_activity(self, user_id: str, days: int):
+        """A new activity `days` after the fixture clock, as the next export would see it"""
+        farm = self.farms[user_id]
+        crop = farm.crops[0]
+        farm.activities.insert(0, {'type': 'FERTILIZER', 'cost': 50.0,
+                                   'createdAt': _iso(FIXTURE_NOW + timedelta(days=days)),
+                                   'crop': {'id': crop['id'], 'name': crop['name']}})
+
+    @staticmethod
+    def _newest_first(items: List[Dict[str, Any]], since: Optional[str]) -> List[Dict[str, Any]]:
+        return sorted((item for item in items if not since or item['createdAt'] > since),
+                      key=lambda item: item['createdAt'], reverse=True)
+
+    def _handler(self, kind: str) -> Callable[[Dict[str, Any]], Any]:
+        def handle(params: Dict[str, Any]) -> Dict[str, Any]:
+            farm = self.farms[params['userId']]
+            since = params.get('since')
+            if kind == 'crops':
+                view = BridgeFixture.__new__(BridgeFixture)
+                view.crops = [c for c in farm.crops if not since or c['updatedAt'] > since]
+                view.activities = []
+                return view.crops_response(params)
+            params = {**params, 'limit': min(ACTIVITY_PAGE_MAX, max(1, int(params.get('limit') or ACTIVITY_PAGE_DEFAULT)))}
+            if kind == 'history':
+                logs = self._newest_first(self.history[params['userId']][params['type']], since)
+                page, pagination = BridgeFixture._cursor_page(logs, params)
+                return {'success': True, 'data': {'logs': page}, 'pagination': pagination,
+                        'timestamp': _iso(FIXTURE_NOW), 'source': 'ai-bridge-history'}
+            view = BridgeFixture.__new__(BridgeFixture)
+            view.crops = []
+            view.activities = self._newest_first(farm.activities, since)
+            return view.activities_response(params)
+        return handle
+
+    def routes(self) -> Dict[str, Callable[[Dict[str, Any]], Any]]:
+        return {
+            '/api/ai-bridge/crops': self._handler('crops'),
+            '/api/ai-bridge/activities': self._handler('activities'),
+            '/api/ai-bridge/history': self._handler('history')
+        }
+
+
+async def per_user_cost_per_crop(bridge: BridgeClient, user_ids: List[str]) -> Dict[str, Dict[str, float]]:
+    """The baseline: stream each user's activities into an ActivityAggregator and merge the rollups"""
+    merged: Dict[str, Dict[str, float]] = {}
+    for user_id in user_ids:
+        aggregator = ActivityAggregator(now=FIXTURE_NOW)
+        async for activity in bridge.iter_activities(user_id):
+            aggregator.add(activity)
+        for name, bucket in aggregator.by_crop.items():
+            total = merged.setdefault(name, {'cost': 0.0, 'count': 0})
+            total['cost'] += bucket['cost']
+            total['count'] += bucket['count']
+    return merged
+
+
+def _directory_bytes(root: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, name)) for path, _, names in os.walk(root) for name in names)
+
+
+async def bench_fleet(users: int, size: str, repeat: int) -> Dict[str, Any]:
+    configure_guards([{'name': 'farm-data-tool', 'config': UNLIMITED_GUARD}])
+    fleet = FleetFixture(users, size)
+    http = ReplayHttpClient(fleet.routes())
+    bridge = BridgeClient('http://bridge.benchmark', http_client=http, page_size=ACTIVITY_PAGE_MAX)
+    user_ids = list(fleet.farms)
+    root = tempfile.mkdtemp(prefix='farm-export-')
+    try:
+        full = await FarmDataExporter(bridge, ColumnarStore(root)).export(user_ids)
+        calls_full = sum(http.calls.values())
+
+        # One new activity for every tenth user
+        for user_id in user_ids[::10]:
+            fleet.add_activity(user_id, days=1)
+        http.calls.clear()
+        incremental = await FarmDataExporter(bridge, ColumnarStore(root)).export(user_ids)
+        calls_incremental = sum(http.calls.values())
+
+        start = time.perf_counter()
+        await per_user_cost_per_crop(bridge, user_ids)
+        per_user_seconds = time.perf_counter() - start
+
+        aggregates = FleetAggregates(ColumnarStore(root))
+        scan_seconds = best_seconds(aggregates.cost_per_crop, repeat)
+        return {
+            'users': users,
+            'size': size,
+            'rows': full['store']['tables'],
+            'store_bytes': _directory_bytes(root),
+            'export_seconds': {'full': full['seconds'], 'incremental': incremental['seconds']},
+            'upstream_calls': {'full': calls_full, 'incremental': calls_incremental},
+            'incremental_rows': incremental['rows'],
+            'cost_per_crop_seconds': {
+                'per_user_fetch': round(per_user_seconds, 4),
+                'columnar_scan': round(scan_seconds, 4)
+            },
+            'scan_seconds': {
+                'monthly_spend': round(best_seconds(aggregates.monthly_spend, repeat), 4),
+                'yield_per_area': round(best_seconds(aggregates.yield_per_area, repeat), 4),
+                'farm_facts': round(best_seconds(lambda: aggregates.farm_facts(FIXTURE_NOW), repeat), 4)
+            }
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=lambda v: [int(c) for c in _csv(v)], default=[50, 200])
+    parser.add_argument('--sizes', type=_csv, default=['medium'])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='export-benchmark-results.json')
+    args = parser.parse_args(argv)
+
+    unknown = set(args.sizes) - set(DATA_SIZES)
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(sorted(unknown))}")
+
+    results = []
+    for size in args.sizes:
+        for users in args.users:
+            result = asyncio.run(bench_fleet(users, size, args.repeat))
+            results.append(result)
+            print(json.dumps(result))
+    report = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Benchmark Fakes for Farm Management AI Agents
+Replayed upstream responses and a deterministic LLM, each with injectable latency
+"""
+
+import asyncio
+import json
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, AsyncIterator, Callable, List, Optional
+from urllib.parse import urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Bridge data sizes: crops per farm and activities per farm
+DATA_SIZES = {
+    'small': {'crops': 5, 'activities': 100},
+    'medium': {'crops': 25, 'activities': 2000},
+    'large': {'crops': 100, 'activities': 20000}
+}
+
+CROP_NAMES = ['Maize', 'Wheat', 'Beans', 'Tomato', 'Potato', 'Sorghum', 'Rice', 'Cotton']
+CROP_STATUSES = ['PLANNED', 'PLANTED', 'GROWING', 'GROWING', 'HARVESTED']
+ACTIVITY_TYPES = ['FERTILIZER', 'IRRIGATION', 'HARVEST']
+
+# Fixed clock so generated payloads are identical across runs
+FIXTURE_NOW = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def load_fixture(name: str) -> Any:
+    """Load a recorded response from benchmarks/fixtures"""
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _iso(moment: datetime) -> str:
+    return moment.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def make_crops(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Crop records in the /api/ai-bridge/crops shape"""
+    rng = random.Random(seed)
+    crops = []
+    for i in range(count):
+        planted = FIXTURE_NOW - timedelta(days=rng.randint(10, 200))
+        crops.append({
+            'id': f'crop_{seed}_{i}',
+            'name': CROP_NAMES[i % len(CROP_NAMES)],
+            'variety': f'Variety {rng.randint(1, 9)}',
+            'plantingDate': _iso(planted),
+            'expectedHarvestDate': _iso(planted + timedelta(days=120)),
+            'actualHarvestDate': None,
+            'status': rng.choice(CROP_STATUSES),
+            'area': round(rng.uniform(0.5, 20.0), 2),
+            'updatedAt': _iso(planted + timedelta(days=rng.randint(0, 10)))
+        })
+    return crops
+
+
+def make_activities(count: int, crops: List[Dict[str, Any]], seed: int = 0) -> List[Dict[str, Any]]:
+    """Activity records in the /api/ai-bridge/activities shape, newest first"""
+    rng = random.Random(seed + 1)
+    activities = []
+    for i in range(count):
+        crop = crops[i % len(crops)] if crops else {'id': 'none', 'name': 'Unknown'}
+        kind = ACTIVITY_TYPES[i % len(ACTIVITY_TYPES)]
+        activities.append({
+            'type': kind,
+            'cost': 0 if kind == 'HARVEST' else round(rng.uniform(5, 500), 2),
+            'createdAt': _iso(FIXTURE_NOW - timedelta(minutes=rng.randint(0, 365 * 24 * 60))),
+            'crop': {'id': crop['id'], 'name': crop['name']}
+        })
+    activities.sort(key=lambda a: a['createdAt'], reverse=True)
+    return activities
+
+
+class BridgeFixture:
+    """Paged bridge responses for one farm of a given size"""
+
+    def __init__(self, size: str = 'small', seed: int = 0):
+        spec = DATA_SIZES[size]
+        self.crops = make_crops(spec['crops'], seed)
+        self.activities = make_activities(spec['activities'], self.crops, seed)
+
+    @staticmethod
+    def _page(items: List[Dict[str, Any]], params: Dict[str, Any]) -> tuple:
+        offset = int(params.get('offset', 0))
+        limit = int(params.get('limit', 50))
+        page = items[offset:offset + limit]
+        return page, {'offset': offset, 'limit': limit, 'total': len(items)}
+
+    @classmethod
+    def _cursor_page(cls, items: List[Dict[str, Any]], params: Dict[str, Any]) -> tuple:
+        # The fixture's cursor is the position to resume at; the list doesn't change mid-listing
+        page, pagination = cls._page(items, {**params, 'offset': params.get('cursor') or 0})
+        end = pagination.pop('offset') + len(page)
+        pagination['nextCursor'] = str(end) if end < len(items) else None
+        return page, pagination
+
+    def crops_response(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        page, pagination = self._page(self.crops, params)
+        statuses: Dict[str, int] = {}
+        for crop in self.crops:
+            statuses[crop['status']] = statuses.get(crop['status'], 0) + 1
+        return {
+            'success': True,
+            'data': {
+                'crops': page,
+                'summary': {
+                    'totalCrops': len(self.crops),
+                    'cropTypes': sorted({c['name'] for c in self.crops}),
+                    'statusDistribution': statuses,
+                    'totalArea': round(sum(c['area'] for c in self.crops), 2)
+                }
+            },
+            'pagination': pagination,
+            'timestamp': _iso(FIXTURE_NOW),
+            'source': 'ai-bridge-crops'
+        }
+
+    def financial_response(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        cutoff = _iso(FIXTURE_NOW - timedelta(days=int(params.get('timeRange', 30))))
+        recent = [a for a in self.activities if a['createdAt'] > cutoff]
+        total_cost = sum(a['cost'] for a in recent)
+        return {
+            'success': True,
+            'data': {
+                'summary': {
+                    'totalCost': round(total_cost, 2),
+                    'averageCost': round(total_cost / len(recent), 2) if recent else 0
+                },
+                'timeRange': f"{params.get('timeRange', 30)} days",
+                'totalActivities': len(recent),
+                'recentActivities': recent[:20],
+                'oldestActivityAt': min((a['createdAt'] for a in recent), default=None)
+            },
+            'timestamp': _iso(FIXTURE_NOW),
+            'source': 'ai-bridge-financial'
+        }
+
+    def activities_response(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        page, pagination = self._cursor_page(self.activities, params)
+        return {
+            'success': True,
+            'data': {'activities': page},
+            'pagination': pagination,
+            'timestamp': _iso(FIXTURE_NOW),
+            'source': 'ai-bridge-activities'
+        }
+
+
+class ReplayHttpClient:
+    """
+    Drop-in for AsyncHttpClient that answers get_json from fixtures by URL path,
+    after sleeping `latency` seconds (plus up to `jitter` more, seeded).
+    """
+
+    def __init__(self, routes: Dict[str, Callable[[Dict[str, Any]], Any]],
+                 latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        self.routes = routes
+        self.latency = latency
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        self.calls: Dict[str, int] = {}
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None,
+                       headers: Optional[Dict[str, str]] = None,
+                       timeout: Optional[float] = None,
+                       loads: Optional[Callable[[str], Any]] = None) -> Any:
+        path = urlparse(url).path
+        handler = self.routes.get(path)
+        if handler is None:
+            raise KeyError(f"No fixture route for {path}")
+        self.calls[path] = self.calls.get(path, 0) + 1
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        body = handler(params or {})
+        # A custom decoder sees the body as it would come off the wire
+        return loads(json.dumps(body)) if loads else body
+
+    async def close(self):
+        pass
+
+
+def openweather_routes(base_path: str = '/data/2.5') -> Dict[str, Callable[[Dict[str, Any]], Any]]:
+    """Routes replaying the recorded OpenWeather current and forecast responses"""
+    current = load_fixture('openweather_current.json')
+    forecast = load_fixture('openweather_forecast.json')
+
+    def forecast_handler(params: Dict[str, Any]) -> Dict[str, Any]:
+        count = int(params.get('cnt', len(forecast['list'])))
+        return {**forecast, 'cnt': count, 'list': forecast['list'][:count]}
+
+    return {
+        f'{base_path}/weather': lambda params: current,
+        f'{base_path}/forecast': forecast_handler
+    }
+
+
+def bridge_routes(fixture: BridgeFixture) -> Dict[str, Callable[[Dict[str, Any]], Any]]:
+    """Routes serving a BridgeFixture at the default bridge endpoints"""
+    return {
+        '/api/ai-bridge/crops': fixture.crops_response,
+        '/api/ai-bridge/financial': fixture.financial_response,
+        '/api/ai-bridge/activities': fixture.activities_response
+    }
+
+
+class FakeLLM:
+    """Deterministic stand-in for the model: fixed insights after a fixed delay"""
+
+    def __init__(self, latency: float = 0.0, insight_count: int = 4,
+                 tokens_per_second: Optional[float] = None):
+        self.latency = latency
+        self.insight_count = insight_count
+        # When set, streaming spreads the output over time like a real model
+        self.tokens_per_second = tokens_per_second
+        self.calls = 0
+
+    def response_text(self, prompt: str) -> str:
+        insights = [
+            {
+                'title': f'Insight {i + 1}',
+                'description': f'Deterministic benchmark insight {i + 1} for a {len(prompt)}-char prompt.',
+                'confidence': round(0.9 - i * 0.05, 2),
+                'actionable': True,
+                'priority': ['High', 'Medium', 'Low'][i % 3]
+            }
+            for i in range(self.insight_count)
+        ]
+        return json.dumps(insights)
+
+    async def generate_response(self, prompt: str) -> str:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.response_text(prompt)
+
+    async def generate_response_stream(self, prompt: str) -> AsyncIterator[str]:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        text = self.response_text(prompt)
+        chunk_size = 16
+        delay = chunk_size / 4 / self.tokens_per_second if self.tokens_per_second else 0
+        for start in range(0, len(text), chunk_size):
+            if delay:
+                await asyncio.sleep(delay)
+            yield text[start:start + chunk_size]
+
+    def bind(self, agent: Any):
+        """Route an agent's model calls to this fake"""
+        agent.generate_response = self.generate_response
+        agent.generate_response_stream = self.generate_response_stream
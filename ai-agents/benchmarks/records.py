@@ -0,0 +1,112 @@
+"""
+Record Benchmarks for Farm Management AI Agents
+Memory per record and decode throughput of the tools.records activity log versus plain JSON dicts
+
+Usage (from ai-agents/):
+    python -m benchmarks.records --sizes small,medium,large --output records-bench.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, Any, Callable, List, Optional
+
+from benchmarks.fakes import BridgeFixture, DATA_SIZES
+from benchmarks.run import _csv, _git_commit
+from tools.records import decode_activities
+
+
+def retained_bytes(build: Callable[[], Any]) -> int:
+    """Bytes still allocated by build()'s result once temporaries are freed"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return retained
+
+
+def best_seconds(call: Callable[[], Any], repeat: int) -> float:
+    """Fastest of `repeat` timed calls"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compare(kind: str, count: int, as_dicts: Callable[[], Any], as_records: Callable[[], Any],
+            repeat: int) -> Dict[str, Any]:
+    """Memory and decode rate of the same payload as dicts and as records"""
+    dict_bytes = retained_bytes(as_dicts)
+    record_bytes = retained_bytes(as_records)
+    dict_seconds = best_seconds(as_dicts, repeat)
+    record_seconds = best_seconds(as_records, repeat)
+    return {
+        'record': kind,
+        'count': count,
+        'bytes_per_record': {
+            'dict': round(dict_bytes / count, 1) if count else 0,
+            'record': round(record_bytes / count, 1) if count else 0
+        },
+        'memory_ratio': round(record_bytes / dict_bytes, 3) if dict_bytes else None,
+        'decode_records_per_second': {
+            'dict': round(count / dict_seconds) if dict_seconds else None,
+            'record': round(count / record_seconds) if record_seconds else None
+        }
+    }
+
+
+def bench_size(size: str, repeat: int) -> List[Dict[str, Any]]:
+    fixture = BridgeFixture(size)
+    activities_raw = json.dumps(fixture.activities_response({'limit': len(fixture.activities)}))
+    results = [
+        compare('activity', len(fixture.activities),
+                lambda: json.loads(activities_raw)['data']['activities'],
+                lambda: decode_activities(activities_raw)[0], repeat)
+    ]
+    for result in results:
+        result['size'] = size
+    return results
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=_csv, default=['small', 'medium', 'large'])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default='records-benchmark-results.json')
+    args = parser.parse_args(argv)
+
+    unknown = set(args.sizes) - set(DATA_SIZES)
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(sorted(unknown))}")
+
+    results = []
+    for size in args.sizes:
+        for result in bench_size(size, args.repeat):
+            results.append(result)
+            print(json.dumps(result))
+    report = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
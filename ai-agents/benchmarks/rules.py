@@ -0,0 +1,101 @@
+"""
+Rule Engine Benchmarks for Farm Management AI Agents
+Per-farm versus column-wise evaluation of the insight rules over many synthetic farms
+
+Usage (from ai-agents/):
+    python -m benchmarks.rules --farms 1000,10000 --output rules-bench.json
+"""
+
+import argparse
+import json
+import platform
+import random
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+from agents.analytics.rule_engine import FARM_RULES, RuleEngine, farm_facts
+from benchmarks.fakes import FIXTURE_NOW, _iso, make_activities, make_crops
+from benchmarks.records import best_seconds
+from benchmarks.run import _csv, _git_commit
+
+
+def synthetic_facts(count: int, seed: int = 0) -> List[Dict[str, float]]:
+    """Facts for `count` farms built from generated bridge records and random weather"""
+    rng = random.Random(seed)
+    rows = []
+    for farm in range(count):
+        crops = make_crops(rng.randint(1, 8), seed=farm)
+        activities = make_activities(rng.randint(0, 20), crops, seed=farm)
+        total_cost = round(sum(a['cost'] for a in activities), 2)
+        crop_data = {'success': True, 'data': {'crops': crops}, 'timestamp': _iso(FIXTURE_NOW)}
+        financial_data = {
+            'success': True,
+            'data': {
+                'summary': {'totalCost': total_cost,
+                            'averageCost': round(total_cost / len(activities), 2) if activities else 0},
+                'totalActivities': len(activities),
+                'recentActivities': activities
+            },
+            'timestamp': _iso(FIXTURE_NOW)
+        }
+        weather_data = {'success': True, 'data': {
+            'temperature': rng.uniform(-5, 35), 'humidity': rng.uniform(20, 100),
+            'wind_speed': rng.uniform(0, 25), 'precipitation': rng.choice([0, 0, 0, 2.5])
+        }}
+        outlook = {'success': True, 'data': {'weekly_outlook': {
+            'frost_risk': rng.random() < 0.1, 'total_precipitation_mm': rng.uniform(0, 80),
+            'dry_days': rng.randint(0, 7), 'high_wind_days': rng.randint(0, 3)
+        }}}
+        rows.append(farm_facts(crop_data, financial_data, weather_data, outlook))
+    return rows
+
+
+def bench_farms(count: int, repeat: int) -> Dict[str, Any]:
+    engine = RuleEngine(FARM_RULES)
+    rows = synthetic_facts(count)
+    per_farm = best_seconds(lambda: [engine.evaluate(row) for row in rows], repeat)
+    bulk = best_seconds(lambda: engine.evaluate_many(rows), repeat)
+    outcomes = engine.evaluate_many(rows)
+    return {
+        'farms': count,
+        'rules': len(engine.rules),
+        'microseconds_per_farm': {
+            'evaluate': round(per_farm / count * 1e6, 2),
+            'evaluate_many': round(bulk / count * 1e6, 2)
+        },
+        'farms_per_second': {
+            'evaluate': round(count / per_farm) if per_farm else None,
+            'evaluate_many': round(count / bulk) if bulk else None
+        },
+        'insights_per_farm': round(sum(len(o['insights']) for o in outcomes) / count, 2),
+        # Share of farms that would be answered without a model call
+        'llm_skip_rate': round(sum(o['sufficient'] for o in outcomes) / count, 3)
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--farms', type=lambda v: [int(c) for c in _csv(v)], default=[1000, 10000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='rules-benchmark-results.json')
+    args = parser.parse_args(argv)
+
+    results = []
+    for count in args.farms:
+        result = bench_farms(count, args.repeat)
+        results.append(result)
+        print(json.dumps(result))
+    report = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""
+Benchmark Runner for Farm Management AI Agents
+Throughput and latency percentiles for tools and agents against replayed fixtures
+
+Usage (from ai-agents/):
+    python -m benchmarks.run --concurrency 1,8,32 --sizes small,large --output bench.json
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Awaitable, Callable, List, Optional
+
+from benchmarks.fakes import BridgeFixture, FakeLLM, ReplayHttpClient, bridge_routes, openweather_routes
+from tools.rate_limiter import configure_guards
+from tools.weather_cache import WeatherCache
+
+AGENTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Guards are process-wide; lift their limits so they don't throttle the benchmark
+UNLIMITED_GUARD = {
+    'rate_limit': {'requests_per_second': 1e9, 'burst': 10 ** 9},
+    'circuit_breaker': {'failure_threshold': 10 ** 9}
+}
+
+# Distinct farm locations; requests cycle through them so the weather cache sees repeats
+LOCATIONS = [f"Farm Town {i}, KE" for i in range(50)]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def measure(call: Callable[[int], Awaitable[Any]], requests: int, concurrency: int) -> Dict[str, Any]:
+    """Run `requests` calls with at most `concurrency` in flight and summarize latencies"""
+    latencies: List[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call(i)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(requests)])
+    wall = time.perf_counter() - wall_start
+
+    latencies.sort()
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'errors': errors,
+        'wall_seconds': round(wall, 4),
+        'throughput_rps': round(requests / wall, 2) if wall else None,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50) * 1000, 3),
+            'p90': round(percentile(latencies, 90) * 1000, 3),
+            'p99': round(percentile(latencies, 99) * 1000, 3),
+            'max': round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            'mean': round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0
+        }
+    }
+
+
+def make_replay_client(size: str, upstream_latency: float, jitter: float) -> ReplayHttpClient:
+    routes = {**openweather_routes(), **bridge_routes(BridgeFixture(size))}
+    return ReplayHttpClient(routes, latency=upstream_latency, jitter=jitter)
+
+
+async def bench_weather_conditions(size: str, concurrency: int, requests: int,
+                                   upstream_latency: float, llm_latency: float,
+                                   jitter: float) -> Dict[str, Any]:
+    """WeatherTool.get_agricultural_conditions with a cold cache per run"""
+    from tools.weather_tool import WeatherTool
+
+    http = make_replay_client(size, upstream_latency, jitter)
+    tool = WeatherTool(api_key='benchmark', http_client=http, cache=WeatherCache())
+    result = await measure(lambda i: tool.get_agricultural_conditions(LOCATIONS[i % len(LOCATIONS)]),
+                           requests, concurrency)
+    result['upstream_calls'] = sum(http.calls.values())
+    result['cache'] = tool.cache.stats()
+    return result
+
+
+def _build_analytics_agent(http: ReplayHttpClient, llm: FakeLLM, rules: bool = False):
+    from agents.analytics.farm_analytics_agent import FarmAnalyticsAgent
+
+    agent = FarmAnalyticsAgent({
+        'farm_api': {'base_url': 'http://bridge.benchmark'},
+        # Measure the full pipeline on every request
+        'insight_cache': {'enabled': False},
+        'analysis_state': {'enabled': False},
+        'rules': {'enabled': rules}
+    })
+    agent.farm_data_tool.bridge.http = http
+    agent.weather_tool.client.http = http
+    agent.weather_tool.client.cache = WeatherCache()
+    llm.bind(agent)
+    return agent
+
+
+async def bench_analytics_agent(size: str, concurrency: int, requests: int,
+                                upstream_latency: float, llm_latency: float,
+                                jitter: float) -> Dict[str, Any]:
+    """FarmAnalyticsAgent.analyze_farm_performance with the fake LLM"""
+    http = make_replay_client(size, upstream_latency, jitter)
+    llm = FakeLLM(latency=llm_latency)
+    agent = _build_analytics_agent(http, llm)
+    result = await measure(lambda i: agent.analyze_farm_performance(f'user_{i}', LOCATIONS[i % len(LOCATIONS)]),
+                           requests, concurrency)
+    result['upstream_calls'] = sum(http.calls.values())
+    result['llm_calls'] = llm.calls
+    return result
+
+
+async def bench_analytics_agent_rules(size: str, concurrency: int, requests: int,
+                                      upstream_latency: float, llm_latency: float,
+                                      jitter: float) -> Dict[str, Any]:
+    """analyze_farm_performance with the rule engine answering ahead of the fake LLM"""
+    http = make_replay_client(size, upstream_latency, jitter)
+    llm = FakeLLM(latency=llm_latency)
+    agent = _build_analytics_agent(http, llm, rules=True)
+    result = await measure(lambda i: agent.analyze_farm_performance(f'user_{i}', LOCATIONS[i % len(LOCATIONS)]),
+                           requests, concurrency)
+    result['upstream_calls'] = sum(http.calls.values())
+    result['llm_calls'] = llm.calls
+    result['llm_calls_avoided'] = requests - llm.calls
+    return result
+
+
+# Tool entries for the multi-agent scenarios; agents configure guards from
+# them, so they carry the unlimited guard too. The market store is in memory.
+AGENT_TOOLS = [
+    {'name': 'farm-data-tool', 'config': {'base_url': 'http://bridge.benchmark', **UNLIMITED_GUARD}},
+    {'name': 'weather-data-tool', 'config': UNLIMITED_GUARD},
+    {'name': 'market-data-tool', 'config': {'store': {'seed_fixtures': True}}}
+]
+
+
+def _wire_registry(registry, http: ReplayHttpClient):
+    """Point a tool registry's bridge and weather clients at the replay client"""
+    registry.get('farm-data-tool').http = http
+    weather = registry.get('weather-data-tool')
+    weather.http = http
+    weather.cache = WeatherCache()
+
+
+def _build_agent_pair(http: ReplayHttpClient, llm: FakeLLM) -> Dict[str, Any]:
+    from agents.analytics.farm_analytics_agent import FarmAnalyticsAgent
+    from agents.crop_planning.crop_planning_agent import CropPlanningAgent
+
+    agents = {
+        'analytics-agent': FarmAnalyticsAgent({
+            'tools': AGENT_TOOLS,
+            'insight_cache': {'enabled': False},
+            'analysis_state': {'enabled': False}
+        }),
+        'crop-planning-agent': CropPlanningAgent({'tools': AGENT_TOOLS})
+    }
+    for agent in agents.values():
+        _wire_registry(agent.tool_registry, http)
+        llm.bind(agent)
+    return agents
+
+
+async def bench_agents_independent(size: str, concurrency: int, requests: int,
+                                   upstream_latency: float, llm_latency: float,
+                                   jitter: float) -> Dict[str, Any]:
+    """Analytics and crop planning run side by side, each fetching its own data"""
+    http = make_replay_client(size, upstream_latency, jitter)
+    llm = FakeLLM(latency=llm_latency)
+    agents = _build_agent_pair(http, llm)
+
+    async def both(i: int):
+        user_id, location = f'user_{i}', LOCATIONS[i % len(LOCATIONS)]
+        await asyncio.gather(agents['analytics-agent'].analyze_farm_performance(user_id, location),
+                             agents['crop-planning-agent'].plan_crops(user_id, location))
+
+    result = await measure(both, requests, concurrency)
+    result['upstream_calls'] = sum(http.calls.values())
+    result['llm_calls'] = llm.calls
+    return result
+
+
+async def bench_agents_orchestrated(size: str, concurrency: int, requests: int,
+                                    upstream_latency: float, llm_latency: float,
+                                    jitter: float) -> Dict[str, Any]:
+    """The same two agents under AgentOrchestrator over one shared context per user"""
+    from agents.orchestration.orchestrator import AgentOrchestrator
+    from tools.registry import ToolRegistry
+
+    http = make_replay_client(size, upstream_latency, jitter)
+    llm = FakeLLM(latency=llm_latency)
+    registry = ToolRegistry(AGENT_TOOLS)
+    _wire_registry(registry, http)
+    orchestrator = AgentOrchestrator(_build_agent_pair(http, llm), registry)
+    result = await measure(lambda i: orchestrator.run(f'user_{i}', LOCATIONS[i % len(LOCATIONS)]),
+                           requests, concurrency)
+    result['upstream_calls'] = sum(http.calls.values())
+    result['llm_calls'] = llm.calls
+    return result
+
+
+def _load_simple_agent_module():
+    spec = importlib.util.spec_from_file_location(
+        'simple_analytics_agent', os.path.join(AGENTS_DIR, 'simple-analytics-agent.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def bench_simple_agent(size: str, concurrency: int, requests: int,
+                             upstream_latency: float, llm_latency: float,
+                             jitter: float) -> Dict[str, Any]:
+    """SimpleAnalyticsAgent.process_request (no model call)"""
+    module = _load_simple_agent_module()
+    http = make_replay_client(size, upstream_latency, jitter)
+    agent = module.SimpleAnalyticsAgent()
+    agent.farm_data_tool.bridge.http = http
+    result = await measure(lambda i: agent.process_request('How is my farm doing?', f'user_{i}'),
+                           requests, concurrency)
+    result['upstream_calls'] = sum(http.calls.values())
+    return result
+
+
+SCENARIOS = {
+    'weather_conditions': bench_weather_conditions,
+    'analytics_agent': bench_analytics_agent,
+    'analytics_agent_rules': bench_analytics_agent_rules,
+    'simple_agent': bench_simple_agent,
+    'agents_independent': bench_agents_independent,
+    'agents_orchestrated': bench_agents_orchestrated
+}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=AGENTS_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmarks(scenarios: List[str], sizes: List[str], concurrency_levels: List[int],
+                         requests: int, upstream_latency: float, llm_latency: float,
+                         jitter: float) -> Dict[str, Any]:
+    """Run every scenario x size x concurrency combination"""
+    configure_guards([{'name': name, 'config': UNLIMITED_GUARD}
+                      for name in ('farm-data-tool', 'weather-data-tool')])
+    results = []
+    for scenario in scenarios:
+        for size in sizes:
+            for concurrency in concurrency_levels:
+                entry = {'scenario': scenario, 'size': size}
+                try:
+                    entry.update(await SCENARIOS[scenario](size, concurrency, requests,
+                                                           upstream_latency, llm_latency, jitter))
+                except ImportError as e:
+                    # e.g. google.ai.adk is not installed for the agent scenarios
+                    entry.update({'concurrency': concurrency, 'skipped': str(e)})
+                results.append(entry)
+                print(json.dumps(entry), file=sys.stderr)
+    return {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {
+            'requests': requests,
+            'upstream_latency_ms': upstream_latency * 1000,
+            'upstream_jitter_ms': jitter * 1000,
+            'llm_latency_ms': llm_latency * 1000
+        },
+        'results': results
+    }
+
+
+def _csv(value: str) -> List[str]:
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', type=_csv, default=list(SCENARIOS))
+    parser.add_argument('--sizes', type=_csv, default=['small', 'medium'])
+    parser.add_argument('--concurrency', type=lambda v: [int(c) for c in _csv(v)], default=[1, 8, 32])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--upstream-latency-ms', type=float, default=20.0)
+    parser.add_argument('--upstream-jitter-ms', type=float, default=5.0)
+    parser.add_argument('--llm-latency-ms', type=float, default=200.0)
+    parser.add_argument('--output', default='benchmark-results.json')
+    args = parser.parse_args(argv)
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    report = asyncio.run(run_benchmarks(
+        args.scenarios, args.sizes, args.concurrency, args.requests,
+        args.upstream_latency_ms / 1000, args.llm_latency_ms / 1000, args.upstream_jitter_ms / 1000
+    ))
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
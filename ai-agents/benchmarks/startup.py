@@ -0,0 +1,159 @@
+"""
+Startup Benchmarks for Farm Management AI Agents
+Import time, construction time and first/second request latency in fresh interpreters
+
+Usage (from ai-agents/):
+    python -m benchmarks.startup --runs 5 --output startup-bench.json
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+# Nothing from the agents or tools is imported at module level, so the child
+# process measures a genuinely cold import
+AGENTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = ('analytics_agent', 'simple_agent')
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+async def _requests(agent_call, timings: Dict[str, Any]):
+    start = time.perf_counter()
+    await agent_call('user_0')
+    timings['first_request_ms'] = _elapsed_ms(start)
+    start = time.perf_counter()
+    await agent_call('user_1')
+    timings['second_request_ms'] = _elapsed_ms(start)
+
+
+def child(scenario: str) -> Dict[str, Any]:
+    """Measure one cold start in this (fresh) process"""
+    timings: Dict[str, Any] = {'scenario': scenario}
+    start = time.perf_counter()
+    if scenario == 'analytics_agent':
+        from agents.analytics.farm_analytics_agent import create_analytics_agent
+    else:
+        spec = importlib.util.spec_from_file_location(
+            'simple_analytics_agent', os.path.join(AGENTS_DIR, 'simple-analytics-agent.py'))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    timings['import_ms'] = _elapsed_ms(start)
+    # Everything the import pulled in, to spot heavy dependencies creeping back
+    timings['modules_loaded'] = len(sys.modules)
+    timings['aiohttp_loaded_at_import'] = 'aiohttp' in sys.modules
+
+    # Fakes are imported after the agent so they don't count toward its import time
+    from benchmarks.fakes import BridgeFixture, FakeLLM, ReplayHttpClient, bridge_routes, openweather_routes
+    from tools.registry import ToolRegistry
+    from tools.weather_cache import WeatherCache
+
+    http = ReplayHttpClient({**openweather_routes(), **bridge_routes(BridgeFixture('small'))})
+    start = time.perf_counter()
+    if scenario == 'analytics_agent':
+        agent = create_analytics_agent({
+            'farm_api': {'base_url': 'http://bridge.benchmark'},
+            'insight_cache': {'enabled': False},
+            'analysis_state': {'enabled': False}
+        })
+    else:
+        agent = module.SimpleAnalyticsAgent(ToolRegistry([
+            {'name': 'farm-data-tool', 'config': {'base_url': 'http://bridge.benchmark'}}
+        ]))
+    timings['construct_ms'] = _elapsed_ms(start)
+
+    # Swap in the replayed transport once the first request has built the tools
+    registry = agent.tool_registry if scenario == 'analytics_agent' else agent.farm_data_tool.registry
+    original_get = registry.get
+
+    def get_with_replay(name):
+        tool = original_get(name)
+        tool.http = http
+        if hasattr(tool, 'cache'):
+            tool.cache = WeatherCache()
+        return tool
+
+    registry.get = get_with_replay
+    if scenario == 'analytics_agent':
+        FakeLLM().bind(agent)
+        asyncio.run(_requests(lambda user_id: agent.analyze_farm_performance(user_id, 'Nairobi, KE'), timings))
+    else:
+        asyncio.run(_requests(lambda user_id: agent.process_request('How is my farm doing?', user_id), timings))
+    timings['tool_load_ms'] = {name: round(stats['load_seconds'] * 1000, 3)
+                               for name, stats in registry.stats().items() if stats['loaded']}
+    return timings
+
+
+def run_fresh(scenario: str) -> Dict[str, Any]:
+    """Run child() in a new interpreter so module caches start cold"""
+    completed = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.startup', '--child', scenario],
+        cwd=AGENTS_DIR, capture_output=True, text=True, env=os.environ.copy()
+    )
+    if completed.returncode != 0:
+        last_line = (completed.stderr.strip().splitlines() or ['unknown error'])[-1]
+        return {'scenario': scenario, 'skipped': last_line}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Median of each timing across runs"""
+    measured = [run for run in runs if 'skipped' not in run]
+    if not measured:
+        return runs[0]
+    summary = {'scenario': measured[0]['scenario'], 'runs': len(measured)}
+    for key in ('import_ms', 'construct_ms', 'first_request_ms', 'second_request_ms', 'modules_loaded'):
+        summary[key] = statistics.median(run[key] for run in measured)
+    summary['aiohttp_loaded_at_import'] = measured[0]['aiohttp_loaded_at_import']
+    summary['tool_load_ms'] = {
+        name: statistics.median(run['tool_load_ms'].get(name, 0) for run in measured)
+        for name in measured[0]['tool_load_ms']
+    }
+    return summary
+
+
+def main(argv: Optional[List[str]] = None):
+    from benchmarks.run import _csv, _git_commit
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', type=_csv, default=list(SCENARIOS))
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--output', default='startup-benchmark-results.json')
+    parser.add_argument('--child', choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(child(args.child)))
+        return
+
+    results = []
+    for scenario in args.scenarios:
+        summary = summarize([run_fresh(scenario) for _ in range(args.runs)])
+        results.append(summary)
+        print(json.dumps(summary), file=sys.stderr)
+    report = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
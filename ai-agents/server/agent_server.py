@@ -0,0 +1,468 @@
+"""
+Agent Server for Farm Management AI Agents
+Long-lived worker processes holding warm agents and connection pools behind a local HTTP API
+
+Usage (from ai-agents/):
+    python -m server.agent_server --port 8088 --workers 4
+
+Endpoints:
+    POST /v1/analytics          {"user_id": "...", "location": "..."} -> insights
+    POST /v1/analytics/stream   same body, insights as newline-delimited JSON
+    GET  /healthz               worker state; 503 while draining
+    GET  /metrics               Prometheus text for the answering worker
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from multiprocessing.connection import wait as wait_for_sentinels
+from typing import Dict, Any, AsyncIterator, List, Optional
+
+from aiohttp import web
+
+from tools.adk_config import analytics_agent_config, load_adk_config, telemetry_config
+from tools.http_client import close_shared_client, get_shared_client
+from tools.refresh_scheduler import RefreshScheduler
+from tools.telemetry import configure_telemetry, get_telemetry
+
+logger = logging.getLogger(__name__)
+
+# Overridden by deployment.server in adk-config.yaml, then by CLI flags
+DEFAULT_SERVER_SETTINGS = {
+    'host': '127.0.0.1',
+    'port': 8088,
+    'max_concurrency': 16,
+    'max_queue': 64,
+    'queue_timeout_seconds': 10.0,
+    'request_timeout_seconds': 60.0,
+    'drain_timeout_seconds': 30.0
+}
+
+# Restart backoff for workers that exit unexpectedly
+RESTART_BACKOFF_MAX = 30.0
+# A worker that stayed up this long resets its backoff
+STABLE_UPTIME_SECONDS = 60.0
+
+
+class ServerBusy(Exception):
+    """The request queue is full or the wait for a slot timed out"""
+
+
+class ServerDraining(Exception):
+    """The worker is shutting down and accepts no new requests"""
+
+
+def worker_count(scaling: Dict[str, Any], requested: Optional[int] = None,
+                 cpu_count: Optional[int] = None) -> int:
+    """Workers to run: the requested count or one per core, within deployment.scaling bounds"""
+    count = requested or cpu_count or os.cpu_count() or 1
+    low = max(1, int(scaling.get('min_instances', 1)))
+    high = max(low, int(scaling.get('max_instances', count)))
+    return max(low, min(high, count))
+
+
+def server_settings(adk_config: Dict[str, Any], **overrides) -> Dict[str, Any]:
+    """Server settings from deployment.server, with non-None overrides applied"""
+    settings = {
+        **DEFAULT_SERVER_SETTINGS,
+        'log_level': adk_config.get('global', {}).get('logging', {}).get('level', 'INFO'),
+        'refresh': adk_config.get('deployment', {}).get('refresh', {}),
+        'telemetry': telemetry_config(adk_config),
+        **adk_config.get('deployment', {}).get('server', {})
+    }
+    settings.update({key: value for key, value in overrides.items() if value is not None})
+    return settings
+
+
+class RequestGate:
+    """
+    Bounded admission for one worker: up to max_concurrency requests run, up
+    to max_queue more wait in FIFO order, and anything beyond is rejected at
+    once so callers see backpressure instead of unbounded latency.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.closed = False
+        self.in_flight = 0
+        self.waiting = 0
+        self.served = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[float]:
+        """Hold a request slot; yields the seconds spent queued"""
+        if self.closed:
+            raise ServerDraining("worker is draining")
+        if self.in_flight + self.waiting >= self.max_concurrency + self.max_queue:
+            self.rejected += 1
+            raise ServerBusy("request queue is full")
+
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        self._idle.clear()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise ServerBusy(f"no slot within {self.queue_timeout}s")
+        finally:
+            self.waiting -= 1
+            self._mark_idle()
+
+        self.in_flight += 1
+        try:
+            yield time.perf_counter() - queued_at
+        finally:
+            self.in_flight -= 1
+            self.served += 1
+            self._slots.release()
+            self._mark_idle()
+
+    def _mark_idle(self):
+        if not self.in_flight and not self.waiting:
+            self._idle.set()
+
+    async def drain(self, timeout: float) -> bool:
+        """Stop admitting requests and wait for queued and running ones; False on timeout"""
+        self.closed = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and request counts"""
+        return {
+            'in_flight': self.in_flight,
+            'queued': self.waiting,
+            'served': self.served,
+            'rejected': self.rejected,
+            'timed_out': self.timed_out,
+            'max_concurrency': self.max_concurrency,
+            'max_queue': self.max_queue
+        }
+
+
+class AgentWorker:
+    """One worker process: a warm agent, its tools and pools, and the HTTP app in front of them"""
+
+    def __init__(self, agent_config: Dict[str, Any], settings: Dict[str, Any], worker_id: int = 0):
+        self.agent_config = agent_config
+        self.settings = settings
+        self.worker_id = worker_id
+        self.gate = RequestGate(
+            max_concurrency=int(settings['max_concurrency']),
+            max_queue=int(settings['max_queue']),
+            queue_timeout=float(settings['queue_timeout_seconds'])
+        )
+        self.telemetry = get_telemetry()
+        self.agent = None
+        # Keeps weather and farm snapshots of recently active users warm
+        self.refresher: Optional[RefreshScheduler] = None
+        self.started_at: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+
+    async def warm_up(self):
+        """Pay the cold-start cost once: build the agent and open the connection pool"""
+        from agents.analytics.farm_analytics_agent import create_analytics_agent
+
+        start = time.perf_counter()
+        self.agent = create_analytics_agent(self.agent_config)
+        # Tools load lazily; a long-lived worker loads them all before taking traffic
+        for name in self.agent.tool_registry.declared():
+            self.agent.tool_registry.get(name)
+        await get_shared_client().open()
+        refresh_settings = self.settings.get('refresh') or {}
+        if refresh_settings.get('enabled'):
+            self.refresher = RefreshScheduler(self.agent.weather_tool.client, self.agent.farm_data_tool.bridge,
+                                              refresh_settings).start()
+            self.telemetry.add_collector("refresh_scheduler", self.refresher.gauges)
+        self.warmup_seconds = time.perf_counter() - start
+        self.started_at = time.time()
+        self.telemetry.add_collector("agent_server", self._gauges)
+        logger.info(f"Worker {self.worker_id} (pid {os.getpid()}) warm in {self.warmup_seconds:.2f}s")
+
+    async def close(self):
+        """Stop background refreshes, then release the agent's stores and the shared connection pool"""
+        if self.refresher is not None:
+            await self.refresher.stop()
+        if self.agent is not None:
+            self.agent.close()
+        await close_shared_client()
+
+    def _gauges(self) -> List[tuple]:
+        labels = {'worker': self.worker_id}
+        stats = self.gate.stats()
+        return [
+            ('agent_server_in_flight', 'Requests running in this worker', labels, stats['in_flight']),
+            ('agent_server_queued', 'Requests waiting for a slot in this worker', labels, stats['queued']),
+            ('agent_server_draining', 'Whether this worker is draining (1) or serving (0)', labels,
+             1 if self.gate.closed else 0)
+        ]
+
+    def build_app(self) -> web.Application:
+        app = web.Application(client_max_size=64 * 1024)
+        app.router.add_post('/v1/analytics', self.handle_analytics)
+        app.router.add_post('/v1/analytics/stream', self.handle_analytics_stream)
+        app.router.add_get('/healthz', self.handle_health)
+        app.router.add_get('/metrics', self.handle_metrics)
+        return app
+
+    @staticmethod
+    def _error(status: int, message: str, **headers) -> web.Response:
+        return web.json_response(
+            {'success': False, 'error': message, 'timestamp': datetime.now().isoformat()},
+            status=status, headers=headers
+        )
+
+    async def _read_request(self, request: web.Request) -> Dict[str, Any]:
+        try:
+            body = await request.json()
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise web.HTTPBadRequest(text="Request body must be JSON")
+        if not isinstance(body, dict) or not isinstance(body.get('user_id'), str) or not body['user_id']:
+            raise web.HTTPBadRequest(text="user_id is required")
+        location = body.get('location')
+        body = {'user_id': body['user_id'], 'location': location if isinstance(location, str) else None}
+        if self.refresher is not None:
+            self.refresher.track_user(body['user_id'], body['location'])
+        return body
+
+    def _rejection(self, error: Exception) -> web.Response:
+        outcome = 'draining' if isinstance(error, ServerDraining) else 'busy'
+        self.telemetry.increment("agent_server_requests_total", outcome=outcome)
+        if isinstance(error, ServerDraining):
+            return self._error(503, str(error), Connection='close')
+        return self._error(503, str(error), **{'Retry-After': '1'})
+
+    async def handle_analytics(self, request: web.Request) -> web.Response:
+        """Run a full analysis and return all insights at once"""
+        body = await self._read_request(request)
+        try:
+            async with self.gate.slot() as queued:
+                self.telemetry.observe("agent_server_queue_seconds", queued)
+                stats: Dict[str, Any] = {}
+                insights = await asyncio.wait_for(
+                    self.agent.analyze_farm_performance(body['user_id'], body['location'], stats=stats),
+                    float(self.settings['request_timeout_seconds'])
+                )
+        except (ServerBusy, ServerDraining) as e:
+            return self._rejection(e)
+        except asyncio.TimeoutError:
+            self.telemetry.increment("agent_server_requests_total", outcome="timeout")
+            return self._error(504, "analysis timed out")
+        self.telemetry.increment("agent_server_requests_total", outcome="ok")
+        return web.json_response({
+            'success': True,
+            'data': {'insights': insights, 'stats': stats},
+            'timestamp': datetime.now().isoformat()
+        })
+
+    async def handle_analytics_stream(self, request: web.Request) -> web.StreamResponse:
+        """Run an analysis and write each insight as a JSON line as soon as it is ready"""
+        body = await self._read_request(request)
+        try:
+            async with self.gate.slot() as queued:
+                self.telemetry.observe("agent_server_queue_seconds", queued)
+                response = web.StreamResponse(headers={'Content-Type': 'application/x-ndjson'})
+                await response.prepare(request)
+                # The whole stream shares one request_timeout deadline
+                deadline = time.monotonic() + float(self.settings['request_timeout_seconds'])
+                insights = self.agent.stream_farm_insights(body['user_id'], body['location'])
+                try:
+                    while True:
+                        try:
+                            insight = await asyncio.wait_for(insights.__anext__(), deadline - time.monotonic())
+                        except StopAsyncIteration:
+                            break
+                        await response.write(json.dumps(insight).encode('utf-8') + b"\n")
+                except asyncio.TimeoutError:
+                    # Headers are already sent, so report the timeout in-band
+                    self.telemetry.increment("agent_server_requests_total", outcome="timeout")
+                    await response.write(json.dumps({'error': "analysis timed out"}).encode('utf-8') + b"\n")
+                    await response.write_eof()
+                    return response
+                finally:
+                    await insights.aclose()
+                await response.write_eof()
+        except (ServerBusy, ServerDraining) as e:
+            return self._rejection(e)
+        self.telemetry.increment("agent_server_requests_total", outcome="ok")
+        return response
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        """Liveness and load for this worker; 503 while draining so balancers stop routing here"""
+        status = 'draining' if self.gate.closed else 'ok'
+        return web.json_response({
+            'status': status,
+            'worker': self.worker_id,
+            'pid': os.getpid(),
+            'uptime_seconds': round(time.time() - self.started_at, 1) if self.started_at else 0,
+            'warmup_seconds': round(self.warmup_seconds or 0, 3),
+            **self.gate.stats(),
+            'refresh': self.refresher.stats() if self.refresher is not None else None
+        }, status=503 if self.gate.closed else 200)
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.telemetry.render_prometheus(), content_type='text/plain')
+
+    async def serve(self, stop: asyncio.Event, reuse_port: bool = False):
+        """Warm up, serve until stop is set, then drain in-flight requests and shut down"""
+        await self.warm_up()
+        # Requests get drain_timeout to finish; connections still open after that are closed promptly
+        runner = web.AppRunner(self.build_app(), access_log=None, shutdown_timeout=5.0)
+        await runner.setup()
+        site = web.TCPSite(runner, self.settings['host'], int(self.settings['port']),
+                           reuse_port=reuse_port or None)
+        await site.start()
+        logger.info(f"Worker {self.worker_id} listening on {self.settings['host']}:{self.settings['port']}")
+        try:
+            await stop.wait()
+        finally:
+            # Report draining and stop listening so new connections go to other workers
+            self.gate.closed = True
+            await site.stop()
+            drain_timeout = float(self.settings['drain_timeout_seconds'])
+            if not await self.gate.drain(drain_timeout):
+                logger.warning(f"Worker {self.worker_id} drain timed out with "
+                               f"{self.gate.in_flight} requests in flight")
+            await runner.cleanup()
+            await self.close()
+
+
+async def _run_worker(agent_config: Dict[str, Any], settings: Dict[str, Any],
+                      worker_id: int, reuse_port: bool):
+    # Once per worker process, before the agent and its tools are built
+    configure_telemetry(settings.get('telemetry', {}))
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    await AgentWorker(agent_config, settings, worker_id).serve(stop, reuse_port=reuse_port)
+
+
+def _worker_main(agent_config: Dict[str, Any], settings: Dict[str, Any], worker_id: int):
+    """Entry point of a spawned worker process"""
+    logging.basicConfig(level=settings['log_level'])
+    asyncio.run(_run_worker(agent_config, settings, worker_id, reuse_port=True))
+
+
+class Supervisor:
+    """
+    Parent process: spawns the workers (each binds the port with SO_REUSEPORT,
+    so the kernel spreads connections), restarts any that die with backoff,
+    and on SIGTERM/SIGINT lets them drain before exiting.
+    """
+
+    def __init__(self, agent_config: Dict[str, Any], settings: Dict[str, Any], workers: int):
+        self.agent_config = agent_config
+        self.settings = settings
+        self.workers = workers
+        self._context = multiprocessing.get_context('spawn')
+        self._processes: Dict[int, Any] = {}
+        self._started: Dict[int, float] = {}
+        self._failures: Dict[int, int] = {}
+        self._stopping = False
+
+    def _spawn(self, worker_id: int):
+        process = self._context.Process(
+            target=_worker_main, args=(self.agent_config, self.settings, worker_id),
+            name=f"agent-worker-{worker_id}", daemon=False
+        )
+        process.start()
+        self._processes[worker_id] = process
+        self._started[worker_id] = time.monotonic()
+
+    def _request_stop(self, signum, frame):
+        self._stopping = True
+
+    def run(self):
+        """Run workers until signalled, then drain them"""
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        for worker_id in range(self.workers):
+            self._spawn(worker_id)
+        logger.info(f"Started {self.workers} workers on {self.settings['host']}:{self.settings['port']}")
+
+        pending_restarts: Dict[int, float] = {}
+        while not self._stopping:
+            wait_for_sentinels([p.sentinel for p in self._processes.values()], timeout=0.5)
+            if self._stopping:
+                # Workers exiting on a group-wide signal are draining, not crashing
+                break
+            now = time.monotonic()
+            for worker_id, process in list(self._processes.items()):
+                if process.is_alive() or worker_id in pending_restarts:
+                    continue
+                uptime = now - self._started[worker_id]
+                failures = 0 if uptime >= STABLE_UPTIME_SECONDS else self._failures.get(worker_id, 0) + 1
+                self._failures[worker_id] = failures
+                delay = min(RESTART_BACKOFF_MAX, 2 ** failures - 1)
+                logger.warning(f"Worker {worker_id} exited with code {process.exitcode}; "
+                               f"restarting in {delay:.0f}s")
+                pending_restarts[worker_id] = now + delay
+            for worker_id, due in list(pending_restarts.items()):
+                if now >= due and not self._stopping:
+                    del pending_restarts[worker_id]
+                    self._spawn(worker_id)
+        self.shutdown()
+
+    def shutdown(self):
+        """Ask every worker to drain, then kill any that outlive the drain timeout"""
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + float(self.settings['drain_timeout_seconds']) + 5.0
+        for process in self._processes.values():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"{process.name} did not drain in time; killing it")
+                process.kill()
+                process.join()
+        logger.info("All workers stopped")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--config', default=None, help="Path to adk-config.yaml")
+    parser.add_argument('--agent', default='analytics-agent')
+    parser.add_argument('--host', default=None)
+    parser.add_argument('--port', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (default: one per core, within deployment.scaling)")
+    args = parser.parse_args(argv)
+
+    adk_config = load_adk_config(args.config)
+    settings = server_settings(adk_config, host=args.host, port=args.port)
+    logging.basicConfig(level=settings['log_level'])
+    agent_config = analytics_agent_config(adk_config, args.agent)
+    workers = worker_count(adk_config.get('deployment', {}).get('scaling', {}), args.workers)
+
+    if workers > 1 and not hasattr(socket, 'SO_REUSEPORT'):
+        logger.warning("SO_REUSEPORT is not available on this platform; running a single worker")
+        workers = 1
+    if workers == 1:
+        # No supervisor needed; serve from this process
+        asyncio.run(_run_worker(agent_config, settings, 0, reuse_port=False))
+    else:
+        Supervisor(agent_config, settings, workers).run()
+
+
+if __name__ == "__main__":
+    main()
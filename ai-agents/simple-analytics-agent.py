@@ -4,100 +4,133 @@ This agent provides read-only analytics without disrupting existing functionalit
 """
 
 from google.ai.adk import Agent, Tool
-import requests
 import json
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, AsyncIterator, List, Optional
+
+from agents.analytics.rule_engine import RuleEngine, summary_facts
+from tools.activity_aggregator import ActivityAggregator
+from tools.records import ActivityLog
+from tools.registry import ToolRegistry, get_registry
+from tools.telemetry import get_telemetry
+from tools.turn_memo import memoize_per_turn, turn_scope
+
+if TYPE_CHECKING:  # Imported lazily through the tool registry
+    from tools.bridge_client import BridgeClient
 
 class FarmDataTool(Tool):
     """Tool to access existing farm data via bridge API"""
     
-    def __init__(self, api_base_url: str, api_key: str):
-        self.api_base_url = api_base_url
-        self.api_key = api_key
+    def __init__(self, registry: ToolRegistry):
+        self.registry = registry
+    
+    @property
+    def bridge(self) -> "BridgeClient":
+        """The bridge client declared as farm-data-tool, built on first use"""
+        return self.registry.get("farm-data-tool")
     
-    def get_crop_summary(self, user_id: str) -> Dict[str, Any]:
+    @memoize_per_turn
+    async def get_crop_summary(self, user_id: str) -> Dict[str, Any]:
         """Get crop data summary from existing system"""
         try:
-            response = requests.get(
-                f"{self.api_base_url}/api/ai-bridge/crops",
-                headers={"Authorization": f"Bearer {self.api_key}"},
-                params={"userId": user_id}
-            )
-            return response.json()
+            return await self.bridge.get_crops(user_id)
         except Exception as e:
             return {"error": str(e), "success": False}
     
-    def get_financial_summary(self, user_id: str) -> Dict[str, Any]:
+    @memoize_per_turn
+    async def get_financial_summary(self, user_id: str) -> Dict[str, Any]:
         """Get financial data summary from existing system"""
         try:
-            response = requests.get(
-                f"{self.api_base_url}/api/ai-bridge/financial",
-                headers={"Authorization": f"Bearer {self.api_key}"},
-                params={"userId": user_id}
-            )
-            return response.json()
+            return await self.bridge.get_financial(user_id)
         except Exception as e:
             return {"error": str(e), "success": False}
+    
+    def iter_activities(self, user_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Stream activity records from existing system, page by page"""
+        return self.bridge.iter_activities(user_id)
 
 class SimpleAnalyticsAgent(Agent):
     """
     A simple analytics agent that provides insights without modifying data
     """
     
-    def __init__(self):
+    def __init__(self, registry: Optional[ToolRegistry] = None):
         super().__init__(
             name="FarmAnalyticsAgent",
             description="Provides analytical insights about farm performance and trends"
         )
         
-        # Initialize tools
-        self.farm_data_tool = FarmDataTool(
-            api_base_url="https://your-app-url.vercel.app",
-            api_key="your-api-key"  # In production, use secure key management
-        )
+        # Tools come from the `tools:` section of config/adk-config.yaml
+        # (base URL and key via FARM_API_BASE_URL / AI_BRIDGE_API_KEY)
+        self.farm_data_tool = FarmDataTool(registry or get_registry())
+        # Cost-trend and crop-status highlights straight from the rollups
+        self.rule_engine = RuleEngine()
+        # Shared registry; records nothing unless telemetry has been enabled
+        self.telemetry = get_telemetry()
+        # Tool calls made and saved by the per-request memo in the last request
+        self.last_turn_stats = {}
     
     async def process_request(self, user_input: str, user_id: str) -> str:
         """
         Process user requests for farm analytics
         """
+        # Identical tool calls made while handling this request share one result
+        with turn_scope() as turn:
+            response = await self._process_request(user_input, user_id)
+        self.last_turn_stats = turn.stats()
+        return response
+    
+    async def _process_request(self, user_input: str, user_id: str) -> str:
+        """Fetch, aggregate and format the analytics for one request"""
         
         # Get data from existing system (read-only)
-        crop_data = self.farm_data_tool.get_crop_summary(user_id)
-        financial_data = self.farm_data_tool.get_financial_summary(user_id)
+        with self.telemetry.stage("fetch", source="crop_data"):
+            crop_data = await self.farm_data_tool.get_crop_summary(user_id)
         
-        if not crop_data.get("success") or not financial_data.get("success"):
+        if not crop_data.get("success"):
+            self.telemetry.increment("agent_source_errors_total", source="crop_data")
+            self.telemetry.increment("agent_fallbacks_total", reason="error")
             return "I'm having trouble accessing your farm data right now. Please try again later."
         
-        # Simple analysis using the data
-        crops = crop_data.get("data", [])
-        activities = financial_data.get("data", [])
+        # The bridge module is loaded by now, so this import is a lookup
+        from tools.bridge_client import BridgeError
+        
+        # Simple analysis using the data; activities are streamed page by page
+        crops = (crop_data.get("data") or {}).get("crops", [])
+        activities = self.farm_data_tool.iter_activities(user_id)
         
         # Generate insights
-        insights = self._generate_insights(crops, activities)
+        try:
+            with self.telemetry.stage("aggregate"):
+                insights = await self._generate_insights(crops, activities)
+        except BridgeError:
+            self.telemetry.increment("agent_source_errors_total", source="activities")
+            self.telemetry.increment("agent_fallbacks_total", reason="error")
+            return "I'm having trouble accessing your farm data right now. Please try again later."
+        
+        with self.telemetry.stage("rules"):
+            highlights = self.rule_engine.evaluate(summary_facts(insights))["insights"]
         
-        return self._format_response(insights)
+        with self.telemetry.stage("format"):
+            return self._format_response(insights, highlights)
     
-    def _generate_insights(self, crops, activities):
-        """Generate simple insights from the data"""
-        insights = {
-            "total_crops": len(crops),
-            "active_crops": len([c for c in crops if c.get("status") == "GROWING"]),
-            "total_activities": len(activities),
-            "recent_costs": sum([a.get("cost", 0) for a in activities[-10:]]),  # Last 10 activities
-        }
+    async def _generate_insights(self, crops, activities):
+        """Generate simple insights from the data in a single pass over each stream"""
+        aggregator = ActivityAggregator(recent_count=10)
+        aggregator.consume_crops(crops)
+        if hasattr(activities, "__aiter__"):
+            await aggregator.consume_async(activities)
+        elif isinstance(activities, ActivityLog):
+            aggregator.consume_log(activities)
+        else:
+            aggregator.consume(activities)
         
-        # Add trend analysis
-        if activities:
-            monthly_costs = {}
-            for activity in activities:
-                month = activity.get("createdAt", "")[:7]  # YYYY-MM format
-                monthly_costs[month] = monthly_costs.get(month, 0) + activity.get("cost", 0)
-            
-            insights["monthly_trends"] = monthly_costs
+        insights = aggregator.summary()
+        if not aggregator.total_activities:
+            del insights["monthly_trends"]
         
         return insights
     
-    def _format_response(self, insights):
+    def _format_response(self, insights, highlights: Optional[List[Dict[str, Any]]] = None):
         """Format insights into a user-friendly response"""
         response = f"""
 📊 **Farm Analytics Summary**
@@ -114,9 +147,15 @@ class SimpleAnalyticsAgent(Agent):
 """
         
         if "monthly_trends" in insights:
+            # monthly_trends is in chronological order
             for month, cost in list(insights["monthly_trends"].items())[-3:]:  # Last 3 months
                 response += f"- {month}: ${cost:.2f}\n"
         
+        if highlights:
+            response += "\n⚠️ **Highlights:**\n"
+            for highlight in highlights:
+                response += f"- {highlight['title']}: {highlight['description']}\n"
+        
         response += "\n💡 This is an AI-generated summary based on your current farm data."
         
         return response
@@ -0,0 +1,162 @@
+"""
+Activity Aggregator for Farm Management AI Agents
+Single-pass, bounded-memory rollups over crop activity streams
+"""
+
+import heapq
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Iterable, AsyncIterable, List, Optional, Sequence, Tuple
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse a bridge timestamp (ISO 8601, optionally 'Z'-suffixed) as an aware UTC datetime"""
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, str) and value:
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    else:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+class ActivityAggregator:
+    """
+    Consumes activities one at a time and keeps only rollups: totals, the N
+    most recent costs, monthly/ISO-weekly/per-crop buckets and rolling windows.
+    Memory grows with the number of periods and crops, not with activities.
+    """
+
+    def __init__(self, recent_count: int = 10, window_days: Sequence[int] = (7, 30, 90),
+                 now: Optional[datetime] = None):
+        self.recent_count = recent_count
+        self.now = now or datetime.now(timezone.utc)
+        self.window_starts = {days: self.now - timedelta(days=days) for days in window_days}
+
+        self.total_activities = 0
+        self.total_cost = 0.0
+        self.undated_activities = 0
+        self.monthly: Dict[str, Dict[str, float]] = {}
+        self.weekly: Dict[str, Dict[str, float]] = {}
+        self.by_crop: Dict[str, Dict[str, float]] = {}
+        self.by_type: Dict[str, Dict[str, float]] = {}
+        self.windows: Dict[int, Dict[str, float]] = {
+            days: {'cost': 0.0, 'count': 0} for days in window_days
+        }
+        # Min-heap of (timestamp, sequence, cost) holding the newest activities
+        self._recent: List[Tuple[datetime, int, float]] = []
+
+        self.total_crops = 0
+        self.crops_by_status: Dict[str, int] = {}
+
+    def add(self, activity: Dict[str, Any]):
+        """Fold a single activity into the rollups"""
+        self._add(activity.get('cost') or 0, (activity.get('crop') or {}).get('name'),
+                  activity.get('type'), parse_timestamp(activity.get('createdAt')))
+
+    def _add(self, cost: float, crop: Optional[str], activity_type: Optional[str],
+             created_at: Optional[datetime]):
+        self.total_activities += 1
+        self.total_cost += cost
+
+        self._bump(self.by_crop, crop or 'Unknown', cost)
+        self._bump(self.by_type, activity_type or 'Unknown', cost)
+
+        if created_at is None:
+            self.undated_activities += 1
+            return
+
+        self._bump(self.monthly, f"{created_at.year}-{created_at.month:02d}", cost)
+        iso_year, iso_week, _ = created_at.isocalendar()
+        self._bump(self.weekly, f"{iso_year}-W{iso_week:02d}", cost)
+
+        for days, start in self.window_starts.items():
+            if start <= created_at <= self.now:
+                self.windows[days]['cost'] += cost
+                self.windows[days]['count'] += 1
+
+        entry = (created_at, self.total_activities, cost)
+        if len(self._recent) < self.recent_count:
+            heapq.heappush(self._recent, entry)
+        elif entry > self._recent[0]:
+            heapq.heapreplace(self._recent, entry)
+
+    def add_crop(self, crop: Dict[str, Any]):
+        """Fold a single crop into the crop counters"""
+        self.total_crops += 1
+        status = crop.get('status') or 'UNKNOWN'
+        self.crops_by_status[status] = self.crops_by_status.get(status, 0) + 1
+
+    def consume(self, activities: Iterable[Dict[str, Any]]) -> "ActivityAggregator":
+        """Fold an iterable of activities (e.g. a paginated generator)"""
+        for activity in activities:
+            self.add(activity)
+        return self
+
+    async def consume_async(self, activities: AsyncIterable[Dict[str, Any]]) -> "ActivityAggregator":
+        """Fold an async stream of activities (e.g. paged bridge responses)"""
+        async for activity in activities:
+            self.add(activity)
+        return self
+
+    def consume_log(self, log: Any) -> "ActivityAggregator":
+        """Fold a records.ActivityLog column-wise, without building per-activity objects"""
+        for activity_type, cost, created_at, crop in log.rows():
+            moment = None if math.isnan(created_at) else datetime.fromtimestamp(created_at, timezone.utc)
+            self._add(cost, crop, activity_type, moment)
+        return self
+
+    def consume_crops(self, crops: Iterable[Dict[str, Any]]) -> "ActivityAggregator":
+        """Fold an iterable of crops"""
+        for crop in crops:
+            self.add_crop(crop)
+        return self
+
+    @staticmethod
+    def _bump(buckets: Dict[str, Dict[str, float]], key: str, cost: float):
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = {'cost': 0.0, 'count': 0}
+        bucket['cost'] += cost
+        bucket['count'] += 1
+
+    @property
+    def recent_costs(self) -> float:
+        """Total cost of the most recent `recent_count` dated activities"""
+        return sum(cost for _, _, cost in self._recent)
+
+    def monthly_costs(self, last: Optional[int] = None) -> Dict[str, float]:
+        """Cost per month in chronological order, optionally only the last N months"""
+        months = sorted(self.monthly)
+        if last is not None:
+            months = months[-last:] if last > 0 else []
+        return {month: self.monthly[month]['cost'] for month in months}
+
+    def weekly_costs(self, last: Optional[int] = None) -> Dict[str, float]:
+        """Cost per ISO week in chronological order, optionally only the last N weeks"""
+        weeks = sorted(self.weekly)
+        if last is not None:
+            weeks = weeks[-last:] if last > 0 else []
+        return {week: self.weekly[week]['cost'] for week in weeks}
+
+    def summary(self) -> Dict[str, Any]:
+        """All rollups as a plain dict"""
+        return {
+            'total_crops': self.total_crops,
+            'active_crops': self.crops_by_status.get('GROWING', 0),
+            'crops_by_status': dict(self.crops_by_status),
+            'total_activities': self.total_activities,
+            'total_cost': self.total_cost,
+            'recent_costs': self.recent_costs,
+            'monthly_trends': self.monthly_costs(),
+            'weekly_trends': self.weekly_costs(),
+            'cost_by_crop': {crop: b['cost'] for crop, b in sorted(self.by_crop.items())},
+            'cost_by_type': {kind: b['cost'] for kind, b in sorted(self.by_type.items())},
+            'rolling_costs': {f"{days}d": dict(window) for days, window in self.windows.items()},
+            'undated_activities': self.undated_activities
+        }
@@ -0,0 +1,79 @@
+"""
+ADK Config Loader for Farm Management AI Agents
+Reads config/adk-config.yaml, expands ${VAR} references and maps entries to agent configs
+"""
+
+import os
+import re
+from typing import Dict, Any, List, Optional
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   'config', 'adk-config.yaml')
+
+_ENV_REFERENCE = re.compile(r'\$\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+
+def _expand(value: Any) -> Any:
+    """Replace ${VAR} with the environment value; a value that is only an unset reference becomes None"""
+    if isinstance(value, dict):
+        return {key: _expand(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_expand(item) for item in value]
+    if isinstance(value, str):
+        whole = _ENV_REFERENCE.fullmatch(value)
+        if whole:
+            return os.getenv(whole.group(1))
+        return _ENV_REFERENCE.sub(lambda match: os.getenv(match.group(1), ''), value)
+    return value
+
+
+def load_adk_config(path: Optional[str] = None) -> Dict[str, Any]:
+    """Load the ADK config file with environment references expanded"""
+    import yaml  # Only needed when a config file is actually read
+
+    with open(path or os.getenv('ADK_CONFIG_PATH', DEFAULT_CONFIG_PATH), encoding='utf-8') as f:
+        return _expand(yaml.safe_load(f) or {})
+
+
+_loaded_configs: Dict[str, Dict[str, Any]] = {}
+
+
+def get_adk_config(path: Optional[str] = None) -> Dict[str, Any]:
+    """The ADK config, parsed once per process and path; treat it as read-only"""
+    path = path or os.getenv('ADK_CONFIG_PATH', DEFAULT_CONFIG_PATH)
+    config = _loaded_configs.get(path)
+    if config is None:
+        config = _loaded_configs[path] = load_adk_config(path)
+    return config
+
+
+def find_entry(entries: List[Dict[str, Any]], name: str) -> Dict[str, Any]:
+    """The `agents:` or `tools:` entry with the given name, or an empty dict"""
+    for entry in entries or []:
+        if entry.get('name') == name:
+            return entry
+    return {}
+
+
+def analytics_agent_config(adk_config: Dict[str, Any], agent_name: str = 'analytics-agent') -> Dict[str, Any]:
+    """Build an agent config (FarmAnalyticsAgent's by default) from an agent entry and the tools it declares"""
+    agent = find_entry(adk_config.get('agents', []), agent_name)
+    tools = [find_entry(adk_config.get('tools', []), name) for name in agent.get('tools', [])]
+    tools = [tool for tool in tools if tool]
+    return {
+        **agent.get('config', {}),
+        'model': agent.get('model') or adk_config.get('global', {}).get('default_model', {}),
+        'farm_api': find_entry(tools, 'farm-data-tool').get('config', {}),
+        'weather_api': find_entry(tools, 'weather-data-tool').get('config', {}),
+        'tools': tools
+    }
+
+
+def telemetry_config(adk_config: Dict[str, Any]) -> Dict[str, Any]:
+    """The process-wide telemetry block: metrics from deployment.monitoring, tracing from global.logging"""
+    monitoring = adk_config.get('deployment', {}).get('monitoring', {})
+    logging_config = adk_config.get('global', {}).get('logging', {})
+    return {
+        'enabled': bool(monitoring.get('enable_metrics', False)),
+        'tracing': bool(logging_config.get('enable_tracing', False))
+    }
@@ -0,0 +1,248 @@
+"""
+Agronomic Analysis Engine for Farm Management AI Agents
+Columnar (NumPy) daily aggregates and indicators over 3-hourly forecasts for many locations
+"""
+
+import time
+from datetime import date
+from typing import Dict, Any, List, Optional, Sequence, Union
+
+import numpy as np
+
+# Base temperatures (°C) for growing degree days; most crops use 10°C
+DEFAULT_BASE_TEMP = 10.0
+CROP_BASE_TEMPS = {
+    'maize': 10.0,
+    'corn': 10.0,
+    'sorghum': 10.0,
+    'rice': 10.0,
+    'soybean': 10.0,
+    'beans': 10.0,
+    'tomato': 10.0,
+    'cotton': 15.6,
+    'potato': 7.0,
+    'wheat': 0.0,
+    'barley': 0.0,
+    'oats': 0.0
+}
+
+# Indicator thresholds, matching WeatherTool's agricultural rules
+FROST_TEMP = 2.0
+FROST_WINDOW_DAYS = 3
+DRY_DAY_PRECIP_MM = 1.0
+HIGH_WIND_SPEED = 10.0
+
+_EPOCH = date(1970, 1, 1)
+
+
+def base_temp_for(crop: Optional[str]) -> float:
+    """Look up the GDD base temperature for a crop name"""
+    return CROP_BASE_TEMPS.get((crop or '').strip().lower(), DEFAULT_BASE_TEMP)
+
+
+class ForecastBatch:
+    """3-hourly forecast rows for N locations stored as parallel arrays"""
+
+    def __init__(self, location: np.ndarray, dt: np.ndarray, day: np.ndarray,
+                 temp: np.ndarray, humidity: np.ndarray, rain: np.ndarray,
+                 wind: np.ndarray, condition: List[str], description: List[str],
+                 n_locations: int):
+        self.location = location
+        self.dt = dt
+        self.day = day
+        self.temp = temp
+        self.humidity = humidity
+        self.rain = rain
+        self.wind = wind
+        self.condition = condition
+        self.description = description
+        self.n_locations = n_locations
+
+    @classmethod
+    def from_openweather(cls, payloads: Sequence[Dict[str, Any]]) -> "ForecastBatch":
+        """Decode OpenWeather /forecast responses (one per location) into columns"""
+        rows = sum(len(p.get('list', [])) for p in payloads)
+        location = np.empty(rows, dtype=np.int32)
+        dt = np.empty(rows, dtype=np.int64)
+        day = np.empty(rows, dtype=np.int32)
+        temp = np.empty(rows, dtype=np.float64)
+        humidity = np.empty(rows, dtype=np.float64)
+        rain = np.empty(rows, dtype=np.float64)
+        wind = np.empty(rows, dtype=np.float64)
+        condition: List[str] = []
+        description: List[str] = []
+
+        i = 0
+        for loc, payload in enumerate(payloads):
+            items = payload.get('list', [])
+            if not items:
+                continue
+            # Calendar day in server local time, as WeatherTool has always
+            # grouped; one offset per payload unless DST changes inside it
+            first_offset = time.localtime(items[0]['dt']).tm_gmtoff
+            fixed_offset = first_offset == time.localtime(items[-1]['dt']).tm_gmtoff
+            for f in items:
+                location[i] = loc
+                dt[i] = f['dt']
+                offset = first_offset if fixed_offset else time.localtime(f['dt']).tm_gmtoff
+                day[i] = (f['dt'] + offset) // 86400
+                temp[i] = f['main']['temp']
+                humidity[i] = f['main']['humidity']
+                rain[i] = f.get('rain', {}).get('3h', 0)
+                wind[i] = f['wind']['speed']
+                condition.append(f['weather'][0]['main'])
+                description.append(f['weather'][0]['description'])
+                i += 1
+
+        return cls(location, dt, day, temp, humidity, rain, wind,
+                   condition, description, len(payloads))
+
+
+class DailyForecast:
+    """Per-location daily aggregates stored as parallel arrays, ordered by location then day"""
+
+    def __init__(self, location: np.ndarray, day: np.ndarray, temp_min: np.ndarray,
+                 temp_max: np.ndarray, temp_avg: np.ndarray, humidity_avg: np.ndarray,
+                 precipitation_total: np.ndarray, wind_speed: np.ndarray,
+                 condition: List[str], description: List[str], n_locations: int):
+        self.location = location
+        self.day = day
+        self.temp_min = temp_min
+        self.temp_max = temp_max
+        self.temp_avg = temp_avg
+        self.humidity_avg = humidity_avg
+        self.precipitation_total = precipitation_total
+        self.wind_speed = wind_speed
+        self.condition = condition
+        self.description = description
+        self.n_locations = n_locations
+        # Index of each location's first day; locations with no days get len(day)
+        self.location_starts = np.searchsorted(location, np.arange(n_locations))
+        self.location_counts = np.bincount(location, minlength=n_locations)
+
+    @classmethod
+    def from_batch(cls, batch: ForecastBatch) -> "DailyForecast":
+        """Aggregate 3-hourly rows into daily summaries for every location at once"""
+        if len(batch.dt) == 0:
+            empty = np.empty(0)
+            return cls(np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32), empty, empty,
+                       empty, empty, empty, empty, [], [], batch.n_locations)
+
+        # Rows arrive ordered by location then time, so each (location, day)
+        # group is a contiguous run
+        key = batch.location.astype(np.int64) * 1_000_000 + batch.day
+        starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        counts = np.diff(np.r_[starts, len(key)])
+        midpoints = starts + counts // 2
+
+        return cls(
+            location=batch.location[starts],
+            day=batch.day[starts],
+            temp_min=np.minimum.reduceat(batch.temp, starts),
+            temp_max=np.maximum.reduceat(batch.temp, starts),
+            temp_avg=np.add.reduceat(batch.temp, starts) / counts,
+            humidity_avg=np.add.reduceat(batch.humidity, starts) / counts,
+            precipitation_total=np.add.reduceat(batch.rain, starts),
+            wind_speed=batch.wind[midpoints],
+            condition=[batch.condition[i] for i in midpoints],
+            description=[batch.description[i] for i in midpoints],
+            n_locations=batch.n_locations
+        )
+
+    @classmethod
+    def from_dicts(cls, forecasts: List[Dict[str, Any]]) -> "DailyForecast":
+        """Build a single-location frame from WeatherTool's daily forecast dicts"""
+        n = len(forecasts)
+        return cls(
+            location=np.zeros(n, dtype=np.int32),
+            day=np.array([(date.fromisoformat(f['date']) - _EPOCH).days for f in forecasts], dtype=np.int32),
+            temp_min=np.array([f['temp_min'] for f in forecasts], dtype=np.float64),
+            temp_max=np.array([f['temp_max'] for f in forecasts], dtype=np.float64),
+            temp_avg=np.array([f['temp_avg'] for f in forecasts], dtype=np.float64),
+            humidity_avg=np.array([f['humidity_avg'] for f in forecasts], dtype=np.float64),
+            precipitation_total=np.array([f['precipitation_total'] for f in forecasts], dtype=np.float64),
+            wind_speed=np.array([f['wind_speed'] for f in forecasts], dtype=np.float64),
+            condition=[f['weather_condition'] for f in forecasts],
+            description=[f['description'] for f in forecasts],
+            n_locations=1
+        )
+
+    def head(self, days: int) -> "DailyForecast":
+        """Keep only the first `days` days of every location"""
+        keep = self._day_rank() < days
+        return DailyForecast(
+            self.location[keep], self.day[keep], self.temp_min[keep], self.temp_max[keep],
+            self.temp_avg[keep], self.humidity_avg[keep], self.precipitation_total[keep],
+            self.wind_speed[keep],
+            [c for c, k in zip(self.condition, keep) if k],
+            [d for d, k in zip(self.description, keep) if k],
+            self.n_locations
+        )
+
+    def _day_rank(self) -> np.ndarray:
+        """Position of each day within its location (0 = first day)"""
+        return np.arange(len(self.day)) - self.location_starts[self.location]
+
+    def _per_location_sum(self, values: np.ndarray) -> np.ndarray:
+        return np.bincount(self.location, weights=values, minlength=self.n_locations)
+
+    def growing_degree_days(self, base_temp: Union[float, np.ndarray] = DEFAULT_BASE_TEMP) -> np.ndarray:
+        """Daily GDD; base_temp may be a scalar or one value per location"""
+        base = np.asarray(base_temp, dtype=np.float64)
+        if base.ndim:
+            base = base[self.location]
+        return np.maximum(self.temp_avg - base, 0.0)
+
+    def cumulative_gdd(self, base_temp: Union[float, np.ndarray] = DEFAULT_BASE_TEMP) -> np.ndarray:
+        """Running GDD total per day, restarting at each location's first day"""
+        daily = self.growing_degree_days(base_temp)
+        running = np.cumsum(daily)
+        offsets = np.r_[0.0, running][np.minimum(self.location_starts, len(running))]
+        return running - offsets[self.location]
+
+    def gdd_by_crop(self, crops: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Per-location GDD totals for each crop's base temperature"""
+        return {crop: self._per_location_sum(self.growing_degree_days(base_temp_for(crop)))
+                for crop in crops}
+
+    def indicators(self, base_temp: Union[float, np.ndarray] = DEFAULT_BASE_TEMP) -> Dict[str, np.ndarray]:
+        """Per-location agricultural indicators (arrays of length n_locations)"""
+        frost_window = (self._day_rank() < FROST_WINDOW_DAYS) & (self.temp_min < FROST_TEMP)
+        return {
+            'growing_degree_days': self._per_location_sum(self.growing_degree_days(base_temp)),
+            'total_precipitation_mm': self._per_location_sum(self.precipitation_total),
+            'dry_days': self._per_location_sum((self.precipitation_total < DRY_DAY_PRECIP_MM).astype(np.float64)).astype(np.int64),
+            'frost_risk': self._per_location_sum(frost_window.astype(np.float64)) > 0,
+            'high_wind_days': self._per_location_sum((self.wind_speed > HIGH_WIND_SPEED).astype(np.float64)).astype(np.int64)
+        }
+
+    def weekly_outlook(self, location: int = 0,
+                       base_temp: Union[float, np.ndarray] = DEFAULT_BASE_TEMP) -> Dict[str, Any]:
+        """Indicators for one location in WeatherTool's 'weekly_outlook' shape"""
+        indicators = self.indicators(base_temp)
+        return {
+            'growing_degree_days': round(float(indicators['growing_degree_days'][location]), 1),
+            'total_precipitation_mm': round(float(indicators['total_precipitation_mm'][location]), 1),
+            'dry_days': int(indicators['dry_days'][location]),
+            'frost_risk': bool(indicators['frost_risk'][location]),
+            'high_wind_days': int(indicators['high_wind_days'][location])
+        }
+
+    def to_dicts(self, location: int = 0) -> List[Dict[str, Any]]:
+        """Daily summaries for one location in the WeatherTool forecast dict shape"""
+        start = int(self.location_starts[location])
+        end = start + int(self.location_counts[location])
+        return [
+            {
+                'date': date.fromordinal(_EPOCH.toordinal() + int(self.day[i])).isoformat(),
+                'temp_min': float(self.temp_min[i]),
+                'temp_max': float(self.temp_max[i]),
+                'temp_avg': float(self.temp_avg[i]),
+                'humidity_avg': float(self.humidity_avg[i]),
+                'precipitation_total': float(self.precipitation_total[i]),
+                'weather_condition': self.condition[i],
+                'description': self.description[i],
+                'wind_speed': float(self.wind_speed[i])
+            }
+            for i in range(start, end)
+        ]
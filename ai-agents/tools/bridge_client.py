@@ -0,0 +1,254 @@
+"""
+AI Bridge Client for Farm Management AI Agents
+Async, pooled client for the /api/ai-bridge/* endpoints with retries and pagination
+"""
+
+import asyncio
+import logging
+import random
+from datetime import datetime
+from typing import Dict, Any, AsyncIterator, Callable, List, Optional
+
+import aiohttp
+
+from tools.http_client import AsyncHttpClient, get_shared_client
+from tools.rate_limiter import UpstreamGuard, UpstreamUnavailable, get_guard
+from tools.records import ActivityLog, decode_activities
+from tools.weather_cache import WeatherCache
+
+logger = logging.getLogger(__name__)
+
+# Endpoints as declared for farm-data-tool in config/adk-config.yaml
+DEFAULT_ENDPOINTS = {
+    'crops': '/api/ai-bridge/crops',
+    'financial': '/api/ai-bridge/financial',
+    'activities': '/api/ai-bridge/activities',
+    'history': '/api/ai-bridge/history'
+}
+
+# Statuses worth retrying; other 4xx responses are caller errors
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class BridgeError(Exception):
+    """Raised when a bridge request fails after all retries"""
+
+
+class BridgeClient:
+    """Client for the AI data bridge shared by the FarmDataTool implementations"""
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None,
+                 endpoints: Optional[Dict[str, str]] = None,
+                 http_client: Optional[AsyncHttpClient] = None,
+                 timeout: float = 10.0, max_retries: int = 3,
+                 backoff_base: float = 0.25, backoff_max: float = 4.0,
+                 page_size: int = 50, guard: Optional[UpstreamGuard] = None,
+                 snapshot_cache: Optional[WeatherCache] = None):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.endpoints = {**DEFAULT_ENDPOINTS, **(endpoints or {})}
+        self.http = http_client or get_shared_client()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.page_size = page_size
+        # Shared by every FarmDataTool so bursts across agents respect one quota
+        self.guard = guard or get_guard('farm-data-tool')
+        # Full crop and financial snapshots per user (same TTL/LRU/single-flight
+        # store as weather); kept warm by the refresh scheduler when enabled
+        self.snapshot_cache = snapshot_cache
+
+    @classmethod
+    def from_config(cls, api_config: Dict[str, Any], **kwargs) -> "BridgeClient":
+        """Build a client from a farm-data-tool style config block"""
+        snapshot_ttl = api_config.get('snapshot_ttl_seconds')
+        if snapshot_ttl:
+            kwargs.setdefault('snapshot_cache', WeatherCache(ttls={'crops': snapshot_ttl, 'financial': snapshot_ttl}))
+        return cls(
+            base_url=api_config.get('base_url') or '',
+            api_key=(api_config.get('auth') or {}).get('token'),
+            endpoints=api_config.get('endpoints'),
+            **kwargs
+        )
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {'Accept': 'application/json', 'Accept-Encoding': 'gzip'}
+        if self.api_key:
+            headers['Authorization'] = f"Bearer {self.api_key}"
+        return headers
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff, honoring Retry-After when given"""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                  loads: Optional[Callable[[str], Any]] = None) -> Dict[str, Any]:
+        """GET a bridge endpoint by name, retrying transient failures"""
+        url = f"{self.base_url}{self.endpoints[endpoint]}"
+        query = {k: v for k, v in (params or {}).items() if v is not None}
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self.guard.call(
+                    lambda: self.http.get_json(url, params=query, headers=self._headers(),
+                                               timeout=self.timeout, loads=loads)
+                )
+            except UpstreamUnavailable as e:
+                # Fail fast: retrying against an open circuit only adds load
+                raise BridgeError(f"{endpoint} unavailable: {e}") from e
+            except aiohttp.ClientResponseError as e:
+                if e.status not in RETRYABLE_STATUSES or attempt == self.max_retries:
+                    raise BridgeError(f"{endpoint} request failed with HTTP {e.status}") from e
+                delay = self._backoff(attempt, (e.headers or {}).get('Retry-After'))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.max_retries:
+                    raise BridgeError(f"{endpoint} request failed: {e!r}") from e
+                delay = self._backoff(attempt)
+            logger.warning(f"Retrying bridge {endpoint} in {delay:.2f}s (attempt {attempt + 1})")
+            await asyncio.sleep(delay)
+
+    async def iter_pages(self, endpoint: str, items_key: str,
+                         params: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield successive pages of an endpoint, following its keyset cursor or else its offset"""
+        paging: Optional[Dict[str, Any]] = {}
+        while paging is not None:
+            page = await self.get(endpoint, {**(params or {}), 'limit': self.page_size, **paging})
+            if not page.get('success'):
+                raise BridgeError(page.get('error') or f"{endpoint} returned an error")
+            yield page
+            items = (page.get('data') or {}).get(items_key) or []
+            paging = self._next_paging(page, paging, len(items))
+
+    async def iter_items(self, endpoint: str, items_key: str,
+                         params: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield individual records across all pages"""
+        async for page in self.iter_pages(endpoint, items_key, params):
+            for item in (page.get('data') or {}).get(items_key) or []:
+                yield item
+
+    async def get_crops(self, user_id: str, since: Optional[str] = None,
+                        include_history: bool = False) -> Dict[str, Any]:
+        """All of a user's crops, with the first page's summary and every page's records"""
+        if self.snapshot_cache is None:
+            return await self._get_crops(user_id, since, include_history)
+        if since is None and not include_history:
+            return await self.snapshot_cache.get_or_fetch('crops', user_id, lambda: self._get_crops(user_id))
+        result = await self._get_crops(user_id, since, include_history)
+        if since is not None and result['data']['crops']:
+            # Changes since the cursor mean the stored snapshot is out of date
+            self.snapshot_cache.invalidate('crops', user_id)
+        return result
+
+    async def _get_crops(self, user_id: str, since: Optional[str] = None,
+                         include_history: bool = False) -> Dict[str, Any]:
+        params = {'userId': user_id, 'since': since,
+                  'includeHistory': 'true' if include_history else None}
+        result: Optional[Dict[str, Any]] = None
+        crops: List[Dict[str, Any]] = []
+        async for page in self.iter_pages('crops', 'crops', params):
+            if result is None:
+                result = page
+            crops.extend((page.get('data') or {}).get('crops') or [])
+        result['data'] = {**(result.get('data') or {}), 'crops': crops}
+        return result
+
+    async def get_financial(self, user_id: str, since: Optional[str] = None,
+                            time_range: Optional[int] = None,
+                            include_breakdown: bool = False) -> Dict[str, Any]:
+        """Financial summary for a user"""
+        if self.snapshot_cache is None:
+            return await self._get_financial(user_id, since, time_range, include_breakdown)
+        if since is None and time_range is None and not include_breakdown:
+            return await self.snapshot_cache.get_or_fetch('financial', user_id, lambda: self._get_financial(user_id))
+        result = await self._get_financial(user_id, since, time_range, include_breakdown)
+        data = result.get('data') or {}
+        if since is not None and (data.get('totalActivities') or data.get('recentActivities')):
+            self.snapshot_cache.invalidate('financial', user_id)
+        return result
+
+    async def _get_financial(self, user_id: str, since: Optional[str] = None,
+                             time_range: Optional[int] = None,
+                             include_breakdown: bool = False) -> Dict[str, Any]:
+        response = await self.get('financial', {
+            'userId': user_id,
+            'since': since,
+            'timeRange': time_range,
+            'includeBreakdown': 'true' if include_breakdown else None
+        })
+        if not response.get('success'):
+            raise BridgeError(response.get('error') or "financial returned an error")
+        return response
+
+    async def refresh_snapshot(self, user_id: str) -> Dict[str, Any]:
+        """Re-fetch a user's crop and financial snapshots ahead of expiry"""
+        if self.snapshot_cache is None:
+            return self.error_response(BridgeError("Snapshot cache is not enabled"))
+        try:
+            await asyncio.gather(
+                self.snapshot_cache.get_or_fetch('crops', user_id, lambda: self._get_crops(user_id), force=True),
+                self.snapshot_cache.get_or_fetch('financial', user_id, lambda: self._get_financial(user_id), force=True)
+            )
+        except BridgeError as e:
+            return self.error_response(e)
+        return {'success': True, 'data': {'user_id': user_id}, 'timestamp': datetime.now().isoformat()}
+
+    def snapshot_expires_in(self, user_id: str) -> Optional[float]:
+        """Seconds until the first of a user's cached snapshots expires, or None if either is missing"""
+        if self.snapshot_cache is None:
+            return None
+        remaining = [self.snapshot_cache.expires_in('crops', user_id),
+                     self.snapshot_cache.expires_in('financial', user_id)]
+        return None if None in remaining else min(remaining)
+
+    def iter_activities(self, user_id: str, since: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream all of a user's activities, newest first, page by page"""
+        return self.iter_items('activities', 'activities', {'userId': user_id, 'since': since})
+
+    def iter_history(self, user_id: str, kind: str, since: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream every 'harvest' or 'irrigation' log of a user, newest first, page by page"""
+        return self.iter_items('history', 'logs', {'userId': user_id, 'type': kind, 'since': since})
+
+    async def get_activity_log(self, user_id: str, since: Optional[str] = None) -> ActivityLog:
+        """All of a user's activities decoded straight into a compact, columnar ActivityLog"""
+        log = ActivityLog()
+        paging: Optional[Dict[str, Any]] = {}
+        while paging is not None:
+            page = await self.get(
+                'activities',
+                {'userId': user_id, 'since': since, 'limit': self.page_size, **paging},
+                loads=lambda raw: decode_activities(raw, log)[1]
+            )
+            if not page.get('success'):
+                raise BridgeError(page.get('error') or "activities returned an error")
+            # decode_activities replaces the page's records with their count
+            count = (page.get('data') or {}).get('activities') or 0
+            paging = self._next_paging(page, paging, count)
+        return log
+
+    def _next_paging(self, page: Dict[str, Any], paging: Dict[str, Any],
+                     count: int) -> Optional[Dict[str, Any]]:
+        """Paging parameters of the page after this one, or None when it ends the listing"""
+        pagination = page.get('pagination') or {}
+        if 'nextCursor' in pagination:
+            # Keyset paging: stable under inserts, and each page costs the same
+            return {'cursor': pagination['nextCursor']} if pagination['nextCursor'] else None
+        offset = (paging.get('offset') or 0) + count
+        total = pagination.get('total')
+        # Judged by the limit the bridge applied rather than the one asked for
+        if count < (pagination.get('limit') or self.page_size) or (total is not None and offset >= total):
+            return None
+        return {'offset': offset}
+
+    @staticmethod
+    def error_response(error: Exception) -> Dict[str, Any]:
+        """Tool-style failure envelope"""
+        return {
+            'success': False,
+            'error': str(error),
+            'timestamp': datetime.now().isoformat()
+        }
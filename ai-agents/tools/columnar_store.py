@@ -0,0 +1,255 @@
+"""
+Columnar Store for Farm Management AI Agents
+Append-only, month-partitioned NumPy column files with shared string dictionaries,
+memory-mapped on read for vectorized fleet-wide scans
+"""
+
+import json
+import os
+import shutil
+import threading
+from typing import Dict, Any, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Table -> column -> dtype, or the dictionary domain for string columns. Columns
+# in the same domain share codes across tables, so crop ids join without decoding.
+TABLES: Dict[str, Dict[str, str]] = {
+    'crops': {
+        'user': 'user', 'crop_id': 'crop_id', 'crop_name': 'crop_name', 'status': 'status',
+        'area': 'f8', 'planted_at': 'f8', 'expected_harvest_at': 'f8', 'harvested_at': 'f8',
+        'updated_at': 'f8'
+    },
+    'activities': {
+        'user': 'user', 'crop_id': 'crop_id', 'crop_name': 'crop_name', 'type': 'activity_type',
+        'cost': 'f8', 'created_at': 'f8'
+    },
+    'harvests': {
+        'user': 'user', 'crop_id': 'crop_id', 'crop_name': 'crop_name', 'log_key': 'i8',
+        'harvested_at': 'f8', 'quantity': 'f8'
+    },
+    'irrigation': {
+        'user': 'user', 'crop_id': 'crop_id', 'crop_name': 'crop_name', 'log_key': 'i8',
+        'irrigated_at': 'f8', 'water': 'f8'
+    }
+}
+
+# Epoch-seconds column each table is partitioned on by calendar month; crops
+# are few and versioned, so they stay in one partition
+PARTITION_COLUMNS = {
+    'crops': None,
+    'activities': 'created_at',
+    'harvests': 'harvested_at',
+    'irrigation': 'irrigated_at'
+}
+UNPARTITIONED = 'all'
+UNDATED = 'undated'
+
+MANIFEST_VERSION = 1
+
+
+def _write_json(path: str, value: Any):
+    """Replace a JSON file atomically so readers never see a partial write"""
+    temporary = f"{path}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(value, f, separators=(',', ':'))
+    os.replace(temporary, path)
+
+
+def month_partitions(epoch_seconds: np.ndarray) -> np.ndarray:
+    """'YYYY-MM' per timestamp ('undated' for NaN), computed column-wise"""
+    dated = ~np.isnan(epoch_seconds)
+    months = np.full(len(epoch_seconds), UNDATED, dtype=object)
+    if dated.any():
+        stamps = epoch_seconds[dated].astype('int64').astype('datetime64[s]')
+        months[dated] = np.datetime_as_string(stamps.astype('datetime64[M]'), unit='M').astype(object)
+    return months
+
+
+class Dictionary:
+    """Append-only string <-> int32 code table; None is stored as the empty string"""
+
+    def __init__(self, values: Optional[List[str]] = None):
+        self.values: List[str] = list(values or [])
+        self._index: Dict[str, int] = {value: code for code, value in enumerate(self.values)}
+        self.saved = len(self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def code(self, value: Optional[str]) -> int:
+        value = '' if value is None else str(value)
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def encode(self, values: Iterable[Optional[str]]) -> np.ndarray:
+        return np.fromiter((self.code(value) for value in values), dtype=np.int32)
+
+    def lookup(self, value: str) -> Optional[int]:
+        return self._index.get(value)
+
+    def decode(self, codes: Iterable[int]) -> List[str]:
+        return [self.values[code] for code in codes]
+
+
+class ColumnarStore:
+    """
+    Tables of typed columns under `root`, one .npy file per column per chunk:
+
+        root/manifest.json
+        root/dictionaries/<domain>.json
+        root/<table>/<partition>/<chunk>/<column>.npy
+
+    Appends write new chunks; only chunks listed in the manifest are visible,
+    and the manifest is replaced atomically on commit, so a crashed export
+    leaves the store as it was. Reads memory-map the chunk files.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, 'dictionaries'), exist_ok=True)
+        manifest_path = os.path.join(root, 'manifest.json')
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {'version': MANIFEST_VERSION, 'next_chunk': 0, 'cursors': {},
+                             'tables': {table: {} for table in TABLES}}
+        self._dictionaries: Dict[str, Dictionary] = {}
+        # Chunks written since the last commit: (table, partition, entry)
+        self._pending: List[tuple] = []
+
+    @property
+    def cursors(self) -> Dict[str, Dict[str, str]]:
+        """Per user, the change cursors of the last committed export"""
+        return self.manifest['cursors']
+
+    def dictionary(self, domain: str) -> Dictionary:
+        dictionary = self._dictionaries.get(domain)
+        if dictionary is None:
+            path = os.path.join(self.root, 'dictionaries', f'{domain}.json')
+            values = None
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    values = json.load(f)
+            dictionary = self._dictionaries[domain] = Dictionary(values)
+        return dictionary
+
+    def append(self, table: str, columns: Dict[str, np.ndarray]) -> int:
+        """Write rows as new chunks, one per partition; visible after commit(). Returns the row count."""
+        schema = TABLES[table]
+        missing = set(schema) - set(columns)
+        if missing:
+            raise ValueError(f"{table}: missing columns {', '.join(sorted(missing))}")
+        rows = len(next(iter(columns.values())))
+        if not rows:
+            return 0
+        partition_column = PARTITION_COLUMNS[table]
+        if partition_column is None:
+            groups = {UNPARTITIONED: slice(None)}
+        else:
+            months = month_partitions(np.asarray(columns[partition_column], dtype=np.float64))
+            groups = {month: months == month for month in np.unique(months)}
+
+        with self._lock:
+            for partition, rows_in in groups.items():
+                chunk = f"{self.manifest['next_chunk']:08d}"
+                self.manifest['next_chunk'] += 1
+                directory = os.path.join(self.root, table, partition, chunk)
+                os.makedirs(directory, exist_ok=True)
+                count = 0
+                for name, dtype in schema.items():
+                    values = np.asarray(columns[name])[rows_in]
+                    values = values.astype(np.int32 if dtype not in ('f8', 'i8') else dtype, copy=False)
+                    np.save(os.path.join(directory, f'{name}.npy'), values)
+                    count = len(values)
+                self._pending.append((table, partition, {'chunk': chunk, 'rows': count}))
+        return rows
+
+    def commit(self, cursors: Optional[Dict[str, Dict[str, str]]] = None):
+        """Publish pending chunks, new dictionary entries and advanced cursors"""
+        with self._lock:
+            for domain, dictionary in self._dictionaries.items():
+                if len(dictionary) > dictionary.saved:
+                    _write_json(os.path.join(self.root, 'dictionaries', f'{domain}.json'), dictionary.values)
+                    dictionary.saved = len(dictionary)
+            for table, partition, entry in self._pending:
+                self.manifest['tables'][table].setdefault(partition, []).append(entry)
+            self._pending = []
+            for user_id, user_cursors in (cursors or {}).items():
+                self.manifest['cursors'].setdefault(user_id, {}).update(user_cursors)
+            _write_json(os.path.join(self.root, 'manifest.json'), self.manifest)
+
+    def partitions(self, table: str) -> List[str]:
+        return sorted(self.manifest['tables'][table])
+
+    def rows(self, table: str) -> int:
+        return sum(entry['rows'] for chunks in self.manifest['tables'][table].values() for entry in chunks)
+
+    def scan(self, table: str, columns: Optional[Sequence[str]] = None,
+             partitions: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Committed columns of a table, optionally limited to some partitions.
+        A single chunk comes back as read-only memory maps; several are concatenated.
+        """
+        schema = TABLES[table]
+        names = list(columns or schema)
+        wanted = set(partitions) if partitions is not None else None
+        parts: Dict[str, List[np.ndarray]] = {name: [] for name in names}
+        for partition, chunks in sorted(self.manifest['tables'][table].items()):
+            if wanted is not None and partition not in wanted:
+                continue
+            for entry in chunks:
+                directory = os.path.join(self.root, table, partition, entry['chunk'])
+                for name in names:
+                    parts[name].append(np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r'))
+        result = {}
+        for name in names:
+            dtype = schema[name] if schema[name] in ('f8', 'i8') else np.int32
+            if not parts[name]:
+                result[name] = np.empty(0, dtype=dtype)
+            elif len(parts[name]) == 1:
+                result[name] = parts[name][0]
+            else:
+                result[name] = np.concatenate(parts[name])
+        return result
+
+    def compact(self, table: str):
+        """Merge each partition's chunks into one, so scans open fewer files"""
+        with self._lock:
+            if self._pending:
+                raise RuntimeError("Commit pending appends before compacting")
+        for partition in self.partitions(table):
+            chunks = self.manifest['tables'][table][partition]
+            if len(chunks) < 2:
+                continue
+            merged = self.scan(table, partitions=[partition])
+            with self._lock:
+                chunk = f"{self.manifest['next_chunk']:08d}"
+                self.manifest['next_chunk'] += 1
+                directory = os.path.join(self.root, table, partition, chunk)
+                os.makedirs(directory, exist_ok=True)
+                for name, values in merged.items():
+                    np.save(os.path.join(directory, f'{name}.npy'), np.ascontiguousarray(values))
+                self.manifest['tables'][table][partition] = [{'chunk': chunk, 'rows': len(next(iter(merged.values())))}]
+                _write_json(os.path.join(self.root, 'manifest.json'), self.manifest)
+            for entry in chunks:
+                shutil.rmtree(os.path.join(self.root, table, partition, entry['chunk']), ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Rows, partitions and chunks per table, and users with cursors"""
+        return {
+            'tables': {
+                table: {
+                    'rows': self.rows(table),
+                    'partitions': len(partitions),
+                    'chunks': sum(len(chunks) for chunks in partitions.values())
+                }
+                for table, partitions in self.manifest['tables'].items()
+            },
+            'users': len(self.manifest['cursors'])
+        }
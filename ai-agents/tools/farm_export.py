@@ -0,0 +1,460 @@
+"""
+Bulk Farm Data Export for Farm Management AI Agents
+Pages every user's crops, harvest/irrigation logs and activities out of the bridge
+into a ColumnarStore, and computes fleet-wide aggregates with vectorized scans
+
+Usage (from ai-agents/):
+    python -m tools.farm_export --users users.txt --output data/exports
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, AsyncIterator, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from tools.activity_aggregator import parse_timestamp
+from tools.bridge_client import BridgeClient, BridgeError
+from tools.columnar_store import TABLES, ColumnarStore
+from tools.records import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+# Re-read crops changed slightly before the last export's response time; the
+# overlap is harmless because crop versions and history logs already stored are skipped
+CURSOR_OVERLAP = timedelta(seconds=60)
+
+SECONDS_PER_DAY = 86400.0
+
+# Per history table: the bridge's history log type, the log's date and value
+# keys and the columns they are stored in
+HISTORY_TABLES = {
+    'harvests': ('harvest', 'harvestDate', 'quantity', 'harvested_at', 'quantity'),
+    'irrigation': ('irrigation', 'date', 'waterAmount', 'irrigated_at', 'water')
+}
+
+
+def _iso(moment: datetime) -> str:
+    return moment.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def epoch_column(values: List[Optional[str]]) -> np.ndarray:
+    """Bridge ISO timestamps as epoch seconds (NaN when missing), parsed by NumPy in one pass"""
+    try:
+        stamps = np.array([value[:-1] if value and value.endswith('Z') else (value or 'NaT') for value in values],
+                          dtype='datetime64[ms]')
+        seconds = stamps.astype('int64') / 1000.0
+        seconds[np.isnat(stamps)] = np.nan
+        return seconds
+    except ValueError:
+        # Offsets other than Z; take the slow, general path
+        parsed = [parse_timestamp(value) for value in values]
+        return np.array([moment.timestamp() if moment else np.nan for moment in parsed], dtype=np.float64)
+
+
+def log_key(user_id: str, log_id: Any) -> int:
+    """Stable 63-bit key for a history log, used to skip logs already exported"""
+    digest = hashlib.blake2b(f"{user_id}\0{log_id}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') >> 1
+
+
+class _TableBuffer:
+    """Column lists for rows waiting to be written"""
+
+    def __init__(self):
+        self.columns: Dict[str, List[np.ndarray]] = {}
+        self.rows = 0
+
+    def add(self, columns: Dict[str, np.ndarray]):
+        rows = len(next(iter(columns.values())))
+        if not rows:
+            return
+        for name, values in columns.items():
+            self.columns.setdefault(name, []).append(values)
+        self.rows += rows
+
+    def drain(self) -> Dict[str, np.ndarray]:
+        columns = {name: np.concatenate(parts) for name, parts in self.columns.items()}
+        self.columns = {}
+        self.rows = 0
+        return columns
+
+
+class FarmDataExporter:
+    """
+    Exports users through the bridge with bounded concurrency. Each user's
+    change cursors are kept in the store, so a re-run only fetches and appends
+    what is new: activities and harvest/irrigation logs created after the
+    newest one exported, and crops changed since the last export (appended as
+    new versions; versions and history logs already stored are skipped). Rows are flushed and committed every
+    `flush_rows`, and a user's cursors only advance once their rows are committed.
+    """
+
+    def __init__(self, bridge: BridgeClient, store: ColumnarStore, concurrency: int = 8,
+                 flush_rows: int = 250000):
+        self.bridge = bridge
+        self.store = store
+        self.concurrency = concurrency
+        self.flush_rows = flush_rows
+        self._buffers = {table: _TableBuffer() for table in ('crops', 'activities', 'harvests', 'irrigation')}
+        self._cursors: Dict[str, Dict[str, str]] = {}
+        self._known_logs = {table: np.unique(store.scan(table, ['log_key'])['log_key'])
+                            for table in ('harvests', 'irrigation')}
+        # Newest stored updated_at per crop_id code: NaN if never exported, -inf if undated
+        crops = store.scan('crops', ['crop_id', 'updated_at'])
+        self._crop_versions = np.full(len(store.dictionary('crop_id')), np.nan)
+        np.fmax.at(self._crop_versions, crops['crop_id'], np.nan_to_num(crops['updated_at'], nan=-np.inf))
+        self.stats = {'users': 0, 'failed': 0, 'rows': {table: 0 for table in self._buffers}}
+
+    async def export(self, user_ids: Union[Iterable[str], AsyncIterator[str]]) -> Dict[str, Any]:
+        """Export every user; failed users keep their old cursors and are retried next run"""
+        start = time.perf_counter()
+        work: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def produce():
+            try:
+                if hasattr(user_ids, '__aiter__'):
+                    async for user_id in user_ids:
+                        await work.put(user_id)
+                else:
+                    for user_id in user_ids:
+                        await work.put(user_id)
+            finally:
+                for _ in range(self.concurrency):
+                    await work.put(None)
+
+        async def consume():
+            while True:
+                user_id = await work.get()
+                if user_id is None:
+                    return
+                await self._export_user(user_id)
+                if sum(buffer.rows for buffer in self._buffers.values()) >= self.flush_rows:
+                    self.flush()
+
+        await asyncio.gather(produce(), *[consume() for _ in range(self.concurrency)])
+        self.flush()
+        return {**self.stats, 'seconds': round(time.perf_counter() - start, 3), 'store': self.store.stats()}
+
+    async def _export_user(self, user_id: str):
+        cursors = self.store.cursors.get(user_id, {})
+        try:
+            crops, log, *histories = await asyncio.gather(
+                self.bridge.get_crops(user_id, since=cursors.get('crops')),
+                self.bridge.get_activity_log(user_id, since=cursors.get('activities')),
+                *[self._get_history(user_id, table, cursors.get(table)) for table in HISTORY_TABLES]
+            )
+        except BridgeError as e:
+            logger.error(f"Export of {user_id} failed: {e}")
+            self.stats['failed'] += 1
+            return
+
+        user_cursors = {}
+        records = (crops.get('data') or {}).get('crops') or []
+        if records:
+            self._add_crops(user_id, records)
+        responded_at = parse_timestamp(crops.get('timestamp'))
+        if responded_at is not None:
+            user_cursors['crops'] = _iso(responded_at - CURSOR_OVERLAP)
+        if len(log):
+            self._add_activities(user_id, log)
+            created = np.frombuffer(log.created_at, dtype=np.float64)
+            if not np.isnan(created).all():
+                newest = np.nanmax(created)
+                # The activities filter is strict (createdAt > since), so this never re-reads a row
+                user_cursors['activities'] = _iso(datetime.fromtimestamp(newest, timezone.utc))
+        for table, logs in zip(HISTORY_TABLES, histories):
+            if not logs:
+                continue
+            self._add_history(user_id, table, logs)
+            created = epoch_column([entry.get('createdAt') for entry in logs])
+            if not np.isnan(created).all():
+                # Strict filter like the activities one
+                user_cursors[table] = _iso(datetime.fromtimestamp(np.nanmax(created), timezone.utc))
+        self._cursors[user_id] = {**self._cursors.get(user_id, {}), **user_cursors}
+        self.stats['users'] += 1
+
+    def _add_crops(self, user_id: str, records: List[Dict[str, Any]]):
+        user = self.store.dictionary('user').code(user_id)
+        crop_ids = self.store.dictionary('crop_id')
+        crop_names = self.store.dictionary('crop_name')
+        count = len(records)
+        self._buffers['crops'].add({
+            'user': np.full(count, user, dtype=np.int32),
+            'crop_id': crop_ids.encode(crop.get('id') for crop in records),
+            'crop_name': crop_names.encode(crop.get('name') for crop in records),
+            'status': self.store.dictionary('status').encode(crop.get('status') for crop in records),
+            'area': np.array([crop.get('area') if crop.get('area') is not None else np.nan for crop in records],
+                             dtype=np.float64),
+            'planted_at': epoch_column([crop.get('plantingDate') for crop in records]),
+            'expected_harvest_at': epoch_column([crop.get('expectedHarvestDate') for crop in records]),
+            'harvested_at': epoch_column([crop.get('actualHarvestDate') for crop in records]),
+            'updated_at': epoch_column([crop.get('updatedAt') for crop in records])
+        })
+
+    async def _get_history(self, user_id: str, table: str, since: Optional[str]) -> List[Dict[str, Any]]:
+        return [entry async for entry in self.bridge.iter_history(user_id, HISTORY_TABLES[table][0], since=since)]
+
+    def _add_history(self, user_id: str, table: str, logs: List[Dict[str, Any]]):
+        _, date_key, value_key, date_column, value_column = HISTORY_TABLES[table]
+        crops = [entry.get('crop') or {} for entry in logs]
+        self._buffers[table].add({
+            'user': np.full(len(logs), self.store.dictionary('user').code(user_id), dtype=np.int32),
+            'crop_id': self.store.dictionary('crop_id').encode(crop.get('id') for crop in crops),
+            'crop_name': self.store.dictionary('crop_name').encode(crop.get('name') for crop in crops),
+            'log_key': np.array([log_key(user_id, entry.get('id')) for entry in logs], dtype=np.int64),
+            date_column: epoch_column([entry.get(date_key) for entry in logs]),
+            value_column: np.array([entry.get(value_key) or 0 for entry in logs], dtype=np.float64)
+        })
+
+    def _add_activities(self, user_id: str, log: ActivityLog):
+        # The log's interned tables map straight onto store codes
+        types = self.store.dictionary('activity_type').encode(log.types)
+        crop_ids = self.store.dictionary('crop_id').encode(crop_id for crop_id, _ in log.crops)
+        crop_names = self.store.dictionary('crop_name').encode(name for _, name in log.crops)
+        crop_codes = np.frombuffer(log.crop_code, dtype=np.uint32)
+        self._buffers['activities'].add({
+            'user': np.full(len(log), self.store.dictionary('user').code(user_id), dtype=np.int32),
+            'crop_id': crop_ids[crop_codes],
+            'crop_name': crop_names[crop_codes],
+            'type': types[np.frombuffer(log.type_code, dtype=np.uint8)],
+            'cost': np.frombuffer(log.cost, dtype=np.float64).copy(),
+            'created_at': np.frombuffer(log.created_at, dtype=np.float64).copy()
+        })
+
+    def _new_crop_versions(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Drop crop rows no newer than the version already stored (re-read by the cursor overlap)"""
+        ids = columns['crop_id']
+        updated = np.nan_to_num(columns['updated_at'], nan=-np.inf)
+        size = len(self.store.dictionary('crop_id'))
+        if size > len(self._crop_versions):
+            self._crop_versions = np.concatenate([self._crop_versions,
+                                                  np.full(size - len(self._crop_versions), np.nan)])
+        known = self._crop_versions[ids]
+        keep = np.isnan(known) | (updated > known)
+        np.fmax.at(self._crop_versions, ids[keep], updated[keep])
+        return {name: values[keep] for name, values in columns.items()}
+
+    def _new_logs(self, table: str, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Drop history logs already stored or repeated within this batch"""
+        keys = columns['log_key']
+        _, first = np.unique(keys, return_index=True)
+        keep = np.zeros(len(keys), dtype=bool)
+        keep[first] = True
+        keep &= ~np.isin(keys, self._known_logs[table])
+        self._known_logs[table] = np.union1d(self._known_logs[table], keys[keep])
+        return {name: values[keep] for name, values in columns.items()}
+
+    def flush(self):
+        """Write buffered rows and commit them with the cursors of the users they came from"""
+        for table, buffer in self._buffers.items():
+            if not buffer.rows:
+                continue
+            columns = buffer.drain()
+            if table == 'crops':
+                columns = self._new_crop_versions(columns)
+            elif table in self._known_logs:
+                columns = self._new_logs(table, columns)
+            self.stats['rows'][table] += self.store.append(table, columns)
+        self.store.commit(self._cursors)
+        self._cursors = {}
+
+
+class FleetAggregates:
+    """Cost, harvest and irrigation aggregates across every exported farm, as column scans"""
+
+    def __init__(self, store: ColumnarStore):
+        self.store = store
+
+    def _names(self, domain: str, codes: np.ndarray) -> List[str]:
+        return self.store.dictionary(domain).decode(codes.tolist())
+
+    def latest_crops(self) -> Dict[str, np.ndarray]:
+        """The newest exported version of each crop"""
+        crops = self.store.scan('crops')
+        if not len(crops['crop_id']):
+            return crops
+        updated = np.nan_to_num(np.asarray(crops['updated_at']), nan=-np.inf)
+        order = np.lexsort((updated, crops['crop_id']))
+        ids = crops['crop_id'][order]
+        last = order[np.r_[ids[1:] != ids[:-1], True]]
+        return {name: np.asarray(values)[last] for name, values in crops.items()}
+
+    def _cost_by(self, column: str, months: Optional[Iterable[str]]) -> Dict[str, Dict[str, float]]:
+        domain = TABLES['activities'][column]
+        activities = self.store.scan('activities', [column, 'cost'], partitions=months)
+        size = len(self.store.dictionary(domain))
+        cost = np.bincount(activities[column], weights=activities['cost'], minlength=size)
+        count = np.bincount(activities[column], minlength=size)
+        present = np.flatnonzero(count)
+        return {name or 'Unknown': {'cost': round(float(cost[code]), 2), 'count': int(count[code])}
+                for name, code in zip(self._names(domain, present), present)}
+
+    def cost_per_crop(self, months: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, float]]:
+        """Total cost and activity count per crop name, optionally for some 'YYYY-MM' months"""
+        return self._cost_by('crop_name', months)
+
+    def cost_by_type(self, months: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, float]]:
+        """Total cost and activity count per activity type"""
+        return self._cost_by('type', months)
+
+    def monthly_spend(self, months: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Fleet-wide cost per 'YYYY-MM' month, in order"""
+        spend = {}
+        for partition in self.store.partitions('activities'):
+            if months is not None and partition not in months:
+                continue
+            cost = self.store.scan('activities', ['cost'], partitions=[partition])['cost']
+            spend[partition] = round(float(np.sum(cost)), 2)
+        return spend
+
+    def yield_per_area(self) -> Dict[str, Dict[str, float]]:
+        """Harvested quantity per unit of planted area, per crop name, over crops with harvests"""
+        crops = self.latest_crops()
+        harvests = self.store.scan('harvests', ['crop_id', 'quantity'])
+        size = len(self.store.dictionary('crop_id'))
+        quantity_by_crop = np.bincount(harvests['crop_id'], weights=harvests['quantity'], minlength=size)
+        harvested = quantity_by_crop[crops['crop_id']] > 0
+        names = crops['crop_name'][harvested]
+        name_size = len(self.store.dictionary('crop_name'))
+        quantity = np.bincount(names, weights=quantity_by_crop[crops['crop_id'][harvested]], minlength=name_size)
+        area = np.bincount(names, weights=np.nan_to_num(crops['area'][harvested]), minlength=name_size)
+        present = np.flatnonzero(quantity)
+        return {
+            name: {
+                'quantity': round(float(quantity[code]), 2),
+                'area': round(float(area[code]), 2),
+                'yield_per_area': round(float(quantity[code] / area[code]), 3) if area[code] else None
+            }
+            for name, code in zip(self._names('crop_name', present), present)
+        }
+
+    def irrigation_per_crop(self) -> Dict[str, Dict[str, float]]:
+        """Water applied and irrigation events per crop name"""
+        irrigation = self.store.scan('irrigation', ['crop_name', 'water'])
+        size = len(self.store.dictionary('crop_name'))
+        water = np.bincount(irrigation['crop_name'], weights=irrigation['water'], minlength=size)
+        count = np.bincount(irrigation['crop_name'], minlength=size)
+        present = np.flatnonzero(count)
+        return {name: {'water': round(float(water[code]), 2), 'events': int(count[code])}
+                for name, code in zip(self._names('crop_name', present), present)}
+
+    def farm_facts(self, now: Optional[datetime] = None) -> Tuple[List[str], List[Dict[str, float]]]:
+        """
+        Per-user crop and finance facts in the rule engine's shape, for
+        RuleEngine.evaluate_many; weather facts are left out (NaN).
+        """
+        from agents.analytics.rule_engine import FACT_NAMES, MISSING
+
+        now = now or datetime.now(timezone.utc)
+        stamp = now.timestamp()
+        users = len(self.store.dictionary('user'))
+
+        crops = self.latest_crops()
+        status_codes = {name: self.store.dictionary('status').lookup(name)
+                        for name in ('GROWING', 'PLANNED', 'HARVESTED')}
+        status = crops['status']
+        expected = crops['expected_harvest_at']
+        pending = ~np.isin(status, [code for name, code in status_codes.items()
+                                    if name in ('PLANNED', 'HARVESTED') and code is not None])
+        pending &= np.isnan(crops['harvested_at'])
+
+        def per_user(mask: np.ndarray, weights: Optional[np.ndarray] = None, source=crops) -> np.ndarray:
+            return np.bincount(source['user'][mask], weights=None if weights is None else weights[mask],
+                               minlength=users)
+
+        crop_count = np.bincount(crops['user'], minlength=users)
+        growing = per_user(status == status_codes['GROWING']) if status_codes['GROWING'] is not None else np.zeros(users)
+        planned = per_user(status == status_codes['PLANNED']) if status_codes['PLANNED'] is not None else np.zeros(users)
+        overdue = per_user(pending & (expected < stamp))
+        due = per_user(pending & (expected >= stamp) & (expected <= stamp + 14 * SECONDS_PER_DAY))
+
+        activities = self.store.scan('activities', ['user', 'cost', 'created_at'])
+        created = activities['created_at']
+        month_30 = (created > stamp - 30 * SECONDS_PER_DAY) & (created <= stamp)
+        week = (created >= stamp - 7 * SECONDS_PER_DAY) & (created <= stamp)
+        cost_30d = per_user(month_30, activities['cost'], activities)
+        count_30d = per_user(month_30, source=activities)
+        cost_7d = per_user(week, activities['cost'], activities)
+
+        # The two complete calendar months before now
+        this_month = np.datetime64(now.replace(tzinfo=None), 'M')
+        month_index = np.full(len(created), -1)
+        dated = ~np.isnan(created)
+        month_index[dated] = (this_month - created[dated].astype('int64').astype('datetime64[s]')
+                              .astype('datetime64[M]')).astype(np.int64)
+        last_month = per_user(month_index == 1, activities['cost'], activities)
+        month_before = per_user(month_index == 2, activities['cost'], activities)
+
+        has_crops = crop_count > 0
+        has_activity = np.bincount(activities['user'], minlength=users) > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            facts = {
+                'crop_count': np.where(has_crops, crop_count, MISSING),
+                'growing_crops': np.where(has_crops, growing, MISSING),
+                'planned_crops': np.where(has_crops, planned, MISSING),
+                'harvest_due_14d': np.where(has_crops, due, MISSING),
+                'overdue_harvests': np.where(has_crops, overdue, MISSING),
+                'cost_30d': np.where(has_activity, cost_30d, MISSING),
+                'activities_30d': np.where(has_activity, count_30d, MISSING),
+                'avg_activity_cost': np.where(count_30d > 0, cost_30d / count_30d, np.where(has_activity, 0.0, MISSING)),
+                'recent_cost_share': np.where(cost_30d > 0, cost_7d / cost_30d, MISSING),
+                'cost_change_pct': np.where(month_before > 0, (last_month - month_before) / month_before * 100, MISSING)
+            }
+        columns = [facts.get(name, np.full(users, MISSING)) for name in FACT_NAMES]
+        rows = [dict(zip(FACT_NAMES, row)) for row in np.column_stack(columns).tolist()]
+        return self.store.dictionary('user').values, rows
+
+    def summary(self) -> Dict[str, Any]:
+        """All fleet aggregates as a plain dict"""
+        return {
+            'store': self.store.stats(),
+            'cost_per_crop': self.cost_per_crop(),
+            'cost_by_type': self.cost_by_type(),
+            'monthly_spend': self.monthly_spend(),
+            'yield_per_area': self.yield_per_area(),
+            'irrigation_per_crop': self.irrigation_per_crop()
+        }
+
+
+def _read_users(path: str) -> List[str]:
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+def main(argv: Optional[List[str]] = None):
+    from tools.adk_config import find_entry, get_adk_config
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', help='File with one user id per line')
+    parser.add_argument('--output', help='Store directory (default: export.path in adk-config.yaml)')
+    parser.add_argument('--concurrency', type=int)
+    parser.add_argument('--summary', action='store_true', help='Print fleet aggregates after exporting')
+    args = parser.parse_args(argv)
+
+    adk_config = get_adk_config()
+    settings = adk_config.get('export', {})
+    store = ColumnarStore(args.output or settings.get('path', './data/exports'))
+    if args.users:
+        bridge = BridgeClient.from_config(find_entry(adk_config.get('tools', []), 'farm-data-tool').get('config', {}))
+        exporter = FarmDataExporter(bridge, store, concurrency=args.concurrency or settings.get('concurrency', 8),
+                                    flush_rows=settings.get('flush_rows', 250000))
+
+        async def run():
+            try:
+                return await exporter.export(_read_users(args.users))
+            finally:
+                await bridge.http.close()
+
+        print(json.dumps(asyncio.run(run()), indent=2))
+    if args.summary or not args.users:
+        print(json.dumps(FleetAggregates(store).summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
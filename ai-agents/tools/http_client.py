@@ -0,0 +1,92 @@
+"""
+Async HTTP Client for Farm Management AI Agents
+Shared, pooled transport used by the tools for non-blocking upstream calls
+"""
+
+import asyncio
+import json
+from typing import Dict, Any, Callable, Optional
+
+import aiohttp
+
+
+class AsyncHttpClient:
+    """Pooled aiohttp session with keep-alive, per-host limits and timeouts"""
+
+    def __init__(self, max_connections: int = 100, max_connections_per_host: int = 10,
+                 timeout: float = 10.0, connect_timeout: float = 5.0,
+                 keepalive_timeout: float = 30.0):
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled session, creating it on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # Sessions are bound to the loop they were created on, so a new
+            # loop (e.g. a second asyncio.run) gets a fresh pool
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout, connect=self.connect_timeout)
+            )
+            self._loop = loop
+        return self._session
+
+    async def open(self):
+        """Create the pool ahead of the first request (e.g. during server warm-up)"""
+        self._get_session()
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None,
+                       headers: Optional[Dict[str, str]] = None,
+                       timeout: Optional[float] = None,
+                       loads: Optional[Callable[[str], Any]] = None) -> Any:
+        """GET a URL and decode the JSON body (with `loads` if given), raising on HTTP errors"""
+        session = self._get_session()
+        request_timeout = aiohttp.ClientTimeout(total=timeout) if timeout is not None else None
+        async with session.get(url, params=params, headers=headers,
+                               timeout=request_timeout) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None, loads=loads or json.loads)
+
+    async def close(self):
+        """Close the pooled session and release its connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+_shared_client: Optional[AsyncHttpClient] = None
+
+
+def get_shared_client() -> AsyncHttpClient:
+    """Return the process-wide client shared by all tools"""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = AsyncHttpClient()
+    return _shared_client
+
+
+async def close_shared_client():
+    """Close the process-wide client, e.g. on agent shutdown"""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.close()
+        _shared_client = None
@@ -0,0 +1,120 @@
+"""
+Insight Cache for Farm Management AI Agents
+Content-addressed, SQLite-backed cache of validated LLM insights
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+
+class InsightCache:
+    """Persistent cache keyed on a hash of the model config and normalized prompt"""
+
+    def __init__(self, path: str = ":memory:", ttl_seconds: float = 6 * 3600,
+                 max_entries: int = 10000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS insights (
+                key TEXT PRIMARY KEY,
+                insights TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_insights_accessed ON insights (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model_config: Dict[str, Any], prompt: str, system_prompt: str = "") -> str:
+        """Hash the settings that determine the model output"""
+        normalized_prompt = re.sub(r"\s+", " ", prompt).strip()
+        normalized_system = re.sub(r"\s+", " ", system_prompt).strip()
+        material = json.dumps({
+            "model": model_config.get("model"),
+            "temperature": model_config.get("temperature"),
+            "system": normalized_system,
+            "prompt": normalized_prompt
+        }, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached insights for a key, or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT insights, created_at FROM insights WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] + self.ttl_seconds <= now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM insights WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE insights SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, insights: List[Dict[str, Any]]):
+        """Store validated insights, evicting the least recently used entries over the limit"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO insights (key, insights, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(insights, separators=(",", ":")), now, now)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM insights").fetchone()[0]
+            if count > self.max_entries:
+                overflow = count - self.max_entries
+                self._conn.execute(
+                    "DELETE FROM insights WHERE key IN "
+                    "(SELECT key FROM insights ORDER BY accessed_at LIMIT ?)", (overflow,)
+                )
+                self.evictions += overflow
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete all expired entries and return how many were removed"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM insights WHERE created_at <= ?", (time.time() - self.ttl_seconds,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM insights").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries
+        }
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
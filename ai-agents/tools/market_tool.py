@@ -1,3 +1,181 @@
 """
 Market Data Tool for Farm Management AI Agents
-Provides commodity prices and market trends for agricultu
\ No newline at end of file
+Provides commodity prices and market trends for agricultural planning from a local price store
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Sequence
+
+from tools.price_store import PriceStore
+
+# Bundled sample feed so the tool works offline and in development
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'data', 'fixtures', 'market_prices.csv')
+
+# Relative move of the short average against the long one that counts as a trend
+TREND_THRESHOLD = 0.02
+
+class MarketTool:
+    """Tool to access commodity prices and trends for farming decisions"""
+
+    def __init__(self, store: Optional[PriceStore] = None, store_path: Optional[str] = None,
+                 feeds: Optional[Sequence[str]] = None, seed_fixtures: bool = False):
+        self.store = store or PriceStore(store_path or os.getenv('MARKET_PRICE_DB', ':memory:'))
+        # Feeds are idempotent to replay, so seeding on every start is safe
+        for path in feeds or []:
+            self.store.ingest_file(path)
+        if seed_fixtures and os.path.exists(DEFAULT_FIXTURES):
+            self.store.ingest_file(DEFAULT_FIXTURES, source='fixtures')
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "MarketTool":
+        """Build a tool from a market-data-tool style config block"""
+        store_config = config.get('store', {})
+        return cls(
+            store_path=store_config.get('path'),
+            feeds=store_config.get('feeds'),
+            seed_fixtures=store_config.get('seed_fixtures', False)
+        )
+
+    async def get_latest_price(self, commodity: str, market: Optional[str] = None) -> Dict[str, Any]:
+        """Get the most recent price for a commodity"""
+        try:
+            latest = self.store.latest(commodity, market)
+            if latest is None:
+                return self._not_found(commodity)
+
+            history = self.store.tail(commodity, 2, market)
+            previous = None
+            change_pct = None
+            if len(history) == 2 and history[0]['price']:
+                previous = history[0]
+                change_pct = (latest['price'] - previous['price']) / previous['price'] * 100
+
+            return {
+                'success': True,
+                'data': {
+                    'commodity': commodity,
+                    'date': latest['date'],
+                    'price': round(latest['price'], 2),
+                    'unit': latest['unit'],
+                    'currency': latest['currency'],
+                    'previous_date': previous['date'] if previous else None,
+                    'change_pct': round(change_pct, 2) if change_pct is not None else None
+                },
+                'timestamp': datetime.now().isoformat()
+            }
+        except Exception as e:
+            return self._error(e)
+
+    async def get_price_history(self, commodity: str, start_date: Optional[str] = None,
+                                end_date: Optional[str] = None,
+                                market: Optional[str] = None) -> Dict[str, Any]:
+        """Get daily prices for a commodity over a date range"""
+        try:
+            prices = self.store.range(commodity, start_date, end_date, market)
+            if not prices:
+                return self._not_found(commodity)
+
+            return {
+                'success': True,
+                'data': {
+                    'commodity': commodity,
+                    'unit': prices[-1]['unit'],
+                    'currency': prices[-1]['currency'],
+                    'prices': [{'date': p['date'], 'price': round(p['price'], 2)} for p in prices]
+                },
+                'timestamp': datetime.now().isoformat()
+            }
+        except Exception as e:
+            return self._error(e)
+
+    async def get_market_trends(self, commodity: str, short_window: int = 4, long_window: int = 12,
+                                market: Optional[str] = None) -> Dict[str, Any]:
+        """Get moving averages, volatility and trend direction for a commodity"""
+        try:
+            latest = self.store.latest(commodity, market)
+            if latest is None:
+                return self._not_found(commodity)
+
+            short_ma = self.store.moving_average(commodity, short_window, market)
+            long_ma = self.store.moving_average(commodity, long_window, market)
+            volatility = self.store.volatility(commodity, long_window, market)
+
+            return {
+                'success': True,
+                'data': {
+                    'commodity': commodity,
+                    'latest_price': round(latest['price'], 2),
+                    'latest_date': latest['date'],
+                    'unit': latest['unit'],
+                    'currency': latest['currency'],
+                    'moving_averages': {
+                        f'{short_window}_period': round(short_ma, 2) if short_ma is not None else None,
+                        f'{long_window}_period': round(long_ma, 2) if long_ma is not None else None
+                    },
+                    'volatility': round(volatility, 4) if volatility is not None else None,
+                    'trend': self._trend(short_ma, long_ma)
+                },
+                'timestamp': datetime.now().isoformat()
+            }
+        except Exception as e:
+            return self._error(e)
+
+    async def get_market_overview(self, commodities: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get trends for several commodities (all stored commodities by default)"""
+        try:
+            names = commodities or self.store.commodities()
+            overview = {}
+            for name in names:
+                trends = await self.get_market_trends(name)
+                overview[name] = trends['data'] if trends['success'] else {'error': trends['error']}
+
+            return {
+                'success': True,
+                'data': {'commodities': overview},
+                'timestamp': datetime.now().isoformat()
+            }
+        except Exception as e:
+            return self._error(e)
+
+    def _trend(self, short_ma: Optional[float], long_ma: Optional[float]) -> str:
+        """Classify direction from the short average relative to the long one"""
+        if short_ma is None or long_ma is None or not long_ma:
+            return 'insufficient_data'
+        change = (short_ma - long_ma) / long_ma
+        if change > TREND_THRESHOLD:
+            return 'rising'
+        if change < -TREND_THRESHOLD:
+            return 'falling'
+        return 'stable'
+
+    def _not_found(self, commodity: str) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'error': f"No price data for '{commodity}'",
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _error(self, error: Exception) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'error': f"Failed to query market data: {str(error)}",
+            'timestamp': datetime.now().isoformat()
+        }
+
+# Example usage and testing
+if __name__ == "__main__":
+    import asyncio
+
+    async def test_market_tool():
+        market = MarketTool(seed_fixtures=True)
+
+        latest = await market.get_latest_price("maize")
+        print("Latest Price:", json.dumps(latest, indent=2))
+
+        trends = await market.get_market_trends("wheat")
+        print("Market Trends:", json.dumps(trends, indent=2))
+
+    asyncio.run(test_market_tool())
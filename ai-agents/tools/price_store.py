@@ -0,0 +1,195 @@
+"""
+Price Store for Farm Management AI Agents
+Local append-only commodity price history indexed on (commodity, date)
+"""
+
+import csv
+import json
+import math
+import os
+import sqlite3
+import threading
+from datetime import date, datetime
+from typing import Dict, Any, Iterable, List, Optional
+
+DEFAULT_MARKET = 'default'
+DEFAULT_UNIT = 'tonne'
+DEFAULT_CURRENCY = 'USD'
+
+
+def normalize_commodity(name: str) -> str:
+    """Commodities are matched case- and whitespace-insensitively"""
+    return ' '.join((name or '').strip().lower().split())
+
+
+def _normalize_date(value: Any) -> str:
+    """Accept dates, datetimes or ISO strings and store them as YYYY-MM-DD"""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return date.fromisoformat(str(value).strip()[:10]).isoformat()
+
+
+class PriceStore:
+    """
+    SQLite-backed price history. Rows are only ever appended; re-ingesting the
+    same (commodity, market, date, source) observation is a no-op, so feeds can
+    be replayed safely.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS prices (
+                commodity TEXT NOT NULL,
+                date TEXT NOT NULL,
+                market TEXT NOT NULL,
+                source TEXT NOT NULL,
+                price REAL NOT NULL,
+                unit TEXT NOT NULL,
+                currency TEXT NOT NULL,
+                UNIQUE (commodity, market, date, source)
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_prices_commodity_date ON prices (commodity, date)"
+        )
+        self._conn.commit()
+
+    def ingest(self, records: Iterable[Dict[str, Any]], source: str = 'feed') -> Dict[str, int]:
+        """Append price records in one transaction; malformed records are skipped"""
+        rows = []
+        rejected = 0
+        for record in records:
+            try:
+                rows.append((
+                    normalize_commodity(record['commodity']),
+                    _normalize_date(record['date']),
+                    record.get('market') or DEFAULT_MARKET,
+                    record.get('source') or source,
+                    float(record['price']),
+                    record.get('unit') or DEFAULT_UNIT,
+                    record.get('currency') or DEFAULT_CURRENCY
+                ))
+            except (KeyError, TypeError, ValueError):
+                rejected += 1
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO prices (commodity, date, market, source, price, unit, currency) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            inserted = self._conn.total_changes - before
+        return {'inserted': inserted, 'duplicates': len(rows) - inserted, 'rejected': rejected}
+
+    def ingest_csv(self, path: str, source: Optional[str] = None) -> Dict[str, int]:
+        """Ingest a CSV feed with commodity,date,price[,market,unit,currency,source] columns"""
+        with open(path, newline='', encoding='utf-8') as f:
+            return self.ingest(csv.DictReader(f), source or os.path.basename(path))
+
+    def ingest_json(self, path: str, source: Optional[str] = None) -> Dict[str, int]:
+        """Ingest a JSON feed: a list of records or an object with a 'prices' list"""
+        with open(path, encoding='utf-8') as f:
+            payload = json.load(f)
+        if isinstance(payload, dict):
+            payload = payload.get('prices', [])
+        return self.ingest(payload, source or os.path.basename(path))
+
+    def ingest_file(self, path: str, source: Optional[str] = None) -> Dict[str, int]:
+        """Ingest a CSV or JSON feed based on its extension"""
+        if path.lower().endswith('.json'):
+            return self.ingest_json(path, source)
+        return self.ingest_csv(path, source)
+
+    def _series(self, commodity: str, market: Optional[str], where: str = '',
+                params: tuple = (), order: str = 'ASC', limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Daily prices for a commodity, averaged across sources for the same market and day"""
+        sql = (
+            "SELECT date, AVG(price), MIN(unit), MIN(currency), COUNT(*) FROM prices "
+            "WHERE commodity = ? AND market = ?" + where +
+            f" GROUP BY date ORDER BY date {order}"
+        )
+        args = (normalize_commodity(commodity), market or DEFAULT_MARKET, *params)
+        if limit is not None:
+            sql += " LIMIT ?"
+            args += (limit,)
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [
+            {'date': row[0], 'price': row[1], 'unit': row[2], 'currency': row[3], 'observations': row[4]}
+            for row in rows
+        ]
+
+    def range(self, commodity: str, start: Optional[Any] = None, end: Optional[Any] = None,
+              market: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Daily prices between two dates (inclusive), oldest first"""
+        where = ''
+        params: tuple = ()
+        if start is not None:
+            where += " AND date >= ?"
+            params += (_normalize_date(start),)
+        if end is not None:
+            where += " AND date <= ?"
+            params += (_normalize_date(end),)
+        return self._series(commodity, market, where, params)
+
+    def latest(self, commodity: str, market: Optional[str] = None,
+               on_or_before: Optional[Any] = None) -> Optional[Dict[str, Any]]:
+        """Most recent daily price, optionally as of a given date"""
+        where, params = ('', ()) if on_or_before is None else (" AND date <= ?", (_normalize_date(on_or_before),))
+        rows = self._series(commodity, market, where, params, order='DESC', limit=1)
+        return rows[0] if rows else None
+
+    def tail(self, commodity: str, count: int, market: Optional[str] = None,
+             on_or_before: Optional[Any] = None) -> List[Dict[str, Any]]:
+        """The last `count` daily prices, oldest first"""
+        where, params = ('', ()) if on_or_before is None else (" AND date <= ?", (_normalize_date(on_or_before),))
+        rows = self._series(commodity, market, where, params, order='DESC', limit=count)
+        rows.reverse()
+        return rows
+
+    def moving_average(self, commodity: str, window: int, market: Optional[str] = None,
+                       on_or_before: Optional[Any] = None) -> Optional[float]:
+        """Mean of the last `window` observations, or None without enough history"""
+        rows = self.tail(commodity, window, market, on_or_before)
+        if len(rows) < window:
+            return None
+        return sum(row['price'] for row in rows) / window
+
+    def volatility(self, commodity: str, window: int, market: Optional[str] = None,
+                   on_or_before: Optional[Any] = None) -> Optional[float]:
+        """Sample standard deviation of log returns over the last `window` returns"""
+        rows = self.tail(commodity, window + 1, market, on_or_before)
+        prices = [row['price'] for row in rows if row['price'] > 0]
+        if len(prices) < 3:
+            return None
+        returns = [math.log(b / a) for a, b in zip(prices, prices[1:])]
+        mean = sum(returns) / len(returns)
+        return math.sqrt(sum((r - mean) ** 2 for r in returns) / (len(returns) - 1))
+
+    def commodities(self) -> List[str]:
+        """Commodities with at least one stored price"""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT commodity FROM prices ORDER BY commodity").fetchall()
+        return [row[0] for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """Row count and covered date span"""
+        with self._lock:
+            count, first, last = self._conn.execute(
+                "SELECT COUNT(*), MIN(date), MAX(date) FROM prices"
+            ).fetchone()
+        return {'rows': count, 'first_date': first, 'last_date': last, 'path': self.path}
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
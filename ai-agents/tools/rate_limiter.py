@@ -0,0 +1,273 @@
+"""
+Upstream Guards for Farm Management AI Agents
+Process-wide token-bucket rate limiting and circuit breaking per upstream API
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Awaitable, Callable, Iterable, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Used for upstreams without a rate_limit / circuit_breaker config block
+DEFAULT_RATE_LIMIT = {
+    'requests_per_second': 10.0,
+    'burst': 20,
+    'max_wait_seconds': 5.0
+}
+DEFAULT_CIRCUIT_BREAKER = {
+    'failure_threshold': 5,
+    'reset_timeout_seconds': 30.0
+}
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class UpstreamUnavailable(Exception):
+    """Raised without calling the upstream; callers may fall back to cached data"""
+
+
+class CircuitOpenError(UpstreamUnavailable):
+    """The upstream's circuit is open"""
+
+
+class RateLimitTimeout(UpstreamUnavailable):
+    """No token became available before the caller's deadline"""
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """HTTP 4xx responses (other than 429) are caller errors, not upstream failures"""
+    status = getattr(error, 'status', None)
+    if isinstance(status, int):
+        return status >= 500 or status == 429
+    return True
+
+
+class TokenBucket:
+    """Token bucket with a FIFO wait queue and per-call deadlines"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.waiting = 0
+        self.rejected = 0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    async def acquire(self, max_wait: Optional[float] = None):
+        """Take a token, queueing behind earlier callers for at most max_wait seconds"""
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+        lock = self._get_lock()
+        self.waiting += 1
+        try:
+            # Waiters queue on the lock, which keeps them strictly FIFO
+            try:
+                await asyncio.wait_for(lock.acquire(), timeout=max_wait)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise RateLimitTimeout(f"no token within {max_wait:.1f}s") from None
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    delay = (1 - self._tokens) / self.rate
+                    if deadline is not None and now + delay > deadline:
+                        self.rejected += 1
+                        raise RateLimitTimeout(f"no token within {max_wait:.1f}s")
+                    await asyncio.sleep(delay)
+            finally:
+                lock.release()
+        finally:
+            self.waiting -= 1
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available"""
+        self._refill(time.monotonic())
+        return self._tokens
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets a single trial call through after a cool-down"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self._trial_in_flight = False
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may proceed"""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError(f"circuit open for another "
+                                       f"{self.reset_timeout - (time.monotonic() - self.opened_at):.1f}s")
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            if self._trial_in_flight:
+                raise CircuitOpenError("circuit half-open, trial call in flight")
+            self._trial_in_flight = True
+
+    def record_success(self):
+        """Close the circuit after a successful call"""
+        self._trial_in_flight = False
+        self.consecutive_failures = 0
+        if self.state != CLOSED:
+            logger.info("Circuit closed")
+        self.state = CLOSED
+
+    def record_failure(self):
+        """Count a failure, opening the circuit at the threshold or on a failed trial"""
+        self._trial_in_flight = False
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.times_opened += 1
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def release(self):
+        """Forget a trial call that ended without a verdict (e.g. cancelled or a 4xx)"""
+        self._trial_in_flight = False
+
+
+class UpstreamGuard:
+    """Rate limiter and circuit breaker for one upstream"""
+
+    def __init__(self, name: str, config: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.calls = 0
+        self.failures = 0
+        self.short_circuited = 0
+        self.config: Optional[Dict[str, Any]] = None
+        self.configure(config or {})
+
+    def configure(self, config: Dict[str, Any]):
+        """Apply a tool config's rate_limit / circuit_breaker blocks, resetting state if they changed"""
+        settings = {key: config.get(key, {}) for key in ('rate_limit', 'circuit_breaker')}
+        if settings == self.config:
+            return
+        self.config = settings
+        rate_limit = {**DEFAULT_RATE_LIMIT, **config.get('rate_limit', {})}
+        breaker = {**DEFAULT_CIRCUIT_BREAKER, **config.get('circuit_breaker', {})}
+        self.max_wait_seconds = float(rate_limit['max_wait_seconds'])
+        self.bucket = TokenBucket(float(rate_limit['requests_per_second']), int(rate_limit['burst']))
+        self.breaker = CircuitBreaker(int(breaker['failure_threshold']),
+                                      float(breaker['reset_timeout_seconds']))
+
+    async def call(self, fetch: Callable[[], Awaitable[T]],
+                   max_wait: Optional[float] = None,
+                   is_failure: Callable[[BaseException], bool] = is_upstream_failure) -> T:
+        """
+        Run fetch once a token is available and the circuit allows it.
+        Raises UpstreamUnavailable without calling fetch otherwise.
+        """
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            self.short_circuited += 1
+            raise
+        try:
+            await self.bucket.acquire(self.max_wait_seconds if max_wait is None else max_wait)
+        except BaseException:
+            self.breaker.release()
+            raise
+
+        self.calls += 1
+        try:
+            result = await fetch()
+        except Exception as e:
+            if is_failure(e):
+                self.failures += 1
+                self.breaker.record_failure()
+                if self.breaker.state == OPEN:
+                    logger.warning(f"Circuit for {self.name} is open after "
+                                   f"{self.breaker.consecutive_failures} failures")
+            else:
+                self.breaker.release()
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Breaker state, queue depth and call counters"""
+        return {
+            'state': self.breaker.state,
+            'consecutive_failures': self.breaker.consecutive_failures,
+            'times_opened': self.breaker.times_opened,
+            'queue_depth': self.bucket.waiting,
+            'tokens_available': round(self.bucket.tokens, 2),
+            'calls': self.calls,
+            'failures': self.failures,
+            'short_circuited': self.short_circuited,
+            'rate_limited': self.bucket.rejected
+        }
+
+
+_guards: Dict[str, UpstreamGuard] = {}
+
+
+def configure_guards(tools: Iterable[Dict[str, Any]]):
+    """Configure guards from adk-config.yaml style `tools:` entries"""
+    for tool in tools:
+        name = tool.get('name')
+        if name:
+            # Reconfigure in place so tools already holding the guard see it
+            get_guard(name).configure(tool.get('config', {}))
+
+
+def get_guard(name: str) -> UpstreamGuard:
+    """Return the process-wide guard for an upstream, with defaults if unconfigured"""
+    guard = _guards.get(name)
+    if guard is None:
+        guard = _guards[name] = UpstreamGuard(name)
+    return guard
+
+
+def guard_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every upstream guard in the process"""
+    return {name: guard.stats() for name, guard in sorted(_guards.items())}
+
+
+def guard_gauges() -> List[Tuple[str, str, Dict[str, Any], float]]:
+    """Guard state as telemetry gauges (circuit state 0=closed, 1=half-open, 2=open)"""
+    states = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+    gauges = []
+    for name, stats in guard_stats().items():
+        labels = {'upstream': name}
+        gauges.append(('upstream_circuit_state', 'Circuit breaker state per upstream',
+                       labels, states[stats['state']]))
+        gauges.append(('upstream_queue_depth', 'Callers waiting for a rate-limit token',
+                       labels, stats['queue_depth']))
+        gauges.append(('upstream_short_circuited', 'Calls rejected by an open circuit',
+                       labels, stats['short_circuited']))
+        gauges.append(('upstream_rate_limited', 'Calls rejected at the rate-limit deadline',
+                       labels, stats['rate_limited']))
+    return gauges
@@ -0,0 +1,261 @@
+"""
+Typed Records for Farm Management AI Agents
+Slotted activity records and an array-backed activity log, decoded from
+bridge JSON and serialized back to the same shape
+"""
+
+import json
+import math
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+from tools.activity_aggregator import parse_timestamp
+
+_MISSING = math.nan
+# Member values that can't hold a deferred object
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def _epoch_seconds(value: Any) -> float:
+    if isinstance(value, str):
+        # Fast path for bridge timestamps; fromisoformat accepts 'Z' on Python 3.11+
+        try:
+            parsed = datetime.fromisoformat(value)
+            if parsed.tzinfo is not None:
+                return parsed.timestamp()
+        except ValueError:
+            pass
+    parsed = parse_timestamp(value)
+    return parsed.timestamp() if parsed is not None else _MISSING
+
+
+def _iso(seconds: float) -> Optional[str]:
+    """Bridge timestamp format (JavaScript toISOString)"""
+    if math.isnan(seconds):
+        return None
+    moment = datetime.fromtimestamp(seconds, timezone.utc)
+    return moment.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+class Activity:
+    """One /api/ai-bridge/activities record"""
+
+    __slots__ = ('type', 'cost', 'created_at', 'crop_id', 'crop_name')
+
+    def __init__(self, type: str, cost: float, created_at: Optional[str],
+                 crop_id: Optional[str], crop_name: Optional[str]):
+        self.type = type
+        self.cost = cost
+        self.created_at = created_at
+        self.crop_id = crop_id
+        self.crop_name = crop_name
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            'type': self.type,
+            'cost': self.cost,
+            'createdAt': self.created_at,
+            'crop': {'id': self.crop_id, 'name': self.crop_name}
+        }
+
+
+class ActivityLog:
+    """
+    A farm's activities as parallel typed arrays: cost and timestamp as
+    doubles, type and crop as small integer codes into interned tables.
+    A record costs ~25 bytes instead of two dicts and their values.
+    """
+
+    def __init__(self):
+        self.cost = array('d')
+        # Epoch seconds, NaN when createdAt is missing or unparseable
+        self.created_at = array('d')
+        self.type_code = array('B')
+        self.crop_code = array('I')
+        self.types: List[str] = []
+        self.crops: List[Tuple[Optional[str], Optional[str]]] = []
+        self._type_index: Dict[str, int] = {}
+        self._crop_index: Dict[Tuple[Optional[str], Optional[str]], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.cost)
+
+    def _code(self, table: List[Any], index: Dict[Any, int], value: Any) -> int:
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(table)
+            table.append(value)
+        return code
+
+    def append(self, activity_type: str, cost: float, created_at: Any,
+               crop_id: Optional[str], crop_name: Optional[str]):
+        """Add one activity; created_at may be an ISO string, a datetime or epoch seconds"""
+        activity_type = activity_type or 'Unknown'
+        type_code = self._type_index.get(activity_type)
+        if type_code is None:
+            if len(self.types) >= 256:
+                raise ValueError("ActivityLog supports at most 256 activity types")
+            type_code = self._code(self.types, self._type_index, activity_type)
+        crop_code = self._crop_index.get((crop_id, crop_name))
+        if crop_code is None:
+            crop_code = self._code(self.crops, self._crop_index, (crop_id, crop_name))
+        self.cost.append(float(cost or 0))
+        self.created_at.append(float(created_at) if isinstance(created_at, (int, float))
+                               else _epoch_seconds(created_at))
+        self.type_code.append(type_code)
+        self.crop_code.append(crop_code)
+
+    def append_json(self, activity: Dict[str, Any]):
+        """Add one activity in the bridge JSON shape"""
+        crop = activity.get('crop') or {}
+        self.append(activity.get('type'), activity.get('cost'), activity.get('createdAt'),
+                    crop.get('id'), crop.get('name'))
+
+    def extend_json(self, activities: Iterable[Dict[str, Any]]) -> "ActivityLog":
+        for activity in activities:
+            self.append_json(activity)
+        return self
+
+    def __getitem__(self, index: int) -> Activity:
+        crop_id, crop_name = self.crops[self.crop_code[index]]
+        return Activity(self.types[self.type_code[index]], self.cost[index],
+                        _iso(self.created_at[index]), crop_id, crop_name)
+
+    def __iter__(self) -> Iterator[Activity]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def rows(self) -> Iterator[Tuple[str, float, float, Optional[str]]]:
+        """(type, cost, epoch seconds or NaN, crop name) per activity, without building records"""
+        types, crops = self.types, self.crops
+        for type_code, cost, created_at, crop_code in zip(self.type_code, self.cost,
+                                                          self.created_at, self.crop_code):
+            yield types[type_code], cost, created_at, crops[crop_code][1]
+
+    def to_json(self) -> List[Dict[str, Any]]:
+        return [activity.to_json() for activity in self]
+
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays (excluding the small interned tables)"""
+        return sum(column.itemsize * len(column)
+                   for column in (self.cost, self.created_at, self.type_code, self.crop_code))
+
+
+class _Deferred(tuple):
+    """An object kept as its (key, value) pairs until its position shows what it is"""
+
+    __slots__ = ()
+
+
+class _CropReference(_Deferred):
+    """A two-key {"id", "name"} object: a crop only as the `crop` of an activity"""
+
+    __slots__ = ()
+
+
+class _ActivityObject(_Deferred):
+    """An object with `type` and `createdAt`: an activity only inside `data.activities`"""
+
+    __slots__ = ()
+
+
+class _ActivityRow(tuple):
+    """(type, cost, createdAt, crop id, crop name) of an activity object in the bridge's key order"""
+
+    __slots__ = ()
+
+    def to_json(self) -> Dict[str, Any]:
+        activity_type, cost, created_at, crop_id, crop_name = self
+        return {'type': activity_type, 'cost': cost, 'createdAt': created_at,
+                'crop': {'id': crop_id, 'name': crop_name}}
+
+
+def _settle(value: Any) -> Any:
+    """Turn deferred objects that are not where activities and their crops belong back into plain values"""
+    if isinstance(value, _ActivityRow):
+        return value.to_json()
+    if isinstance(value, _Deferred):
+        return {key: _settle(item) for key, item in value}
+    if isinstance(value, list):
+        for index, item in enumerate(value):
+            value[index] = _settle(item)
+    elif isinstance(value, dict):
+        # Objects only ever keep deferred values in their `activities` or `data.activities`
+        for holder in (value, value.get('data')):
+            if isinstance(holder, dict) and isinstance(holder.get('activities'), list):
+                _settle(holder['activities'])
+    return value
+
+
+def _hold(key: str, value: Any) -> Any:
+    """Settle a member value unless it can still lead to the envelope's data.activities"""
+    if key == 'activities' and isinstance(value, list):
+        return value
+    if key == 'data' and isinstance(value, dict):
+        if 'data' in value:
+            value['data'] = _settle(value['data'])
+        return value
+    return _settle(value)
+
+
+def decode_activities(raw: Union[str, bytes], log: Optional[ActivityLog] = None) -> Tuple[ActivityLog, Dict[str, Any]]:
+    """
+    Decode an activities page straight into a log: the objects in the
+    envelope's data.activities are appended as records and never become
+    dicts. Returns the log and the rest of the envelope (success,
+    pagination, ...), with data.activities replaced by its length.
+    """
+    log = log if log is not None else ActivityLog()
+
+    def pairs_hook(pairs: List[Tuple[str, Any]]) -> Any:
+        # Children are decoded before their parents, so objects that may be
+        # activities or crop references are deferred; each parent settles the
+        # ones not in those positions and the envelope's activities are
+        # appended once the whole page is decoded
+        if len(pairs) == 2 and {pairs[0][0], pairs[1][0]} == {'id', 'name'}:
+            return _CropReference(pairs)
+        if len(pairs) == 4 and pairs[0][0] == 'type' and pairs[2][0] == 'createdAt' \
+                and type(pairs[0][1]) is str and type(pairs[1][1]) in _SCALARS \
+                and type(pairs[2][1]) is str and isinstance(pairs[3][1], _CropReference):
+            # Key order as the bridge serializes it: type, cost, createdAt, crop
+            (_, activity_type), (_, cost), (_, created_at), (_, crop) = pairs
+            (first, first_value), (_, second_value) = crop
+            if first == 'id':
+                return _ActivityRow((activity_type, cost, created_at, first_value, second_value))
+            return _ActivityRow((activity_type, cost, created_at, second_value, first_value))
+        keys = [key for key, _ in pairs]
+        if 'type' in keys and 'createdAt' in keys:
+            return _ActivityObject(
+                (key, value if key == 'crop' and isinstance(value, _CropReference) else _settle(value))
+                for key, value in pairs
+            )
+        return {key: _hold(key, value) for key, value in pairs}
+
+    envelope = json.loads(raw, object_pairs_hook=pairs_hook)
+    if not isinstance(envelope, dict):
+        return log, _settle(envelope)
+    data = envelope.get('data')
+    activities = data.get('activities') if isinstance(data, dict) else None
+    if isinstance(activities, list):
+        append = log.append
+        for activity in activities:
+            if type(activity) is _ActivityRow:
+                append(*activity)
+                continue
+            if not isinstance(activity, _ActivityObject):
+                continue
+            fields = dict.fromkeys(('type', 'cost', 'createdAt', 'crop'))
+            for key, value in activity:
+                fields[key] = value
+            crop = fields['crop']
+            if isinstance(crop, _CropReference):
+                crop = dict(crop)
+            elif not isinstance(crop, dict):
+                crop = {}
+            append(fields['type'], fields['cost'], fields['createdAt'], crop.get('id'), crop.get('name'))
+        data['activities'] = len(activities)
+    # Anything deferred outside data.activities was not an activity after all
+    if isinstance(envelope.get('activities'), list):
+        _settle(envelope['activities'])
+    return log, envelope
@@ -0,0 +1,261 @@
+"""
+Refresh-Ahead Scheduler for Farm Management AI Agents
+Keeps weather and farm snapshots for active locations and users warm by refreshing
+them shortly before they expire, staggered, jittered and under one concurrency budget
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+
+from tools.telemetry import get_telemetry
+
+if TYPE_CHECKING:
+    from tools.bridge_client import BridgeClient
+    from tools.weather_tool import WeatherTool
+
+logger = logging.getLogger(__name__)
+
+# Overridden by deployment.refresh in adk-config.yaml
+DEFAULT_REFRESH_SETTINGS = {
+    'enabled': False,
+    'max_concurrency': 4,             # Refreshes in flight across weather and farm data
+    'lead_fraction': 0.2,             # Refresh once this share of an entry's TTL remains
+    'risk_lead_fraction': 0.5,        # ...and earlier for locations with frost or wind risk
+    'jitter_fraction': 0.5,           # Share of the lead window refreshes are randomly spread over
+    'stagger_seconds': 60.0,          # Cold keys get their first refresh spread over this window
+    'retry_seconds': 60.0,            # Wait after a failed refresh
+    'active_ttl_seconds': 48 * 3600   # Keys not requested for this long stop being refreshed
+}
+
+# Ready refreshes run in this order; lower first
+PRIORITY_RISK = 0
+PRIORITY_NORMAL = 1
+
+
+class _Target:
+    """One refreshable key: a location's weather or a user's farm snapshot"""
+
+    __slots__ = ('kind', 'key', 'priority', 'last_seen', 'due', 'running')
+
+    def __init__(self, kind: str, key: str, now: float):
+        self.kind = kind
+        self.key = key
+        self.priority = PRIORITY_NORMAL
+        self.last_seen = now
+        self.due = now
+        self.running = False
+
+
+class RefreshScheduler:
+    """
+    Refresh-ahead for the shared weather cache and the bridge snapshot cache.
+
+    Callers report what is in use with track_user(); each tracked location and
+    user is then re-fetched when lead_fraction of its TTL remains, so
+    interactive requests find warm entries. Due refreshes wait in a priority
+    queue (frost or wind risk first) and at most max_concurrency run at once.
+    Entries refreshed by interactive traffic are rescheduled without a fetch.
+    """
+
+    def __init__(self, weather: Optional["WeatherTool"] = None, bridge: Optional["BridgeClient"] = None,
+                 settings: Optional[Dict[str, Any]] = None, rng: Optional[random.Random] = None):
+        self.weather = weather
+        self.bridge = bridge if bridge is not None and bridge.snapshot_cache is not None else None
+        self.settings = {**DEFAULT_REFRESH_SETTINGS, **(settings or {})}
+        self.rng = rng or random.Random()
+        self.telemetry = get_telemetry()
+        self._targets: Dict[Tuple[str, str], _Target] = {}
+        # (due, seq, kind, key) in due order; stale entries are skipped on pop
+        self._timeline: List[Tuple[float, int, str, str]] = []
+        # (priority, due, seq, kind, key) for refreshes that are due now
+        self._ready: List[Tuple[int, float, int, str, str]] = []
+        self._seq = itertools.count()
+        self._running = 0
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+        self.refreshed = {'weather': 0, 'farm': 0}
+        self.skipped = 0
+        self.failed = 0
+
+    @property
+    def max_concurrency(self) -> int:
+        return int(self.settings['max_concurrency'])
+
+    def track_user(self, user_id: str, location: Optional[str] = None):
+        """Mark a user (and their location) as active so their data stays warm"""
+        if self.bridge is not None:
+            self._track('farm', user_id)
+        if location and self.weather is not None:
+            self._track('weather', location)
+
+    def _track(self, kind: str, key: str):
+        now = time.monotonic()
+        target = self._targets.get((kind, key))
+        if target is not None:
+            target.last_seen = now
+            return
+        target = self._targets[(kind, key)] = _Target(kind, key, now)
+        remaining = self._expires_in(target)
+        if remaining is None:
+            # Cold: spread first fetches so a burst of new keys doesn't hit upstream at once
+            self._schedule(target, now + self.rng.uniform(0, float(self.settings['stagger_seconds'])))
+        else:
+            self._schedule(target, self._next_due(target, now, remaining))
+        self._wake.set()
+
+    def _lead_seconds(self, target: _Target) -> float:
+        """How long before expiry a target is refreshed"""
+        if target.kind == 'weather':
+            ttl = min(self.weather.cache.ttls['current'], self.weather.cache.ttls['forecast'])
+        else:
+            ttl = self.bridge.snapshot_cache.ttls['crops']
+        fraction = self.settings['risk_lead_fraction'] if target.priority == PRIORITY_RISK else self.settings['lead_fraction']
+        return float(fraction) * ttl
+
+    def _expires_in(self, target: _Target) -> Optional[float]:
+        if target.kind == 'weather':
+            return self.weather.expires_in(target.key)
+        return self.bridge.snapshot_expires_in(target.key)
+
+    def _jitter(self, seconds: float) -> float:
+        """A random delay of up to jitter_fraction of `seconds`"""
+        return self.rng.uniform(0, float(self.settings['jitter_fraction'])) * seconds
+
+    def _next_due(self, target: _Target, now: float, remaining: float) -> float:
+        """
+        When to refresh an entry with `remaining` seconds left: at a random
+        point early in its lead window, so refreshes never run before the
+        window opens and entries fetched together drift apart
+        """
+        lead = self._lead_seconds(target)
+        return now + max(0.0, remaining - lead) + self._jitter(lead)
+
+    def _schedule(self, target: _Target, due: float):
+        target.due = due
+        heapq.heappush(self._timeline, (due, next(self._seq), target.kind, target.key))
+
+    def _promote_due(self, now: float):
+        """Move due refreshes from the timeline to the ready queue; drop inactive keys"""
+        active_ttl = float(self.settings['active_ttl_seconds'])
+        while self._timeline and self._timeline[0][0] <= now:
+            due, seq, kind, key = heapq.heappop(self._timeline)
+            target = self._targets.get((kind, key))
+            if target is None or target.due != due or target.running:
+                continue
+            if now - target.last_seen > active_ttl:
+                del self._targets[(kind, key)]
+                continue
+            heapq.heappush(self._ready, (target.priority, due, seq, kind, key))
+
+    async def _refresh(self, target: _Target):
+        """Refresh one key (unless traffic already did) and schedule its next refresh"""
+        now = time.monotonic()
+        try:
+            remaining = self._expires_in(target)
+            if remaining is not None and remaining > self._lead_seconds(target):
+                # Interactive traffic refreshed it since it was scheduled
+                self.skipped += 1
+                self._schedule(target, self._next_due(target, now, remaining))
+                return
+            if target.kind == 'weather':
+                result = await self.weather.refresh_location(target.key)
+                if result.get('success'):
+                    outlook = result['data']['weekly_outlook']
+                    risky = outlook['frost_risk'] or outlook['high_wind_days'] > 0
+                    target.priority = PRIORITY_RISK if risky else PRIORITY_NORMAL
+            else:
+                result = await self.bridge.refresh_snapshot(target.key)
+        except Exception as e:
+            result = {'success': False, 'error': str(e)}
+        finally:
+            target.running = False
+            self._running -= 1
+            self._wake.set()
+
+        now = time.monotonic()
+        remaining = self._expires_in(target)
+        if result.get('success') and remaining is not None:
+            self.refreshed[target.kind] += 1
+            self.telemetry.increment("agent_refresh_total", kind=target.kind, outcome="ok")
+            self._schedule(target, self._next_due(target, now, remaining))
+        else:
+            self.failed += 1
+            self.telemetry.increment("agent_refresh_total", kind=target.kind, outcome="error")
+            logger.warning(f"Refresh of {target.kind} '{target.key}' failed: {result.get('error')}")
+            retry = float(self.settings['retry_seconds'])
+            self._schedule(target, now + retry + self._jitter(retry))
+
+    def _dispatch(self):
+        """Start ready refreshes, highest priority first, while the concurrency budget allows"""
+        while self._ready and self._running < self.max_concurrency:
+            _, due, _, kind, key = heapq.heappop(self._ready)
+            target = self._targets.get((kind, key))
+            if target is None or target.due != due:
+                continue
+            target.running = True
+            self._running += 1
+            task = asyncio.ensure_future(self._refresh(target))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def run(self):
+        """Promote and dispatch due refreshes until cancelled"""
+        while True:
+            self._wake.clear()
+            self._promote_due(time.monotonic())
+            self._dispatch()
+            timeout = None
+            if self._timeline:
+                timeout = max(0.0, self._timeline[0][0] - time.monotonic())
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> "RefreshScheduler":
+        """Run the scheduler in the background on the current event loop"""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self.run())
+        return self
+
+    async def stop(self):
+        """Stop scheduling and cancel refreshes in flight"""
+        tasks = [task for task in [self._task, *self._inflight] if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Tracked keys, queue depths and refresh counts"""
+        tracked = {'weather': 0, 'farm': 0}
+        at_risk = 0
+        for target in self._targets.values():
+            tracked[target.kind] += 1
+            at_risk += target.priority == PRIORITY_RISK
+        return {
+            'tracked': tracked,
+            'at_risk_locations': at_risk,
+            'ready': len(self._ready),
+            'running': self._running,
+            'refreshed': dict(self.refreshed),
+            'skipped': self.skipped,
+            'failed': self.failed
+        }
+
+    def gauges(self) -> List[tuple]:
+        """Telemetry collector: tracked keys and refresh queue depth"""
+        stats = self.stats()
+        gauges = [('agent_refresh_tracked', 'Keys kept warm by the refresh scheduler', {'kind': kind}, count)
+                  for kind, count in stats['tracked'].items()]
+        gauges.append(('agent_refresh_ready', 'Refreshes due and waiting for the concurrency budget', {},
+                       stats['ready']))
+        gauges.append(('agent_refresh_at_risk', 'Tracked locations with frost or wind risk', {},
+                       stats['at_risk_locations']))
+        return gauges
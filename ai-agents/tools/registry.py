@@ -0,0 +1,105 @@
+"""
+Tool Registry for Farm Management AI Agents
+Tools declared in the `tools:` section of adk-config.yaml, each imported and built on first use
+"""
+
+import importlib
+import threading
+import time
+from typing import Dict, Any, Iterable, List, Optional
+
+from tools.adk_config import get_adk_config
+from tools.telemetry import get_telemetry
+
+# Tool name -> "module:Class" whose from_config(config) builds it. An entry's
+# own `factory:` key takes precedence, so new tools need no code change here.
+TOOL_FACTORIES = {
+    'farm-data-tool': 'tools.bridge_client:BridgeClient',
+    'weather-data-tool': 'tools.weather_tool:WeatherTool',
+    'market-data-tool': 'tools.market_tool:MarketTool'
+}
+
+
+def _resolve(factory: str) -> Any:
+    module_name, _, attribute = factory.partition(':')
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class ToolRegistry:
+    """
+    Declared tools by name. Nothing is imported until a tool is first
+    requested; each tool is then built once from its config block and shared
+    by every caller of this registry.
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]] = ()):
+        self._entries: Dict[str, Dict[str, Any]] = {
+            entry['name']: entry for entry in entries if entry.get('name')
+        }
+        self._tools: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.load_seconds: Dict[str, float] = {}
+
+    @classmethod
+    def from_config(cls, adk_config: Dict[str, Any]) -> "ToolRegistry":
+        """Registry over an ADK config's `tools:` entries"""
+        return cls(adk_config.get('tools', []))
+
+    def declared(self) -> List[str]:
+        """Names of all declared tools, loaded or not"""
+        return list(self._entries)
+
+    def config(self, name: str) -> Dict[str, Any]:
+        """A declared tool's config block"""
+        return self._entry(name).get('config') or {}
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._tools
+
+    def _entry(self, name: str) -> Dict[str, Any]:
+        entry = self._entries.get(name)
+        if entry is None:
+            raise KeyError(f"Tool '{name}' is not declared in the config")
+        return entry
+
+    def get(self, name: str) -> Any:
+        """The tool instance, importing and building it on first use"""
+        tool = self._tools.get(name)
+        if tool is not None:
+            return tool
+        with self._lock:
+            tool = self._tools.get(name)
+            if tool is not None:
+                return tool
+            entry = self._entry(name)
+            factory = entry.get('factory') or TOOL_FACTORIES.get(name)
+            if factory is None:
+                raise KeyError(f"No factory known for tool '{name}'; set `factory: module:Class` in its entry")
+            start = time.perf_counter()
+            tool = _resolve(factory).from_config(entry.get('config') or {})
+            elapsed = time.perf_counter() - start
+            self.load_seconds[name] = elapsed
+            get_telemetry().observe("agent_tool_load_seconds", elapsed, tool=name)
+            self._tools[name] = tool
+            return tool
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per declared tool: whether it is loaded and how long import + construction took"""
+        return {
+            name: {
+                'loaded': name in self._tools,
+                'load_seconds': round(self.load_seconds[name], 4) if name in self.load_seconds else None
+            }
+            for name in self._entries
+        }
+
+
+_shared_registry: Optional[ToolRegistry] = None
+
+
+def get_registry() -> ToolRegistry:
+    """Return the process-wide registry over config/adk-config.yaml (parsed once)"""
+    global _shared_registry
+    if _shared_registry is None:
+        _shared_registry = ToolRegistry.from_config(get_adk_config())
+    return _shared_registry
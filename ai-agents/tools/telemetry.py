@@ -0,0 +1,249 @@
+"""
+Telemetry for Farm Management AI Agents
+Per-stage latency histograms, size histograms and counters with Prometheus text export
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+# name -> (type, help, buckets)
+METRICS: Dict[str, Tuple[str, str, Optional[Sequence[float]]]] = {
+    'agent_stage_duration_seconds': ('histogram', 'Latency of each agent pipeline stage', LATENCY_BUCKETS),
+    'agent_stage_errors_total': ('counter', 'Exceptions raised inside a pipeline stage', None),
+    'agent_payload_bytes': ('histogram', 'Serialized size of data source payloads', SIZE_BUCKETS),
+    'agent_prompt_tokens': ('histogram', 'Estimated prompt context tokens after serialization', SIZE_BUCKETS),
+    'agent_source_errors_total': ('counter', 'Data source fetches that failed or timed out', None),
+    'agent_cache_requests_total': ('counter', 'Cache lookups by cache and result', None),
+    'agent_fallbacks_total': ('counter', 'Fallback insights served instead of model output', None),
+    'agent_tool_calls_saved_total': ('counter', 'Duplicate tool calls served from the per-turn memo', None),
+    'agent_insight_parse_total': ('counter', 'Model responses parsed, by outcome (clean, repaired, failed)', None),
+    'agent_parse_retries_total': ('counter', 'Model calls repeated because a response could not be parsed', None),
+    'agent_server_requests_total': ('counter', 'Agent server requests by outcome (ok, busy, draining, timeout)', None),
+    'agent_server_queue_seconds': ('histogram', 'Time agent server requests waited for a worker slot', LATENCY_BUCKETS),
+    'agent_tool_load_seconds': ('histogram', 'Import and construction time of each tool on first use', LATENCY_BUCKETS),
+    'agent_rule_evaluations_total': ('counter', 'Rule engine passes by outcome (covered, partial, none)', None),
+    'agent_llm_calls_avoided_total': ('counter', 'Analyses answered by the rule engine without a model call', None),
+    'agent_refresh_total': ('counter', 'Refresh-ahead fetches by kind (weather, farm) and outcome', None),
+    'agent_orchestrator_runs_total': ('counter', 'Orchestrated agent runs by agent and outcome (ok, timeout, error, cancelled)', None)
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def _get_tracer():
+    """The OpenTelemetry tracer, imported only when tracing is turned on"""
+    try:
+        from opentelemetry import trace as otel_trace
+    except ImportError:  # Tracing is optional; metrics work without it
+        return None
+    return otel_trace.get_tracer('farm-ai-agents')
+
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += value
+        self.count += 1
+
+
+class _NoopStage:
+    """Returned by stage() while telemetry is disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_STAGE = _NoopStage()
+
+
+class _Stage:
+    __slots__ = ('telemetry', 'labels', 'start', 'span')
+
+    def __init__(self, telemetry: "Telemetry", labels: Dict[str, Any]):
+        self.telemetry = telemetry
+        self.labels = labels
+        self.span = None
+
+    def __enter__(self):
+        tracer = self.telemetry.tracer
+        if tracer is not None:
+            self.span = tracer.start_as_current_span(f"agent.{self.labels['stage']}", attributes=self.labels)
+            self.span.__enter__()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.telemetry.observe('agent_stage_duration_seconds', time.perf_counter() - self.start, **self.labels)
+        if exc_type is not None:
+            self.telemetry.increment('agent_stage_errors_total', **self.labels)
+        if self.span is not None:
+            self.span.__exit__(exc_type, exc, tb)
+        return False
+
+
+class Telemetry:
+    """
+    In-process metrics registry. While disabled every hook returns immediately
+    (stage() hands back a shared no-op context manager), so instrumented code
+    pays one attribute check.
+    """
+
+    def __init__(self, enabled: bool = False, tracing: bool = False):
+        self.enabled = enabled
+        self.tracer = None
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._collectors: Dict[str, Callable[[], List[Tuple[str, str, Dict[str, Any], float]]]] = {}
+        self.configure(enabled, tracing)
+
+    def configure(self, enabled: bool, tracing: bool = False):
+        """Turn metrics and (if opentelemetry is installed) tracing on or off"""
+        self.enabled = enabled
+        self.tracer = _get_tracer() if enabled and tracing else None
+
+    def stage(self, stage: str, **labels):
+        """Context manager timing one pipeline stage and counting its exceptions"""
+        if not self.enabled:
+            return _NOOP_STAGE
+        return _Stage(self, {'stage': stage, **labels})
+
+    def observe(self, name: str, value: float, **labels):
+        """Record a value in a histogram"""
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(METRICS.get(name, ('histogram', '', LATENCY_BUCKETS))[2])
+            histogram.observe(value)
+
+    def increment(self, name: str, value: float = 1, **labels):
+        """Add to a counter"""
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def add_collector(self, name: str, collect: Callable[[], List[Tuple[str, str, Dict[str, Any], float]]]):
+        """Register (or replace) a callback returning (metric, help, labels, value) gauges read at export time"""
+        self._collectors[name] = collect
+
+    def counter_value(self, name: str, **labels) -> float:
+        """Current value of one counter series (0 if never incremented)"""
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All counters and histogram summaries as plain data, for tests and logs"""
+        with self._lock:
+            return {
+                'counters': {name: {_format_labels(k): v for k, v in series.items()}
+                             for name, series in self._counters.items()},
+                'histograms': {name: {_format_labels(k): {'count': h.count, 'sum': h.total}
+                                      for k, h in series.items()}
+                               for name, series in self._histograms.items()}
+            }
+
+    def render_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self._counters):
+                lines.append(f"# HELP {name} {METRICS.get(name, ('', name, None))[1]}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name in sorted(self._histograms):
+                lines.append(f"# HELP {name} {METRICS.get(name, ('', name, None))[1]}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.total:g}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        gauges: Dict[str, Tuple[str, List[str]]] = {}
+        for collect in list(self._collectors.values()):
+            for name, help_text, labels, value in collect():
+                gauges.setdefault(name, (help_text, []))[1].append(
+                    f"{name}{_format_labels(_label_key(labels))} {value:g}")
+        for name in sorted(gauges):
+            help_text, samples = gauges[name]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def write_textfile(self, path: str):
+        """Atomically write the Prometheus text to a file (node_exporter textfile collector)"""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+    def reset(self):
+        """Drop all recorded series (collectors are kept)"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+_shared_telemetry: Optional[Telemetry] = None
+
+
+def get_telemetry() -> Telemetry:
+    """Return the process-wide telemetry registry (disabled until configured)"""
+    global _shared_telemetry
+    if _shared_telemetry is None:
+        _shared_telemetry = Telemetry()
+    return _shared_telemetry
+
+
+def configure_telemetry(config: Dict[str, Any]) -> Telemetry:
+    """
+    Enable or disable the shared registry from a telemetry config block.
+    Called once at process start; agents and tools use get_telemetry().
+    """
+    telemetry = get_telemetry()
+    telemetry.configure(config.get('enabled', False), config.get('tracing', False))
+    return telemetry
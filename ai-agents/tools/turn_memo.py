@@ -0,0 +1,106 @@
+"""
+Turn Memo for Farm Management AI Agents
+Request-scoped deduplication of identical tool calls within one agent turn
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+from contextlib import contextmanager
+from typing import Dict, Any, Awaitable, Callable, Iterator, Optional, Tuple
+
+_current_turn: contextvars.ContextVar[Optional["TurnMemo"]] = contextvars.ContextVar('tool_turn_memo', default=None)
+
+
+def _call_key(tool: Any, method: str, arguments: Dict[str, Any]) -> Tuple[int, str, str]:
+    """Identify a call by tool instance, method and JSON-normalized arguments"""
+    try:
+        encoded = json.dumps(arguments, sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        encoded = repr(sorted(arguments.items()))
+    return id(tool), method, encoded
+
+
+class TurnMemo:
+    """
+    In-flight and completed tool results for one agent turn. Duplicate calls
+    share the first call's task; results are shared objects and must be
+    treated as read-only. Failed results are not kept, so a later call in
+    the same turn retries.
+    """
+
+    def __init__(self):
+        self._results: Dict[Tuple[int, str, str], asyncio.Future] = {}
+        self.calls = 0
+        self.saved = 0
+        self.saved_by_method: Dict[str, int] = {}
+
+    async def call(self, tool: Any, method: str, fetch: Callable[[], Awaitable[Any]],
+                   arguments: Dict[str, Any]) -> Any:
+        """Run fetch() once per distinct (tool, method, arguments) in this turn"""
+        self.calls += 1
+        key = _call_key(tool, method, arguments)
+        existing = self._results.get(key)
+        if existing is not None:
+            self.saved += 1
+            self.saved_by_method[method] = self.saved_by_method.get(method, 0) + 1
+            # Shield so one caller's cancellation doesn't cancel the shared call
+            return await asyncio.shield(existing)
+
+        task = asyncio.ensure_future(fetch())
+        self._results[key] = task
+        try:
+            result = await asyncio.shield(task)
+        except BaseException:
+            if task.done():
+                self._results.pop(key, None)
+            raise
+        if isinstance(result, dict) and result.get('success') is False:
+            self._results.pop(key, None)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Tool calls seen and how many were served from the memo"""
+        return {
+            'calls': self.calls,
+            'executed': self.calls - self.saved,
+            'saved': self.saved,
+            'saved_by_method': dict(self.saved_by_method)
+        }
+
+
+@contextmanager
+def turn_scope() -> Iterator[TurnMemo]:
+    """Start a turn: memoized tool calls made inside (including spawned tasks) are deduped"""
+    memo = TurnMemo()
+    token = _current_turn.set(memo)
+    try:
+        yield memo
+    finally:
+        _current_turn.reset(token)
+
+
+def current_turn() -> Optional[TurnMemo]:
+    """The active turn memo, if any"""
+    return _current_turn.get()
+
+
+def memoize_per_turn(method: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Decorate an async tool method so duplicate calls within a turn share one result"""
+    name = method.__qualname__
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        memo = _current_turn.get()
+        if memo is None:
+            return await method(self, *args, **kwargs)
+        # Positional, keyword and defaulted spellings of a call share one key
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(list(bound.arguments.items())[1:])
+        return await memo.call(self, name, lambda: method(self, *args, **kwargs), arguments)
+
+    return wrapper
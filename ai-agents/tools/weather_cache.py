@@ -0,0 +1,192 @@
+"""
+Weather Cache for Farm Management AI Agents
+TTL + LRU cache keyed on normalized location or lat/lon grid cell, with
+single-flight coalescing of concurrent misses
+"""
+
+import asyncio
+import json
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Awaitable, Set, Tuple
+
+DEFAULT_TTLS = {
+    'current': 600,     # OpenWeather refreshes current conditions ~every 10 min
+    'forecast': 3600    # 3-hourly forecast steps change slowly
+}
+
+
+class WeatherCache:
+    """Memory-bounded LRU cache with per-endpoint TTLs and request coalescing"""
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024,
+                 ttls: Optional[Dict[str, float]] = None,
+                 grid_size_deg: float = 0.1):
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.grid_size_deg = grid_size_deg
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, int, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        # Expired entries already counted in `expirations`, until replaced or dropped
+        self._expired: Set[Tuple[str, str]] = set()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+        self.stale_hits = 0
+        self.refreshes = 0
+
+    def grid_cell(self, lat: float, lon: float) -> Tuple[float, float]:
+        """Snap coordinates to the center of their grid cell"""
+        cell_lat = round(round(lat / self.grid_size_deg) * self.grid_size_deg, 6)
+        cell_lon = round(round(lon / self.grid_size_deg) * self.grid_size_deg, 6)
+        return cell_lat, cell_lon
+
+    def location_key(self, location: Optional[str] = None, lat: Optional[float] = None,
+                     lon: Optional[float] = None) -> str:
+        """Normalize a free-text location or snap coordinates to a grid cell"""
+        if lat is not None and lon is not None:
+            cell_lat, cell_lon = self.grid_cell(lat, lon)
+            return f"grid:{cell_lat},{cell_lon}"
+        normalized = re.sub(r'\s+', ' ', (location or '').strip().lower())
+        normalized = re.sub(r'\s*,\s*', ',', normalized)
+        return f"loc:{normalized}"
+
+    def _ttl_for(self, endpoint: str) -> float:
+        # 'forecast:7' shares the 'forecast' TTL
+        return self.ttls.get(endpoint, self.ttls.get(endpoint.split(':')[0], 0))
+
+    def get(self, endpoint: str, location_key: str) -> Optional[Any]:
+        """Return a fresh cached value or None"""
+        key = (endpoint, location_key)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, size, value = entry
+        if expires_at <= time.monotonic():
+            # Expired entries stay until evicted or replaced so get_stale can
+            # serve them while an upstream is unavailable; each counts once
+            if key not in self._expired:
+                self._expired.add(key)
+                self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def expires_in(self, endpoint: str, location_key: str) -> Optional[float]:
+        """Seconds until an entry expires (negative once expired), or None if it isn't stored"""
+        entry = self._entries.get((endpoint, location_key))
+        if entry is None:
+            return None
+        return entry[0] - time.monotonic()
+
+    def get_stale(self, endpoint: str, location_key: str) -> Optional[Any]:
+        """Return the last stored value even if expired, or None"""
+        entry = self._entries.get((endpoint, location_key))
+        if entry is None:
+            return None
+        self.stale_hits += 1
+        return entry[2]
+
+    def put(self, endpoint: str, location_key: str, value: Any):
+        """Store a value, evicting least recently used entries over the byte budget"""
+        key = (endpoint, location_key)
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+            self._expired.discard(key)
+        self._entries[key] = (time.monotonic() + self._ttl_for(endpoint), size, value)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            evicted_key, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self._expired.discard(evicted_key)
+            self.evictions += 1
+
+    async def get_or_fetch(self, endpoint: str, location_key: str,
+                           fetch: Callable[[], Awaitable[Dict[str, Any]]],
+                           force: bool = False) -> Dict[str, Any]:
+        """
+        Return the cached result or call fetch once for all concurrent callers.
+        Only successful results ({'success': True, ...}) are stored. force
+        skips the fresh entry (refresh-ahead) but still joins a fetch in flight.
+        """
+        if not force:
+            cached = self.get(endpoint, location_key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+
+        key = (endpoint, location_key)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        if force:
+            self.refreshes += 1
+        else:
+            self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fetch()
+        except BaseException as e:
+            if not future.cancelled():
+                future.set_exception(e)
+                # Mark retrieved so an unawaited future doesn't log a warning
+                future.exception()
+            raise
+        else:
+            if isinstance(result, dict) and result.get('success'):
+                self.put(endpoint, location_key, result)
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, endpoint: str, location_key: str):
+        """Drop one entry so the next lookup fetches"""
+        entry = self._entries.pop((endpoint, location_key), None)
+        if entry is not None:
+            self._bytes -= entry[1]
+            self._expired.discard((endpoint, location_key))
+
+    def clear(self):
+        """Drop all cached entries"""
+        self._entries.clear()
+        self._expired.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size"""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'stale_hits': self.stale_hits,
+            'refreshes': self.refreshes,
+            'hit_rate': (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes
+        }
+
+
+_shared_cache: Optional[WeatherCache] = None
+
+
+def get_shared_cache() -> WeatherCache:
+    """Return the process-wide weather cache"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = WeatherCache()
+    return _shared_cache
@@ -0,0 +1,250 @@
+"""
+Weather History Store for Farm Management AI Agents
+Per-location daily weather persisted from observations and forecasts, with
+running GDD, precipitation and frost totals for O(1) season-to-date queries
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Iterable, List, Optional, Sequence
+
+from tools.agro_engine import CROP_BASE_TEMPS, DEFAULT_BASE_TEMP, FROST_TEMP, base_temp_for
+
+# Cumulative GDD is maintained for every base temperature a known crop uses
+DEFAULT_BASE_TEMPS = tuple(sorted({DEFAULT_BASE_TEMP, *CROP_BASE_TEMPS.values()}))
+
+OBSERVED = 'observed'
+FORECAST = 'forecast'
+
+
+def _day(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return date.fromisoformat(str(value)[:10]).isoformat()
+
+
+class WeatherHistoryStore:
+    """
+    SQLite store with one row per (location, day). Observed days are built up
+    from current-conditions samples and always win over forecasts; forecast
+    days are replaced by newer forecasts. Each row carries running totals from
+    the location's first day, so a range total is the difference of two rows.
+    Revisions only touch the recent tail, so keeping the totals current costs
+    a handful of row updates per fetch.
+    """
+
+    def __init__(self, path: str = ":memory:", base_temps: Sequence[float] = DEFAULT_BASE_TEMPS):
+        self.path = path
+        self.base_temps = tuple(sorted(set(base_temps)))
+        self._lock = threading.Lock()
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS weather_days (
+                location_key TEXT NOT NULL,
+                day TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                temp_min REAL NOT NULL,
+                temp_max REAL NOT NULL,
+                temp_sum REAL NOT NULL,
+                samples INTEGER NOT NULL,
+                humidity_sum REAL NOT NULL,
+                precipitation REAL NOT NULL,
+                wind_max REAL NOT NULL,
+                last_hour INTEGER,
+                cum_precipitation REAL NOT NULL DEFAULT 0,
+                cum_frost_days INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (location_key, day)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS gdd_cumulative (
+                location_key TEXT NOT NULL,
+                base_temp REAL NOT NULL,
+                day TEXT NOT NULL,
+                cum_gdd REAL NOT NULL,
+                PRIMARY KEY (location_key, base_temp, day)
+            )
+        """)
+        self._conn.commit()
+
+    def record_observation(self, location_key: str, current: Dict[str, Any],
+                           observed_at: Optional[datetime] = None):
+        """Fold a current-conditions sample (WeatherTool 'current' data) into its day"""
+        observed_at = observed_at or datetime.now()
+        day = observed_at.date().isoformat()
+        hour = observed_at.hour
+        temp = float(current['temperature'])
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT kind, temp_min, temp_max, temp_sum, samples, humidity_sum, precipitation, "
+                "wind_max, last_hour FROM weather_days WHERE location_key = ? AND day = ?",
+                (location_key, day)
+            ).fetchone()
+            # Hourly rain is counted once per clock hour however often we sample
+            rain = float(current.get('precipitation') or 0)
+            if row is None or row[0] != OBSERVED:
+                values = (temp, temp, temp, 1, float(current.get('humidity') or 0), rain,
+                          float(current.get('wind_speed') or 0), hour)
+            else:
+                _, t_min, t_max, t_sum, samples, h_sum, precip, wind_max, last_hour = row
+                values = (min(t_min, temp), max(t_max, temp), t_sum + temp, samples + 1,
+                          h_sum + float(current.get('humidity') or 0),
+                          precip + (rain if hour != last_hour else 0),
+                          max(wind_max, float(current.get('wind_speed') or 0)), hour)
+            self._write_day(location_key, day, OBSERVED, values)
+            self._refresh_totals(location_key, day)
+            self._conn.commit()
+
+    def record_forecast(self, location_key: str, forecasts: Iterable[Dict[str, Any]]):
+        """Store WeatherTool daily forecast dicts; days already observed are kept"""
+        with self._lock:
+            earliest = None
+            observed = {
+                row[0] for row in self._conn.execute(
+                    "SELECT day FROM weather_days WHERE location_key = ? AND kind = ?",
+                    (location_key, OBSERVED)
+                )
+            }
+            for forecast in forecasts:
+                day = _day(forecast['date'])
+                if day in observed:
+                    continue
+                self._write_day(location_key, day, FORECAST, (
+                    forecast['temp_min'], forecast['temp_max'], forecast['temp_avg'], 1,
+                    forecast['humidity_avg'], forecast['precipitation_total'],
+                    forecast['wind_speed'], None
+                ))
+                earliest = day if earliest is None or day < earliest else earliest
+            if earliest is not None:
+                self._refresh_totals(location_key, earliest)
+            self._conn.commit()
+
+    def _write_day(self, location_key: str, day: str, kind: str, values: tuple):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO weather_days (location_key, day, kind, temp_min, temp_max, "
+            "temp_sum, samples, humidity_sum, precipitation, wind_max, last_hour, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, strftime('%s','now'))",
+            (location_key, day, kind, *values)
+        )
+
+    def _refresh_totals(self, location_key: str, from_day: str):
+        """Recompute running totals from from_day to the location's last day"""
+        previous = self._conn.execute(
+            "SELECT day, cum_precipitation, cum_frost_days FROM weather_days "
+            "WHERE location_key = ? AND day < ? ORDER BY day DESC LIMIT 1",
+            (location_key, from_day)
+        ).fetchone()
+        cum_precip = previous[1] if previous else 0.0
+        cum_frost = previous[2] if previous else 0
+        cum_gdd = {}
+        for base in self.base_temps:
+            row = previous and self._conn.execute(
+                "SELECT cum_gdd FROM gdd_cumulative WHERE location_key = ? AND base_temp = ? AND day = ?",
+                (location_key, base, previous[0])
+            ).fetchone()
+            cum_gdd[base] = row[0] if row else 0.0
+
+        rows = self._conn.execute(
+            "SELECT day, temp_min, temp_sum, samples, precipitation FROM weather_days "
+            "WHERE location_key = ? AND day >= ? ORDER BY day",
+            (location_key, from_day)
+        ).fetchall()
+        for day, temp_min, temp_sum, samples, precipitation in rows:
+            temp_avg = temp_sum / samples
+            cum_precip += precipitation
+            cum_frost += 1 if temp_min < FROST_TEMP else 0
+            self._conn.execute(
+                "UPDATE weather_days SET cum_precipitation = ?, cum_frost_days = ? "
+                "WHERE location_key = ? AND day = ?",
+                (cum_precip, cum_frost, location_key, day)
+            )
+            for base in self.base_temps:
+                cum_gdd[base] += max(temp_avg - base, 0.0)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO gdd_cumulative (location_key, base_temp, day, cum_gdd) "
+                    "VALUES (?, ?, ?, ?)",
+                    (location_key, base, day, cum_gdd[base])
+                )
+
+    def _totals_at(self, location_key: str, day: str, base: float) -> Optional[tuple]:
+        """Running totals as of the last stored day on or before `day`"""
+        row = self._conn.execute(
+            "SELECT d.day, d.cum_precipitation, d.cum_frost_days, g.cum_gdd FROM weather_days d "
+            "JOIN gdd_cumulative g ON g.location_key = d.location_key AND g.day = d.day AND g.base_temp = ? "
+            "WHERE d.location_key = ? AND d.day <= ? ORDER BY d.day DESC LIMIT 1",
+            (base, location_key, day)
+        ).fetchone()
+        return row
+
+    def season_totals(self, location_key: str, since: Any, until: Optional[Any] = None,
+                      crop: Optional[str] = None, base_temp: Optional[float] = None) -> Dict[str, Any]:
+        """
+        GDD, precipitation and frost days from `since` through `until` (default
+        today), from two indexed lookups. Uses the crop's base temperature
+        unless base_temp is given; it must be one of the maintained bases.
+        """
+        base = base_temp if base_temp is not None else base_temp_for(crop)
+        if base not in self.base_temps:
+            raise ValueError(f"GDD is not maintained for base temperature {base}")
+        start = _day(since)
+        end = _day(until) if until is not None else date.today().isoformat()
+        day_before = (date.fromisoformat(start) - timedelta(days=1)).isoformat()
+        with self._lock:
+            upper = self._totals_at(location_key, end, base)
+            lower = self._totals_at(location_key, day_before, base)
+            coverage = self._conn.execute(
+                "SELECT COUNT(*), SUM(kind = ?) FROM weather_days WHERE location_key = ? AND day BETWEEN ? AND ?",
+                (OBSERVED, location_key, start, end)
+            ).fetchone()
+        if upper is None or upper[0] < start:
+            gdd = precipitation = 0.0
+            frost_days = 0
+        else:
+            precipitation = upper[1] - (lower[1] if lower else 0.0)
+            frost_days = upper[2] - (lower[2] if lower else 0)
+            gdd = upper[3] - (lower[3] if lower else 0.0)
+        return {
+            'since': start,
+            'until': end,
+            'base_temp': base,
+            'growing_degree_days': round(gdd, 1),
+            'precipitation_mm': round(precipitation, 1),
+            'frost_days': int(frost_days),
+            'days_recorded': coverage[0] or 0,
+            'days_observed': coverage[1] or 0
+        }
+
+    def days(self, location_key: str, start: Any, end: Any) -> List[Dict[str, Any]]:
+        """Stored daily rows between two dates, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, kind, temp_min, temp_max, temp_sum, samples, humidity_sum, precipitation, wind_max "
+                "FROM weather_days WHERE location_key = ? AND day BETWEEN ? AND ? ORDER BY day",
+                (location_key, _day(start), _day(end))
+            ).fetchall()
+        return [
+            {
+                'date': day,
+                'kind': kind,
+                'temp_min': t_min,
+                'temp_max': t_max,
+                'temp_avg': t_sum / samples,
+                'humidity_avg': h_sum / samples,
+                'precipitation_total': precip,
+                'wind_speed': wind
+            }
+            for day, kind, t_min, t_max, t_sum, samples, h_sum, precip, wind in rows
+        ]
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
@@ -3,32 +3,85 @@ Weather Data Tool for Farm Management AI Agents
 Provides current and forecast weather data for agricultural decision making
 """
 
-import requests
+import asyncio
 import json
-from typing import Dict, Any, Optional
+import logging
+from typing import Dict, Any, List, Optional, Sequence, Union
 from datetime import datetime, timedelta
 import os
 
+from tools.agro_engine import ForecastBatch, DailyForecast
+from tools.http_client import AsyncHttpClient, get_shared_client
+from tools.rate_limiter import UpstreamGuard, UpstreamUnavailable, get_guard
+from tools.turn_memo import memoize_per_turn
+from tools.weather_cache import WeatherCache, get_shared_cache
+from tools.weather_history import WeatherHistoryStore
+
+logger = logging.getLogger(__name__)
+
 class WeatherTool:
     """Tool to access weather data for farming decisions"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None,
+                 http_client: Optional[AsyncHttpClient] = None,
+                 cache: Optional[WeatherCache] = None,
+                 max_concurrent_requests: int = 8,
+                 guard: Optional[UpstreamGuard] = None,
+                 history: Optional[WeatherHistoryStore] = None,
+                 base_url: Optional[str] = None):
         self.api_key = api_key or os.getenv('OPENWEATHER_API_KEY')
-        self.base_url = "https://api.openweathermap.org/data/2.5"
+        self.base_url = (base_url or "https://api.openweathermap.org/data/2.5").rstrip('/')
+        # Pooled, non-blocking transport shared with the other tools by default
+        self.http = http_client or get_shared_client()
+        # Results are shared across callers and must be treated as read-only
+        self.cache = cache or get_shared_cache()
+        # Upper bound on upstream calls in flight for bulk field lookups
+        self.max_concurrent_requests = max_concurrent_requests
+        # Process-wide quota and circuit breaker for OpenWeather
+        self.guard = guard or get_guard('weather-data-tool')
+        # Every fresh fetch is persisted per location and day when a store is set
+        history_path = os.getenv('WEATHER_HISTORY_DB')
+        self.history = history or (WeatherHistoryStore(history_path) if history_path else None)
+    
+    @classmethod
+    def from_config(cls, api_config: Dict[str, Any], **kwargs) -> "WeatherTool":
+        """Build a tool from a weather-data-tool style config block"""
+        return cls(
+            api_key=(api_config.get('auth') or {}).get('key'),
+            base_url=api_config.get('base_url'),
+            **kwargs
+        )
         
+    @memoize_per_turn
     async def get_current_weather(self, location: str) -> Dict[str, Any]:
         """Get current weather conditions for a location"""
+        return await self._cached(
+            'current',
+            self.cache.location_key(location),
+            lambda: self._fetch_current_weather({'q': location})
+        )
+    
+    @memoize_per_turn
+    async def get_current_weather_at(self, lat: float, lon: float) -> Dict[str, Any]:
+        """Get current weather conditions for the grid cell containing a point"""
+        cell_lat, cell_lon = self.cache.grid_cell(lat, lon)
+        return await self._cached(
+            'current',
+            self.cache.location_key(lat=lat, lon=lon),
+            lambda: self._fetch_current_weather({'lat': cell_lat, 'lon': cell_lon})
+        )
+    
+    async def _fetch_current_weather(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch current weather conditions from OpenWeather"""
         try:
             url = f"{self.base_url}/weather"
             params = {
-                'q': location,
+                **query,
                 'appid': self.api_key,
                 'units': 'metric'
             }
             
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = await self.guard.call(lambda: self.http.get_json(url, params=params))
             
             return {
                 'success': True,
@@ -46,6 +99,13 @@ class WeatherTool:
                     'timestamp': datetime.now().isoformat()
                 }
             }
+        except UpstreamUnavailable as e:
+            return {
+                'success': False,
+                'error': f"Weather service unavailable: {str(e)}",
+                'upstream_unavailable': True,
+                'timestamp': datetime.now().isoformat()
+            }
         except Exception as e:
             return {
                 'success': False,
@@ -53,40 +113,92 @@ class WeatherTool:
                 'timestamp': datetime.now().isoformat()
             }
     
+    async def _cached(self, endpoint: str, location_key: str, fetch, force: bool = False) -> Dict[str, Any]:
+        """Cached fetch that serves the last known value while the upstream is unavailable"""
+        if self.history is not None:
+            fetch = self._recording(endpoint, location_key, fetch)
+        result = await self.cache.get_or_fetch(endpoint, location_key, fetch, force=force)
+        if result.get('upstream_unavailable'):
+            stale = self.cache.get_stale(endpoint, location_key)
+            if stale is not None:
+                return {**stale, 'stale': True}
+        return result
+    
+    def _recording(self, endpoint: str, location_key: str, fetch):
+        """Wrap a fetch so successful upstream results (not cache hits) reach the history store"""
+        async def fetch_and_record() -> Dict[str, Any]:
+            result = await fetch()
+            if result.get('success'):
+                try:
+                    if endpoint == 'current':
+                        self.history.record_observation(location_key, result['data'])
+                    else:
+                        self.history.record_forecast(location_key, result['data']['forecasts'])
+                except Exception as e:
+                    # History is best-effort; never fail the lookup because of it
+                    logger.warning(f"Failed to record weather history: {e}")
+            return result
+        return fetch_and_record
+    
+    @memoize_per_turn
+    async def get_season_to_date(self, location: str, since: str, crop: Optional[str] = None,
+                                 until: Optional[str] = None) -> Dict[str, Any]:
+        """Get GDD, precipitation and frost days since a date (e.g. planting) from stored history"""
+        if self.history is None:
+            return {
+                'success': False,
+                'error': "Weather history is not enabled",
+                'timestamp': datetime.now().isoformat()
+            }
+        try:
+            totals = self.history.season_totals(self.cache.location_key(location), since, until, crop)
+            return {
+                'success': True,
+                'data': {'location': location, 'crop': crop, **totals},
+                'timestamp': datetime.now().isoformat()
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f"Failed to query weather history: {str(e)}",
+                'timestamp': datetime.now().isoformat()
+            }
+    
+    @memoize_per_turn
     async def get_weather_forecast(self, location: str, days: int = 5) -> Dict[str, Any]:
         """Get weather forecast for the next few days"""
+        return await self._cached(
+            f'forecast:{days}',
+            self.cache.location_key(location),
+            lambda: self._fetch_weather_forecast({'q': location}, days)
+        )
+    
+    @memoize_per_turn
+    async def get_weather_forecast_at(self, lat: float, lon: float, days: int = 5) -> Dict[str, Any]:
+        """Get the forecast for the grid cell containing a point"""
+        cell_lat, cell_lon = self.cache.grid_cell(lat, lon)
+        return await self._cached(
+            f'forecast:{days}',
+            self.cache.location_key(lat=lat, lon=lon),
+            lambda: self._fetch_weather_forecast({'lat': cell_lat, 'lon': cell_lon}, days)
+        )
+    
+    async def _fetch_weather_forecast(self, query: Dict[str, Any], days: int) -> Dict[str, Any]:
+        """Fetch the 3-hourly forecast from OpenWeather and summarize it per day"""
         try:
             url = f"{self.base_url}/forecast"
             params = {
-                'q': location,
+                **query,
                 'appid': self.api_key,
                 'units': 'metric',
                 'cnt': days * 8  # 8 forecasts per day (3-hour intervals)
             }
             
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = await self.guard.call(lambda: self.http.get_json(url, params=params))
             
             # Process forecast data into daily summaries
-            daily_forecasts = []
-            current_date = None
-            daily_data = []
-            
-            for forecast in data['list']:
-                forecast_date = datetime.fromtimestamp(forecast['dt']).date()
-                
-                if current_date != forecast_date:
-                    if daily_data:
-                        daily_forecasts.append(self._process_daily_forecast(daily_data))
-                    current_date = forecast_date
-                    daily_data = []
-                
-                daily_data.append(forecast)
-            
-            # Process the last day
-            if daily_data:
-                daily_forecasts.append(self._process_daily_forecast(daily_data))
+            daily = DailyForecast.from_batch(ForecastBatch.from_openweather([data]))
+            daily_forecasts = daily.to_dicts(0)
             
             return {
                 'success': True,
@@ -98,6 +210,13 @@ class WeatherTool:
                 'timestamp': datetime.now().isoformat()
             }
             
+        except UpstreamUnavailable as e:
+            return {
+                'success': False,
+                'error': f"Weather service unavailable: {str(e)}",
+                'upstream_unavailable': True,
+                'timestamp': datetime.now().isoformat()
+            }
         except Exception as e:
             return {
                 'success': False,
@@ -105,29 +224,114 @@ class WeatherTool:
                 'timestamp': datetime.now().isoformat()
             }
     
-    def _process_daily_forecast(self, forecasts: list) -> Dict[str, Any]:
-        """Process 3-hour forecasts into daily summary"""
-        temps = [f['main']['temp'] for f in forecasts]
-        humidity = [f['main']['humidity'] for f in forecasts]
-        precipitation = sum([f.get('rain', {}).get('3h', 0) for f in forecasts])
+    @memoize_per_turn
+    async def get_fields_weather(self, fields: Sequence[Union[Dict[str, Any], Sequence[float]]],
+                                 days: int = 5) -> Dict[str, Any]:
+        """
+        Get current and forecast weather for many fields in one call.
         
+        Accepts Prisma Field-like dicts ('id', 'latitude', 'longitude') or
+        (lat, lon) pairs, which are keyed by their index. Fields in the same
+        grid cell share one lookup; cells are fetched concurrently, at most
+        max_concurrent_requests upstream calls at a time.
+        """
+        try:
+            cells: Dict[str, List[Any]] = {}
+            points: Dict[str, tuple] = {}
+            skipped = []
+            for index, field in enumerate(fields):
+                if isinstance(field, dict):
+                    field_id = field.get('id', index)
+                    lat, lon = field.get('latitude'), field.get('longitude')
+                else:
+                    field_id = index
+                    lat, lon = field
+                if lat is None or lon is None:
+                    skipped.append(field_id)
+                    continue
+                key = self.cache.location_key(lat=lat, lon=lon)
+                cells.setdefault(key, []).append(field_id)
+                points.setdefault(key, (lat, lon))
+            
+            semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            
+            async def limited(request):
+                async with semaphore:
+                    return await request
+            
+            async def fetch_cell(key: str):
+                lat, lon = points[key]
+                current, forecast = await asyncio.gather(
+                    limited(self.get_current_weather_at(lat, lon)),
+                    limited(self.get_weather_forecast_at(lat, lon, days))
+                )
+                return key, current, forecast
+            
+            results = await asyncio.gather(*[fetch_cell(key) for key in cells])
+            
+            field_weather = {}
+            for key, current, forecast in results:
+                for field_id in cells[key]:
+                    field_weather[field_id] = {
+                        'cell': key,
+                        'current': current.get('data') if current['success'] else None,
+                        'forecast': forecast.get('data') if forecast['success'] else None,
+                        'errors': [r['error'] for r in (current, forecast) if not r['success']]
+                    }
+            
+            return {
+                'success': True,
+                'data': {
+                    'fields': field_weather,
+                    'cells': len(cells),
+                    'skipped_fields': skipped
+                },
+                'timestamp': datetime.now().isoformat()
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f"Failed to fetch field weather: {str(e)}",
+                'timestamp': datetime.now().isoformat()
+            }
+    
+    async def refresh_location(self, location: str, days: int = 7) -> Dict[str, Any]:
+        """
+        Re-fetch current conditions and the forecast behind get_agricultural_conditions
+        ahead of expiry, and return the agricultural conditions computed from them
+        """
+        key = self.cache.location_key(location)
+        current, forecast = await asyncio.gather(
+            self._cached('current', key, lambda: self._fetch_current_weather({'q': location}), force=True),
+            self._cached(f'forecast:{days}', key,
+                         lambda: self._fetch_weather_forecast({'q': location}, days), force=True)
+        )
+        if not current['success'] or not forecast['success'] or current.get('stale') or forecast.get('stale'):
+            return {
+                'success': False,
+                'error': current.get('error') or forecast.get('error') or 'Served stale data',
+                'timestamp': datetime.now().isoformat()
+            }
         return {
-            'date': datetime.fromtimestamp(forecasts[0]['dt']).date().isoformat(),
-            'temp_min': min(temps),
-            'temp_max': max(temps),
-            'temp_avg': sum(temps) / len(temps),
-            'humidity_avg': sum(humidity) / len(humidity),
-            'precipitation_total': precipitation,
-            'weather_condition': forecasts[len(forecasts)//2]['weather'][0]['main'],
-            'description': forecasts[len(forecasts)//2]['weather'][0]['description'],
-            'wind_speed': forecasts[len(forecasts)//2]['wind']['speed']
+            'success': True,
+            'data': self._analyze_agricultural_conditions(current['data'], forecast['data']['forecasts']),
+            'timestamp': datetime.now().isoformat()
         }
     
+    def expires_in(self, location: str, days: int = 7) -> Optional[float]:
+        """Seconds until the first of the location's cached current/forecast entries expires, or None if either is missing"""
+        key = self.cache.location_key(location)
+        remaining = [self.cache.expires_in('current', key), self.cache.expires_in(f'forecast:{days}', key)]
+        return None if None in remaining else min(remaining)
+    
+    @memoize_per_turn
     async def get_agricultural_conditions(self, location: str) -> Dict[str, Any]:
         """Get weather conditions specifically relevant for agriculture"""
         try:
-            current = await self.get_current_weather(location)
-            forecast = await self.get_weather_forecast(location, 7)
+            current, forecast = await asyncio.gather(
+                self.get_current_weather(location),
+                self.get_weather_forecast(location, 7)
+            )
             
             if not current['success'] or not forecast['success']:
                 return {
@@ -157,22 +361,9 @@ class WeatherTool:
     def _analyze_agricultural_conditions(self, current: Dict, forecasts: list) -> Dict[str, Any]:
         """Analyze weather data for agricultural insights"""
         
-        # Calculate growing degree days (base 10°C for most crops)
-        gdd_total = 0
-        for forecast in forecasts:
-            avg_temp = forecast['temp_avg']
-            if avg_temp > 10:
-                gdd_total += avg_temp - 10
-        
-        # Analyze precipitation patterns
-        total_precipitation = sum([f['precipitation_total'] for f in forecasts])
-        dry_days = len([f for f in forecasts if f['precipitation_total'] < 1])
-        
-        # Frost risk analysis
-        frost_risk = any([f['temp_min'] < 2 for f in forecasts[:3]])  # Next 3 days
-        
-        # Wind conditions
-        high_wind_days = len([f for f in forecasts if f['wind_speed'] > 10])
+        # GDD (base 10°C), precipitation, dry days, frost risk in the next
+        # 3 days and high-wind days, computed by the columnar engine
+        outlook = DailyForecast.from_dicts(forecasts).weekly_outlook()
         
         return {
             'current_conditions': {
@@ -184,15 +375,9 @@ class WeatherTool:
                     current['wind_speed'] < 15
                 )
             },
-            'weekly_outlook': {
-                'growing_degree_days': round(gdd_total, 1),
-                'total_precipitation_mm': round(total_precipitation, 1),
-                'dry_days': dry_days,
-                'frost_risk': frost_risk,
-                'high_wind_days': high_wind_days
-            },
+            'weekly_outlook': outlook,
             'agricultural_recommendations': self._generate_weather_recommendations(
-                current, forecasts, frost_risk, total_precipitation, dry_days
+                current, forecasts, outlook['frost_risk'], outlook['total_precipitation_mm'], outlook['dry_days']
             )
         }
     
@@ -248,7 +433,7 @@ class WeatherTool:
 
 # Example usage and testing
 if __name__ == "__main__":
-    import asyncio
+    from tools.http_client import close_shared_client
     
     async def test_weather_tool():
         # Note: You'll need to set OPENWEATHER_API_KEY environment variable
@@ -261,6 +446,8 @@ if __name__ == "__main__":
         # Test agricultural conditions
         conditions = await weather.get_agricultural_conditions("New York, NY")
         print("Agricultural Conditions:", json.dumps(conditions, indent=2))
+        
+        await close_shared_client()
     
     # Uncomment to test (requires API key)
     # asyncio.run(test_weather_tool())
\ No newline at end of file
@@ -0,0 +1,87 @@
+import { NextRequest, NextResponse } from "next/server";
+import { auth } from "@clerk/nextjs/server";
+import {
+  AIDataBridge,
+  decodeActivityCursor,
+} from "@/lib/ai-bridge/data-access";
+import { AIActivityData } from "@/types";
+
+/**
+ * AI Bridge API for ADK Agents - Activity Feed
+ * Paged, newest-first access to the unified activity log for AI agents
+ */
+export async function GET(request: NextRequest) {
+  try {
+    const { userId } = await auth();
+    if (!userId) {
+      return NextResponse.json(
+        { success: false, error: "Unauthorized" },
+        { status: 401 }
+      );
+    }
+
+    // Get query parameters
+    const { searchParams } = new URL(request.url);
+    const limit = Math.min(
+      200,
+      Math.max(1, parseInt(searchParams.get("limit") || "50") || 50)
+    );
+    // Keyset cursor from the previous page's pagination.nextCursor
+    const cursorParam = searchParams.get("cursor");
+    const cursor = cursorParam ? decodeActivityCursor(cursorParam) : undefined;
+    if (cursor === null) {
+      return NextResponse.json(
+        { success: false, error: "Invalid cursor parameter" },
+        { status: 400 }
+      );
+    }
+    // Optional change cursor: only return activities logged after this ISO time
+    const sinceParam = searchParams.get("since");
+    const since = sinceParam ? new Date(sinceParam) : undefined;
+    if (since && isNaN(since.getTime())) {
+      return NextResponse.json(
+        { success: false, error: "Invalid since parameter" },
+        { status: 400 }
+      );
+    }
+
+    // Use the data bridge for safe access
+    const activityData = await AIDataBridge.getActivityPage(
+      userId,
+      limit,
+      cursor,
+      since
+    );
+
+    if (!activityData.success) {
+      return NextResponse.json(
+        { success: false, error: "Failed to fetch activity data" },
+        { status: 500 }
+      );
+    }
+
+    const page: AIActivityData[] = activityData.data || [];
+    const total = activityData.total || 0;
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        activities: page,
+      },
+      pagination: {
+        limit,
+        total,
+        nextCursor: activityData.nextCursor ?? null,
+      },
+      timestamp: new Date().toISOString(),
+      source: "ai-bridge-activities",
+      ...(since && { since: since.toISOString() }),
+    });
+  } catch (error) {
+    console.error("AI Bridge Activities API error:", error);
+    return NextResponse.json(
+      { success: false, error: "Internal server error" },
+      { status: 500 }
+    );
+  }
+}
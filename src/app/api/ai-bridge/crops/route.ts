@@ -27,10 +27,20 @@ export async function GET(request: NextRequest) {
     // Get query parameters
     const { searchParams } = new URL(request.url);
     const limit = parseInt(searchParams.get("limit") || "50");
+    const offset = Math.max(0, parseInt(searchParams.get("offset") || "0"));
     const includeHistory = searchParams.get("includeHistory") === "true";
+    // Optional change cursor: only return crops changed after this ISO time
+    const sinceParam = searchParams.get("since");
+    const since = sinceParam ? new Date(sinceParam) : undefined;
+    if (since && isNaN(since.getTime())) {
+      return NextResponse.json(
+        { success: false, error: "Invalid since parameter" },
+        { status: 400 }
+      );
+    }
 
     // Use the data bridge for safe access
-    const cropData = await AIDataBridge.getCropData(userId);
+    const cropData = await AIDataBridge.getCropData(userId, since);
 
     if (!cropData.success) {
       return NextResponse.json(
@@ -44,7 +54,7 @@ export async function GET(request: NextRequest) {
       success: true,
       data: {
         crops: ((cropData.data as AICropData[]) || [])
-          .slice(0, limit)
+          .slice(offset, offset + limit)
           .map((crop: AICropData) => ({
             id: crop.id,
             name: crop.name,
@@ -54,6 +64,7 @@ export async function GET(request: NextRequest) {
             actualHarvestDate: crop.actualHarvestDate,
             status: crop.status,
             area: crop.area,
+            updatedAt: crop.updatedAt,
             ...(includeHistory && {
               recentTasks: (crop.tasks || []).map((task: PrismaTask) => ({
                 id: task.id,
@@ -111,9 +122,17 @@ export async function GET(request: NextRequest) {
             0
           ),
         },
+        // With `since`, every current crop id, so deleted crops can be dropped
+        ...(cropData.cropIds && { cropIds: cropData.cropIds }),
+      },
+      pagination: {
+        offset,
+        limit,
+        total: (cropData.data || []).length,
       },
       timestamp: new Date().toISOString(),
       source: "ai-bridge-crops",
+      ...(since && { since: since.toISOString() }),
     };
 
     return NextResponse.json(formattedData);
@@ -21,9 +21,26 @@ export async function GET(request: NextRequest) {
     const { searchParams } = new URL(request.url);
     const timeRange = searchParams.get("timeRange") || "30"; // days
     const includeBreakdown = searchParams.get("includeBreakdown") === "true";
+    // Optional change cursor: only return activities logged after this ISO time
+    const sinceParam = searchParams.get("since");
+    const since = sinceParam ? new Date(sinceParam) : undefined;
+    if (since && isNaN(since.getTime())) {
+      return NextResponse.json(
+        { success: false, error: "Invalid since parameter" },
+        { status: 400 }
+      );
+    }
 
-    // Use the data bridge for safe access
-    const financialData = await AIDataBridge.getFinancialSummary(userId);
+    const timeRangeMs = parseInt(timeRange) * 24 * 60 * 60 * 1000;
+    const cutoffDate = new Date(Date.now() - timeRangeMs);
+
+    // Use the data bridge for safe access. Only the window (and, for trends,
+    // the period before it) is read, so the summary covers all of it.
+    const financialData = await AIDataBridge.getFinancialSummary(
+      userId,
+      since,
+      new Date(Date.now() - (includeBreakdown ? 2 : 1) * timeRangeMs)
+    );
 
     if (!financialData.success) {
       return NextResponse.json(
@@ -32,9 +49,11 @@ export async function GET(request: NextRequest) {
       );
     }
 
-    const activities: AIActivityData[] = financialData.data || [];
-    const timeRangeMs = parseInt(timeRange) * 24 * 60 * 60 * 1000;
-    const cutoffDate = new Date(Date.now() - timeRangeMs);
+    // Newest first across log types, so recentActivities really are the latest
+    const activities: AIActivityData[] = (financialData.data || []).sort(
+      (a, b) =>
+        new Date(b.createdAt).getTime() - new Date(a.createdAt).getTime()
+    );
 
     // Filter activities by time range
     const recentActivities = activities.filter(
@@ -59,9 +78,15 @@ export async function GET(request: NextRequest) {
           },
         }),
         recentActivities: recentActivities.slice(0, 20), // Latest 20 for context
+        // When the summary changes by an activity leaving the window
+        oldestActivityAt:
+          recentActivities.length > 0
+            ? recentActivities[recentActivities.length - 1].createdAt
+            : null,
       },
       timestamp: new Date().toISOString(),
       source: "ai-bridge-financial",
+      ...(since && { since: since.toISOString() }),
     };
 
     return NextResponse.json(formattedData);
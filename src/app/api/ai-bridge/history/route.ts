@@ -0,0 +1,93 @@
+import { NextRequest, NextResponse } from "next/server";
+import { auth } from "@clerk/nextjs/server";
+import {
+  AIDataBridge,
+  decodeActivityCursor,
+} from "@/lib/ai-bridge/data-access";
+
+const HISTORY_TYPES = { harvest: "HARVEST", irrigation: "IRRIGATION" } as const;
+
+/**
+ * AI Bridge API for ADK Agents - Harvest and Irrigation History
+ * Paged, newest-first access to every harvest or irrigation log for exports
+ */
+export async function GET(request: NextRequest) {
+  try {
+    const { userId } = await auth();
+    if (!userId) {
+      return NextResponse.json(
+        { success: false, error: "Unauthorized" },
+        { status: 401 }
+      );
+    }
+
+    // Get query parameters
+    const { searchParams } = new URL(request.url);
+    const typeParam = searchParams.get("type") || "";
+    const type = HISTORY_TYPES[typeParam as keyof typeof HISTORY_TYPES];
+    if (!type) {
+      return NextResponse.json(
+        { success: false, error: "type must be harvest or irrigation" },
+        { status: 400 }
+      );
+    }
+    const limit = Math.min(
+      200,
+      Math.max(1, parseInt(searchParams.get("limit") || "50") || 50)
+    );
+    // Keyset cursor from the previous page's pagination.nextCursor
+    const cursorParam = searchParams.get("cursor");
+    const cursor = cursorParam ? decodeActivityCursor(cursorParam) : undefined;
+    if (cursor === null || (cursor && cursor.type !== type)) {
+      return NextResponse.json(
+        { success: false, error: "Invalid cursor parameter" },
+        { status: 400 }
+      );
+    }
+    // Optional change cursor: only return logs created after this ISO time
+    const sinceParam = searchParams.get("since");
+    const since = sinceParam ? new Date(sinceParam) : undefined;
+    if (since && isNaN(since.getTime())) {
+      return NextResponse.json(
+        { success: false, error: "Invalid since parameter" },
+        { status: 400 }
+      );
+    }
+
+    // Use the data bridge for safe access
+    const historyData = await AIDataBridge.getHistoryPage(
+      userId,
+      type,
+      limit,
+      cursor,
+      since
+    );
+
+    if (!historyData.success) {
+      return NextResponse.json(
+        { success: false, error: "Failed to fetch history data" },
+        { status: 500 }
+      );
+    }
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        logs: historyData.data || [],
+      },
+      pagination: {
+        limit,
+        nextCursor: historyData.nextCursor ?? null,
+      },
+      timestamp: new Date().toISOString(),
+      source: "ai-bridge-history",
+      ...(since && { since: since.toISOString() }),
+    });
+  } catch (error) {
+    console.error("AI Bridge History API error:", error);
+    return NextResponse.json(
+      { success: false, error: "Internal server error" },
+      { status: 500 }
+    );
+  }
+}
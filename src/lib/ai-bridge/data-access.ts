@@ -2,12 +2,116 @@
 import { prisma } from "@/lib/prisma";
 import { auth } from "@clerk/nextjs/server";
 
+type CropRef = { name: string; id: string };
+
+// Select of each log type as a unified activity
+const activitySelect = {
+  createdAt: true,
+  crop: { select: { name: true, id: true } },
+};
+
+// Log types in the order toActivities lists them; ties on createdAt in the
+// activity log are broken by this order, then by newest id
+const ACTIVITY_TYPES = ["FERTILIZER", "IRRIGATION", "HARVEST"];
+
+// Position of a row in the newest-first activity log or history of one log
+// type, as a keyset cursor
+export type ActivityCursor = { createdAt: Date; type: string; id: string };
+
+export function encodeActivityCursor(cursor: ActivityCursor): string {
+  return Buffer.from(
+    JSON.stringify([cursor.createdAt.toISOString(), cursor.type, cursor.id])
+  ).toString("base64url");
+}
+
+// The cursor a client sent back, or null if it is not one we issued
+export function decodeActivityCursor(value: string): ActivityCursor | null {
+  try {
+    const [createdAt, type, id] = JSON.parse(
+      Buffer.from(value, "base64url").toString("utf8")
+    );
+    const cursor = { createdAt: new Date(createdAt), type, id };
+    if (
+      isNaN(cursor.createdAt.getTime()) ||
+      !ACTIVITY_TYPES.includes(type) ||
+      typeof id !== "string"
+    ) {
+      return null;
+    }
+    return cursor;
+  } catch {
+    return null;
+  }
+}
+
+// Rows of one log type that come after the cursor in the activity log
+function afterCursor(type: string, cursor?: ActivityCursor) {
+  if (!cursor) {
+    return {};
+  }
+  const rank = ACTIVITY_TYPES.indexOf(type);
+  const cursorRank = ACTIVITY_TYPES.indexOf(cursor.type);
+  if (rank > cursorRank) {
+    return { createdAt: { lte: cursor.createdAt } };
+  }
+  if (rank < cursorRank) {
+    return { createdAt: { lt: cursor.createdAt } };
+  }
+  return {
+    OR: [
+      { createdAt: { lt: cursor.createdAt } },
+      { createdAt: cursor.createdAt, id: { lt: cursor.id } },
+    ],
+  };
+}
+
+// Combine rows of the three log types into a unified format
+function toActivities(
+  fertilizerLogs: { amount: number; createdAt: Date; crop: CropRef }[],
+  irrigationLogs: { waterAmount: number; createdAt: Date; crop: CropRef }[],
+  harvestLogs: { quantity: number; createdAt: Date; crop: CropRef }[]
+) {
+  return [
+    ...fertilizerLogs.map((log) => ({
+      type: "FERTILIZER",
+      cost: log.amount * 10, // Estimate cost
+      createdAt: log.createdAt,
+      crop: log.crop,
+    })),
+    ...irrigationLogs.map((log) => ({
+      type: "IRRIGATION",
+      cost: log.waterAmount * 0.1, // Estimate cost
+      createdAt: log.createdAt,
+      crop: log.crop,
+    })),
+    ...harvestLogs.map((log) => ({
+      type: "HARVEST",
+      cost: 0, // Revenue, not cost
+      createdAt: log.createdAt,
+      crop: log.crop,
+    })),
+  ];
+}
+
 export class AIDataBridge {
-  // Read-only access to crop data for AI agents
-  static async getCropData(userId: string) {
+  // Read-only access to crop data for AI agents. With `since`, only crops
+  // updated (or with tasks/logs added) after that time are returned, plus
+  // the ids of all current crops so consumers can drop deleted ones.
+  static async getCropData(userId: string, since?: Date) {
     try {
-      const crops = await prisma.crop.findMany({
-        where: { userId },
+      const cropsQuery = prisma.crop.findMany({
+        where: {
+          userId,
+          ...(since && {
+            OR: [
+              { updatedAt: { gt: since } },
+              { tasks: { some: { updatedAt: { gt: since } } } },
+              { irrigationLogs: { some: { createdAt: { gt: since } } } },
+              { fertilizerLogs: { some: { createdAt: { gt: since } } } },
+              { harvestLogs: { some: { createdAt: { gt: since } } } },
+            ],
+          }),
+        },
         include: {
           tasks: {
             orderBy: { createdAt: "desc" },
@@ -21,12 +125,23 @@ export class AIDataBridge {
             orderBy: { createdAt: "desc" },
             take: 10,
           },
+          harvestLogs: {
+            orderBy: { harvestDate: "desc" },
+            take: 10,
+          },
         },
       });
+      const [crops, currentIds] = await Promise.all([
+        cropsQuery,
+        since
+          ? prisma.crop.findMany({ where: { userId }, select: { id: true } })
+          : undefined,
+      ]);
 
       return {
         success: true,
         data: crops,
+        ...(currentIds && { cropIds: currentIds.map((crop) => crop.id) }),
         timestamp: new Date().toISOString(),
       };
     } catch (error) {
@@ -39,66 +154,52 @@ export class AIDataBridge {
     }
   }
 
-  // Read-only access to financial data
-  static async getFinancialSummary(userId: string) {
+  // Read-only access to financial data. With `since`, only activities
+  // logged after that time are returned; with `windowStart`, only those
+  // logged after the start of the reporting window.
+  static async getFinancialSummary(
+    userId: string,
+    since?: Date,
+    windowStart?: Date
+  ) {
     try {
+      const after =
+        since && windowStart
+          ? new Date(Math.max(since.getTime(), windowStart.getTime()))
+          : since || windowStart;
+      const where = {
+        userId,
+        ...(after && { createdAt: { gt: after } }),
+      };
+      // Newest first. An unbounded read is capped per log type; a bounded
+      // one is not, so summaries of a window or delta count every activity.
+      const page = {
+        orderBy: { createdAt: "desc" as const },
+        ...(!after && { take: 50 }),
+      };
       // This would aggregate existing financial data from different log types
       // without modifying the current system
       const [fertilizerLogs, irrigationLogs, harvestLogs] = await Promise.all([
         prisma.fertilizerLog.findMany({
-          where: { userId },
-          select: {
-            amount: true,
-            createdAt: true,
-            crop: { select: { name: true, id: true } },
-          },
-          take: 50,
+          where,
+          select: { amount: true, ...activitySelect },
+          ...page,
         }),
         prisma.irrigationLog.findMany({
-          where: { userId },
-          select: {
-            waterAmount: true,
-            createdAt: true,
-            crop: { select: { name: true, id: true } },
-          },
-          take: 50,
+          where,
+          select: { waterAmount: true, ...activitySelect },
+          ...page,
         }),
         prisma.harvestLog.findMany({
-          where: { userId },
-          select: {
-            quantity: true,
-            createdAt: true,
-            crop: { select: { name: true, id: true } },
-          },
-          take: 50,
+          where,
+          select: { quantity: true, ...activitySelect },
+          ...page,
         }),
       ]);
 
-      // Combine all activities into a unified format
-      const activities = [
-        ...fertilizerLogs.map((log) => ({
-          type: "FERTILIZER",
-          cost: log.amount * 10, // Estimate cost
-          createdAt: log.createdAt,
-          crop: log.crop,
-        })),
-        ...irrigationLogs.map((log) => ({
-          type: "IRRIGATION",
-          cost: log.waterAmount * 0.1, // Estimate cost
-          createdAt: log.createdAt,
-          crop: log.crop,
-        })),
-        ...harvestLogs.map((log) => ({
-          type: "HARVEST",
-          cost: 0, // Revenue, not cost
-          createdAt: log.createdAt,
-          crop: log.crop,
-        })),
-      ];
-
       return {
         success: true,
-        data: activities,
+        data: toActivities(fertilizerLogs, irrigationLogs, harvestLogs),
         timestamp: new Date().toISOString(),
       };
     } catch (error) {
@@ -111,6 +212,147 @@ export class AIDataBridge {
     }
   }
 
+  // One newest-first page of the unified activity log after `cursor`, with
+  // the cursor of the next page and the total count. With `since`, only
+  // activities logged after that time.
+  static async getActivityPage(
+    userId: string,
+    limit: number,
+    cursor?: ActivityCursor,
+    since?: Date
+  ) {
+    try {
+      const where = {
+        userId,
+        ...(since && { createdAt: { gt: since } }),
+      };
+      // The page is among the first limit + 1 rows after the cursor of each
+      // log type; the extra row shows whether another page follows
+      const page = (type: string) => ({
+        where: { ...where, AND: [afterCursor(type, cursor)] },
+        orderBy: [{ createdAt: "desc" as const }, { id: "desc" as const }],
+        take: limit + 1,
+      });
+      const [fertilizerLogs, irrigationLogs, harvestLogs, counts] =
+        await Promise.all([
+          prisma.fertilizerLog.findMany({
+            select: { id: true, amount: true, ...activitySelect },
+            ...page("FERTILIZER"),
+          }),
+          prisma.irrigationLog.findMany({
+            select: { id: true, waterAmount: true, ...activitySelect },
+            ...page("IRRIGATION"),
+          }),
+          prisma.harvestLog.findMany({
+            select: { id: true, quantity: true, ...activitySelect },
+            ...page("HARVEST"),
+          }),
+          Promise.all([
+            prisma.fertilizerLog.count({ where }),
+            prisma.irrigationLog.count({ where }),
+            prisma.harvestLog.count({ where }),
+          ]),
+        ]);
+
+      // toActivities keeps the order of the logs it is given, so row ids line up
+      const ids = [...fertilizerLogs, ...irrigationLogs, ...harvestLogs].map(
+        (log) => log.id
+      );
+      const rows = toActivities(fertilizerLogs, irrigationLogs, harvestLogs)
+        .map((activity, index) => ({ activity, id: ids[index] }))
+        .sort(
+          (a, b) =>
+            b.activity.createdAt.getTime() - a.activity.createdAt.getTime() ||
+            ACTIVITY_TYPES.indexOf(a.activity.type) -
+              ACTIVITY_TYPES.indexOf(b.activity.type) ||
+            (a.id < b.id ? 1 : a.id > b.id ? -1 : 0)
+        );
+      const pageRows = rows.slice(0, limit);
+      const last = pageRows[pageRows.length - 1];
+      const activities = pageRows.map((row) => row.activity);
+
+      return {
+        success: true,
+        data: activities,
+        nextCursor:
+          rows.length > limit
+            ? encodeActivityCursor({
+                createdAt: last.activity.createdAt,
+                type: last.activity.type,
+                id: last.id,
+              })
+            : null,
+        total: counts.reduce((sum, count) => sum + count, 0),
+        timestamp: new Date().toISOString(),
+      };
+    } catch (error) {
+      console.error("AI Bridge - Activity log access error:", error);
+      return {
+        success: false,
+        error: "Failed to fetch activity log",
+        timestamp: new Date().toISOString(),
+      };
+    }
+  }
+
+  // One newest-first page of a user's harvest or irrigation logs after
+  // `cursor`, with the cursor of the next page. Unlike the crop history
+  // this is every log, for exports. With `since`, only logs created after
+  // that time.
+  static async getHistoryPage(
+    userId: string,
+    type: "HARVEST" | "IRRIGATION",
+    limit: number,
+    cursor?: ActivityCursor,
+    since?: Date
+  ) {
+    try {
+      const query = {
+        where: {
+          userId,
+          ...(since && { createdAt: { gt: since } }),
+          AND: [afterCursor(type, cursor)],
+        },
+        orderBy: [{ createdAt: "desc" as const }, { id: "desc" as const }],
+        take: limit + 1,
+      };
+      const common = { id: true, createdAt: true, crop: activitySelect.crop };
+      const logs =
+        type === "HARVEST"
+          ? await prisma.harvestLog.findMany({
+              ...query,
+              select: { ...common, harvestDate: true, quantity: true },
+            })
+          : await prisma.irrigationLog.findMany({
+              ...query,
+              select: { ...common, date: true, waterAmount: true },
+            });
+
+      const page = logs.slice(0, limit);
+      const last = page[page.length - 1];
+      return {
+        success: true,
+        data: page,
+        nextCursor:
+          logs.length > limit
+            ? encodeActivityCursor({
+                createdAt: last.createdAt,
+                type,
+                id: last.id,
+              })
+            : null,
+        timestamp: new Date().toISOString(),
+      };
+    } catch (error) {
+      console.error("AI Bridge - History log access error:", error);
+      return {
+        success: false,
+        error: "Failed to fetch history logs",
+        timestamp: new Date().toISOString(),
+      };
+    }
+  }
+
   // Safe method to get user context for AI agents
   static async getUserContext() {
     try {
@@ -550,6 +550,7 @@ export interface AICropData {
   actualHarvestDate?: Date | null;
   status: CropStatus;
   area?: number | null;
+  updatedAt?: Date;
   tasks?: PrismaTask[];
   irrigationLogs?: PrismaIrrigationLog[];
   fertilizerLogs?: PrismaFertilizerLog[];